@@ -0,0 +1,129 @@
+# backend/async_routes.py
+"""Routes de lecture async, servies par AsyncSession (mode FINANCE_DB_ASYNC).
+
+Mêmes chemins, paramètres et réponses que les routes sync de main.py, qu'elles
+remplacent via use_async_reads(app). Une lecture longue (plage large,
+recherche) attend la base sans occuper un thread du threadpool de FastAPI ;
+les écritures et les imports restent sync (thread d'import dédié).
+"""
+from datetime import date, datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import crud_async
+from .crud import MAX_PAGE_SIZE
+from .database import get_async_db
+from .models import TransactionType
+from .schemas import AccountResponse, BudgetSummary, CategoryResponse, TransactionPage
+
+router = APIRouter()
+
+
+@router.get("/accounts", response_model=List[AccountResponse])
+async def list_accounts(db: AsyncSession = Depends(get_async_db)):
+    """Liste tous les comptes"""
+    return await crud_async.get_accounts(db)
+
+
+@router.get("/categories", response_model=List[CategoryResponse])
+async def list_categories(db: AsyncSession = Depends(get_async_db)):
+    """Liste toutes les catégories"""
+    return await crud_async.get_categories(db)
+
+
+@router.get("/transactions", response_model=TransactionPage)
+async def list_transactions(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    account_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Liste les transactions, paginées par curseur (limit plafonné à MAX_PAGE_SIZE)"""
+    try:
+        txns, next_cursor = await crud_async.get_transactions(db, limit=limit, account_id=account_id, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": txns, "next_cursor": next_cursor}
+
+
+@router.get("/transactions/range", response_model=TransactionPage)
+async def list_transactions_by_range(
+    start_date: date,
+    end_date: date,
+    account_id: Optional[int] = None,
+    transaction_type: Optional[TransactionType] = None,
+    parent_category: Optional[str] = None,
+    sub_category: Optional[str] = None,
+    exclude_internal: bool = False,
+    limit: int = MAX_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Transactions par plage de dates, paginées par curseur
+    (filtres optionnels pour le détail d'une catégorie du budget)"""
+    start_dt = datetime.combine(start_date, datetime.min.time())
+    end_dt = datetime.combine(end_date, datetime.max.time())
+    try:
+        txns, next_cursor = await crud_async.get_transactions_by_date_range(
+            db, start_dt, end_dt, account_id,
+            transaction_type=transaction_type,
+            parent_category=parent_category,
+            sub_category=sub_category,
+            exclude_internal=exclude_internal,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": txns, "next_cursor": next_cursor}
+
+
+@router.get("/transactions/search", response_model=TransactionPage)
+async def search_transactions_endpoint(
+    q: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_id: Optional[int] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Recherche plein texte (description, marchand, notes) : mots en ET,
+    "phrase exacte", préfixe*. Paginée par curseur comme /transactions."""
+    start_dt = datetime.combine(start_date, datetime.min.time()) if start_date else None
+    end_dt = datetime.combine(end_date, datetime.max.time()) if end_date else None
+    try:
+        txns, next_cursor = await crud_async.search_transactions(
+            db, q, start_dt, end_dt, account_id, limit=limit, cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": txns, "next_cursor": next_cursor}
+
+
+@router.get("/budget/summary", response_model=BudgetSummary)
+async def budget_summary(
+    start_date: date,
+    end_date: date,
+    account_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Totaux revenus / dépenses par catégorie, hors mouvements internes"""
+    start_dt = datetime.combine(start_date, datetime.min.time())
+    end_dt = datetime.combine(end_date, datetime.max.time())
+    return await crud_async.get_budget_summary(db, start_dt, end_dt, account_id)
+
+
+def use_async_reads(app: FastAPI) -> None:
+    """Retire de l'app les routes sync de même chemin et méthode que celles de ce
+    module, puis inclut ce module (à appeler une fois les routes déclarées)"""
+    replaced = {(route.path, frozenset(route.methods)) for route in router.routes}
+    app.router.routes[:] = [
+        route for route in app.router.routes
+        if not (isinstance(route, APIRoute) and (route.path, frozenset(route.methods)) in replaced)
+    ]
+    app.include_router(router)
+    app.openapi_schema = None
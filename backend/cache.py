@@ -0,0 +1,160 @@
+# backend/cache.py
+"""Cache de réponses en mémoire (TTL + LRU) pour les endpoints de lecture.
+
+Chaque endpoint cacheable déclare les domaines de données dont il dépend
+("categories", "transactions", ...). Les écritures incrémentent le compteur
+de version des domaines touchés ; la version fait partie de la clé de cache,
+une écriture rend donc immédiatement obsolètes les réponses concernées.
+Les réponses portent un ETag (hash du contenu) : un client qui renvoie
+If-None-Match reçoit un 304 sans corps tant que rien n'a changé.
+
+Le cache est propre à chaque processus : avec plusieurs workers, une
+écriture faite par un autre worker n'est vue qu'à l'expiration du TTL.
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Endpoints GET cacheables (chemin exact) -> domaines dont dépend la réponse
+CACHEABLE_ENDPOINTS: dict[str, tuple[str, ...]] = {
+    "/accounts": ("accounts",),
+    "/categories": ("categories",),
+    "/rules": ("rules",),
+    "/transactions/range": ("transactions", "categories"),
+    "/budget/summary": ("transactions", "categories"),
+    "/cashflow": ("transactions", "categories"),
+}
+
+# Écritures (méthode, chemin) -> domaines invalidés en cas de succès
+INVALIDATING_WRITES: list[tuple[str, re.Pattern, tuple[str, ...]]] = [
+    ("POST", re.compile(r"^/categories$"), ("categories",)),
+    ("POST", re.compile(r"^/rules$"), ("rules",)),
+    ("POST", re.compile(r"^/rules/apply$"), ("transactions",)),
+    ("PATCH", re.compile(r"^/transactions/\d+/category$"), ("transactions",)),
+    ("PATCH", re.compile(r"^/transactions/category$"), ("transactions", "rules")),
+    ("POST", re.compile(r"^/upload$"), ("transactions",)),
+    ("POST", re.compile(r"^/upload/batch$"), ("transactions",)),
+]
+
+
+class DataVersions:
+    """Compteurs de version par domaine de données (thread-safe)"""
+
+    def __init__(self):
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *domains: str) -> None:
+        with self._lock:
+            for domain in domains:
+                self._versions[domain] = self._versions.get(domain, 0) + 1
+
+    def get(self, domains: tuple[str, ...]) -> tuple[int, ...]:
+        with self._lock:
+            return tuple(self._versions.get(d, 0) for d in domains)
+
+
+class _Entry:
+    __slots__ = ("expires_at", "etag", "body", "media_type")
+
+    def __init__(self, expires_at: float, etag: str, body: bytes, media_type: Optional[str]):
+        self.expires_at = expires_at
+        self.etag = etag
+        self.body = body
+        self.media_type = media_type
+
+
+class ResponseCache:
+    """Stockage LRU borné avec expiration"""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: tuple, body: bytes, media_type: Optional[str]) -> _Entry:
+        entry = _Entry(time.monotonic() + self.ttl, make_etag(body), body, media_type)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.md5(body).hexdigest() + '"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def _cached_response(request: Request, entry: _Entry, hit: bool) -> Response:
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": "HIT" if hit else "MISS"}
+    if _etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """Sert les GET cacheables depuis le cache et invalide sur les écritures"""
+
+    def __init__(self, app, cache: ResponseCache, versions: DataVersions):
+        super().__init__(app)
+        self.cache = cache
+        self.versions = versions
+
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        domains = CACHEABLE_ENDPOINTS.get(path)
+
+        if request.method == "GET" and domains and self.cache.ttl > 0:
+            key = (path, tuple(sorted(request.query_params.multi_items())), self.versions.get(domains))
+            entry = self.cache.get(key)
+            if entry is not None:
+                return _cached_response(request, entry, hit=True)
+
+            response = await call_next(request)
+            if response.status_code != 200:
+                return response
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            entry = self.cache.set(key, body, response.headers.get("content-type"))
+            return _cached_response(request, entry, hit=False)
+
+        response = await call_next(request)
+        if response.status_code < 400:
+            for method, pattern, invalidated in INVALIDATING_WRITES:
+                if request.method == method and pattern.match(path):
+                    self.versions.bump(*invalidated)
+        return response
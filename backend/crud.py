@@ -1,31 +1,152 @@
 # backend/crud.py
+import base64
+from sqlalchemy import Row, RowMapping, and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from .models import Transaction, Account, Category, CategorizationRule
-from .schemas import TransactionCreate, CategorizationRuleCreate
-from typing import List, Optional
+from .models import Transaction, Account, Category, CategorizationRule, TransactionType
+from .schemas import TransactionCreate, CategorizationRuleCreate, BulkCategoryUpdate, TransactionFilter
+from .services.categorization import CategoryIndex, RuleMatcher
+from .services.rollup import RollupDeltas, apply_rollup_deltas
+from .services.search import search_condition
+from typing import Iterable, Iterator, List, Optional
 from datetime import datetime
 
+# Catégories parent du CSV Boursorama exclues des budgets (virements entre comptes)
+INTERNAL_TRANSFER_PARENTS = ("Mouvements internes débiteurs", "Mouvements internes créditeurs")
+
+# Libellé des transactions sans catégorie (ou sans parent / sous-catégorie)
+UNCATEGORIZED_LABEL = "Non catégorisé"
+
+# Taille de page maximale imposée par le serveur pour les listes de transactions
+MAX_PAGE_SIZE = 500
+
 
 def create_transaction(db: Session, transaction: TransactionCreate) -> Transaction:
     """Crée une transaction"""
     db_transaction = Transaction(**transaction.model_dump())
     db.add(db_transaction)
+    deltas = RollupDeltas()
+    deltas.add(
+        db_transaction.account_id, db_transaction.date, db_transaction.category_id,
+        db_transaction.transaction_type, db_transaction.amount_cents,
+    )
+    apply_rollup_deltas(db, deltas)
     db.commit()
     db.refresh(db_transaction)
     return db_transaction
 
 
+# Colonnes exposées par TransactionResponse (projection sans hydratation ORM)
+TRANSACTION_RESPONSE_COLUMNS = (
+    Transaction.id,
+    Transaction.account_id,
+    Transaction.category_id,
+    Transaction.transaction_type,
+    Transaction.amount,
+    Transaction.amount_cents,
+    Transaction.description,
+    Transaction.date,
+    Transaction.merchant,
+    Transaction.notes,
+    Transaction.category_parent_csv,
+    Transaction.created_at,
+    Category.name.label("category_name"),
+    Category.parent_category,
+    Category.sub_category,
+)
+
+
+def select_transaction_rows():
+    """SELECT des colonnes de TransactionResponse, catégorie jointe.
+
+    Les listes renvoient la vue RowMapping de chaque Row : ni identity map, ni
+    chargement de relation, ni copie dans un dict ; pydantic la valide comme
+    un dict (plus rapide que la lecture par attributs de from_attributes).
+    """
+    return select(*TRANSACTION_RESPONSE_COLUMNS).outerjoin(Transaction.category)
+
+
+def get_transaction_row(db: Session, txn_id: int) -> Optional[RowMapping]:
+    return db.execute(select_transaction_rows().where(Transaction.id == txn_id)).mappings().first()
+
+
+def encode_cursor(txn: Transaction | Row) -> str:
+    """Curseur opaque (date, id) de la dernière transaction d'une page"""
+    raw = f"{txn.date.isoformat()}|{txn.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Décode un curseur ; lève ValueError s'il est invalide"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date_str, txn_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(date_str), int(txn_id)
+    except Exception as e:
+        raise ValueError(f"Curseur invalide: {cursor}") from e
+
+
+def _page_limit(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def keyset_page(stmt, limit: int, cursor: Optional[str]):
+    """Pagination par clé (date desc, id desc) : coût constant quelle que soit la profondeur.
+    Sélectionne une ligne de plus que la page pour savoir s'il y a une suite."""
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            # Borne redondante : sans elle, le OR empêche SQLite de chercher dans l'index (SCAN)
+            Transaction.date <= cursor_date,
+            or_(
+                Transaction.date < cursor_date,
+                and_(Transaction.date == cursor_date, Transaction.id < cursor_id),
+            ),
+        )
+    return stmt.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(_page_limit(limit) + 1)
+
+
+def page_result(rows: List[Row], limit: int) -> tuple[List[RowMapping], Optional[str]]:
+    """(page, curseur suivant) à partir des lignes de keyset_page"""
+    limit = _page_limit(limit)
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return [row._mapping for row in rows[:limit]], next_cursor
+
+
+def _paginate(db: Session, stmt, limit: int, cursor: Optional[str]) -> tuple[List[RowMapping], Optional[str]]:
+    return page_result(db.execute(keyset_page(stmt, limit, cursor)).all(), limit)
+
+
 def get_transactions(
     db: Session,
-    skip: int = 0,
     limit: int = 100,
     account_id: Optional[int] = None,
-) -> List[Transaction]:
-    """Récupère les transactions avec filtres optionnels"""
-    query = db.query(Transaction).options(joinedload(Transaction.category))
+    cursor: Optional[str] = None,
+) -> tuple[List[RowMapping], Optional[str]]:
+    """Récupère une page de transactions et le curseur de la page suivante"""
+    return _paginate(db, transactions_stmt(account_id), limit, cursor)
+
+
+def transactions_stmt(account_id: Optional[int] = None):
+    stmt = select_transaction_rows()
     if account_id:
-        query = query.filter(Transaction.account_id == account_id)
-    return query.order_by(Transaction.date.desc()).offset(skip).limit(limit).all()
+        stmt = stmt.where(Transaction.account_id == account_id)
+    return stmt
+
+
+def _exclude_internal_transfers(query):
+    """Filtre les mouvements internes (en gardant les lignes sans catégorie CSV)"""
+    return query.filter(or_(
+        Transaction.category_parent_csv == None,
+        Transaction.category_parent_csv.notin_(INTERNAL_TRANSFER_PARENTS),
+    ))
+
+
+def _filter_category_level(query, column, value: str):
+    """Filtre sur parent_category / sub_category, UNCATEGORIZED_LABEL = valeur absente"""
+    if value == UNCATEGORIZED_LABEL:
+        return query.filter(column == None)
+    return query.filter(column == value)
 
 
 def get_transactions_by_date_range(
@@ -33,16 +154,158 @@ def get_transactions_by_date_range(
     start: datetime,
     end: datetime,
     account_id: Optional[int] = None,
-) -> List[Transaction]:
-    """Récupère les transactions par plage de dates avec eager loading de category"""
-    query = (
-        db.query(Transaction)
-        .options(joinedload(Transaction.category))
-        .filter(Transaction.date >= start, Transaction.date <= end)
+    transaction_type: Optional[TransactionType] = None,
+    parent_category: Optional[str] = None,
+    sub_category: Optional[str] = None,
+    exclude_internal: bool = False,
+    limit: int = MAX_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> tuple[List[RowMapping], Optional[str]]:
+    """Récupère une page de transactions par plage de dates (catégorie jointe)"""
+    stmt = date_range_stmt(
+        start, end, account_id, transaction_type, parent_category, sub_category, exclude_internal,
     )
+    return _paginate(db, stmt, limit, cursor)
+
+
+def date_range_stmt(
+    start: datetime,
+    end: datetime,
+    account_id: Optional[int] = None,
+    transaction_type: Optional[TransactionType] = None,
+    parent_category: Optional[str] = None,
+    sub_category: Optional[str] = None,
+    exclude_internal: bool = False,
+):
+    stmt = select_transaction_rows().where(Transaction.date >= start, Transaction.date <= end)
+    if account_id:
+        stmt = stmt.where(Transaction.account_id == account_id)
+    if transaction_type:
+        stmt = stmt.where(Transaction.transaction_type == transaction_type)
+    if parent_category is not None:
+        stmt = _filter_category_level(stmt, Category.parent_category, parent_category)
+    if sub_category is not None:
+        stmt = _filter_category_level(stmt, Category.sub_category, sub_category)
+    if exclude_internal:
+        stmt = _exclude_internal_transfers(stmt)
+    return stmt
+
+
+def search_transactions(
+    db: Session,
+    q: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    account_id: Optional[int] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> tuple[List[RowMapping], Optional[str]]:
+    """Recherche plein texte (description, marchand, notes), paginée comme les listes.
+    Lève ValueError si la recherche est vide ou le curseur invalide."""
+    return _paginate(db, search_stmt(db, q, start, end, account_id), limit, cursor)
+
+
+def search_stmt(
+    db: Session | AsyncSession,
+    q: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    account_id: Optional[int] = None,
+):
+    stmt = select_transaction_rows().where(search_condition(db, q))
+    if start:
+        stmt = stmt.where(Transaction.date >= start)
+    if end:
+        stmt = stmt.where(Transaction.date <= end)
     if account_id:
-        query = query.filter(Transaction.account_id == account_id)
-    return query.order_by(Transaction.date.desc()).all()
+        stmt = stmt.where(Transaction.account_id == account_id)
+    return stmt
+
+
+def iter_transactions_by_date_range(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    account_id: Optional[int] = None,
+    batch_size: int = 1000,
+) -> Iterator[dict]:
+    """Parcourt une plage de dates en flux (yield_per), une ligne = un dict prêt à sérialiser"""
+    stmt = select_transaction_rows().where(Transaction.date >= start, Transaction.date <= end)
+    if account_id:
+        stmt = stmt.where(Transaction.account_id == account_id)
+    stmt = stmt.order_by(Transaction.date.desc(), Transaction.id.desc())
+
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    keys = tuple(result.keys())
+    for row in result:
+        yield dict(zip(keys, row))
+
+
+def get_budget_summary(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    account_id: Optional[int] = None,
+) -> dict:
+    """Totaux du budget par catégorie parent / sous-catégorie, calculés en SQL (GROUP BY).
+
+    Les mouvements internes sont exclus, comme sur la page Budget.
+    """
+    return budget_summary_from_rows(db.execute(budget_summary_stmt(start, end, account_id)).all())
+
+
+def budget_summary_stmt(start: datetime, end: datetime, account_id: Optional[int] = None):
+    stmt = (
+        select(
+            Transaction.transaction_type,
+            Category.parent_category,
+            Category.sub_category,
+            func.sum(func.abs(Transaction.amount_cents)),
+            func.count(Transaction.id),
+        )
+        .outerjoin(Transaction.category)
+        .where(Transaction.date >= start, Transaction.date <= end)
+    )
+    if account_id:
+        stmt = stmt.where(Transaction.account_id == account_id)
+    return _exclude_internal_transfers(stmt).group_by(
+        Transaction.transaction_type, Category.parent_category, Category.sub_category
+    )
+
+
+def budget_summary_from_rows(rows: Iterable[Row]) -> dict:
+    """Arbre du budget à partir des lignes (type, parent, sous-catégorie, total, nombre)"""
+    # Cumuls exacts en centimes, convertis en euros une fois l'arbre construit
+    trees = {TransactionType.DEBIT: {}, TransactionType.CREDIT: {}}
+    totals = {TransactionType.DEBIT: 0, TransactionType.CREDIT: 0}
+    counts = {TransactionType.DEBIT: 0, TransactionType.CREDIT: 0}
+
+    for txn_type, parent, sub, total, count in rows:
+        total = total or 0
+        node = trees[txn_type].setdefault(
+            parent or UNCATEGORIZED_LABEL, {"total": 0, "count": 0, "subs": {}}
+        )
+        leaf = node["subs"].setdefault(sub or UNCATEGORIZED_LABEL, {"total": 0, "count": 0})
+        for entry in (node, leaf):
+            entry["total"] += total
+            entry["count"] += count
+        totals[txn_type] += total
+        counts[txn_type] += count
+
+    for tree in trees.values():
+        for node in tree.values():
+            node["total"] /= 100
+            for leaf in node["subs"].values():
+                leaf["total"] /= 100
+
+    return {
+        "income": totals[TransactionType.CREDIT] / 100,
+        "expenses": totals[TransactionType.DEBIT] / 100,
+        "income_count": counts[TransactionType.CREDIT],
+        "expense_count": counts[TransactionType.DEBIT],
+        "income_tree": trees[TransactionType.CREDIT],
+        "expense_tree": trees[TransactionType.DEBIT],
+    }
 
 
 def update_transaction_category(db: Session, txn_id: int, category_id: int) -> Transaction:
@@ -50,20 +313,122 @@ def update_transaction_category(db: Session, txn_id: int, category_id: int) -> T
     txn = db.query(Transaction).options(joinedload(Transaction.category)).filter(Transaction.id == txn_id).first()
     if not txn:
         return None
+    deltas = RollupDeltas()
+    deltas.move(txn, txn.category_id, category_id)
     txn.category_id = category_id
+    apply_rollup_deltas(db, deltas)
     db.commit()
     db.refresh(txn)
     return txn
 
 
+# Taille des paquets d'ids passés en IN (limite de paramètres SQLite)
+ID_CHUNK_SIZE = 900
+
+# Colonnes nécessaires au calcul des deltas de l'agrégat mensuel
+_ROLLUP_COLUMNS = (
+    Transaction.id,
+    Transaction.account_id,
+    Transaction.date,
+    Transaction.transaction_type,
+    Transaction.amount_cents,
+    Transaction.category_id,
+)
+
+
+def _transaction_filter_conditions(txn_filter: TransactionFilter) -> list:
+    """Traduit un TransactionFilter en conditions SQL"""
+    conditions = []
+    if txn_filter.start_date:
+        conditions.append(Transaction.date >= datetime.combine(txn_filter.start_date, datetime.min.time()))
+    if txn_filter.end_date:
+        conditions.append(Transaction.date <= datetime.combine(txn_filter.end_date, datetime.max.time()))
+    if txn_filter.account_id is not None:
+        conditions.append(Transaction.account_id == txn_filter.account_id)
+    if txn_filter.uncategorized_only:
+        conditions.append(Transaction.category_id == None)
+    if txn_filter.description_contains:
+        conditions.append(Transaction.description.icontains(txn_filter.description_contains, autoescape=True))
+    if txn_filter.merchant_contains:
+        conditions.append(Transaction.merchant.icontains(txn_filter.merchant_contains, autoescape=True))
+    return conditions
+
+
+def bulk_update_transaction_categories(db: Session, payload: BulkCategoryUpdate) -> dict:
+    """Re-catégorise un lot de transactions en un seul commit.
+
+    Liste {id, category_id} : un UPDATE executemany par clé primaire.
+    Filtre + catégorie : un seul UPDATE ... WHERE. La règle éventuelle et
+    l'agrégat mensuel sont écrits dans la même transaction.
+    Lève LookupError si une catégorie cible n'existe pas.
+    """
+    if payload.items is not None:
+        targets = {item.id: item.category_id for item in payload.items}
+        category_ids = set(targets.values())
+    else:
+        targets = None
+        category_ids = {payload.category_id}
+    if payload.create_rule:
+        category_ids.add(payload.create_rule.category_id)
+    missing = category_ids - set(db.scalars(select(Category.id).where(Category.id.in_(category_ids))))
+    if missing:
+        raise LookupError(f"Catégorie(s) introuvable(s) : {sorted(missing)}")
+
+    deltas = RollupDeltas()
+    not_found = []
+    if targets is not None:
+        ids = list(targets)
+        rows = []
+        for i in range(0, len(ids), ID_CHUNK_SIZE):
+            rows.extend(db.execute(
+                select(*_ROLLUP_COLUMNS).where(Transaction.id.in_(ids[i:i + ID_CHUNK_SIZE]))
+            ))
+        found = {row.id for row in rows}
+        not_found = [txn_id for txn_id in ids if txn_id not in found]
+        changed = [row for row in rows if row.category_id != targets[row.id]]
+        for row in changed:
+            deltas.move(row, row.category_id, targets[row.id])
+        if changed:
+            db.execute(
+                update(Transaction).execution_options(synchronize_session=False),
+                [{"id": row.id, "category_id": targets[row.id]} for row in changed],
+            )
+        updated = len(changed)
+    else:
+        conditions = _transaction_filter_conditions(payload.filter)
+        conditions.append(Transaction.category_id.is_distinct_from(payload.category_id))
+        for row in db.execute(select(*_ROLLUP_COLUMNS).where(*conditions)):
+            deltas.move(row, row.category_id, payload.category_id)
+        result = db.execute(
+            update(Transaction)
+            .where(*conditions)
+            .values(category_id=payload.category_id)
+            .execution_options(synchronize_session=False)
+        )
+        updated = result.rowcount
+
+    rule = None
+    if payload.create_rule:
+        rule = CategorizationRule(**payload.create_rule.model_dump())
+        db.add(rule)
+    apply_rollup_deltas(db, deltas)
+    db.commit()
+    if rule is not None:
+        db.refresh(rule)
+    return {"updated": updated, "not_found": not_found, "rule": rule}
+
+
+ACTIVE_ACCOUNTS = select(Account).where(Account.is_active == True)
+
+
 def get_accounts(db: Session) -> List[Account]:
     """Récupère tous les comptes actifs"""
-    return db.query(Account).filter(Account.is_active == True).all()
+    return db.scalars(ACTIVE_ACCOUNTS).all()
 
 
 def get_categories(db: Session) -> List[Category]:
     """Récupère toutes les catégories"""
-    return db.query(Category).all()
+    return db.scalars(select(Category)).all()
 
 
 def create_category(db: Session, name: str, parent_category: str, sub_category: str) -> Category:
@@ -77,12 +442,8 @@ def create_category(db: Session, name: str, parent_category: str, sub_category:
 
 def find_category_by_keyword(db: Session, keyword: str) -> Optional[Category]:
     """Trouve une catégorie par mot-clé dans le nom"""
-    keyword = keyword.lower()
-    categories = db.query(Category).all()
-    for cat in categories:
-        if keyword in cat.name.lower():
-            return cat
-    return None
+    cat_id = CategoryIndex.from_db(db).find_id(keyword)
+    return db.get(Category, cat_id) if cat_id is not None else None
 
 
 def transaction_exists(db: Session, import_id: str) -> bool:
@@ -90,6 +451,26 @@ def transaction_exists(db: Session, import_id: str) -> bool:
     return db.query(Transaction).filter(Transaction.import_id == import_id).first() is not None
 
 
+def get_import_ids_in_range(
+    db: Session,
+    account_id: int,
+    start: datetime,
+    end: datetime,
+) -> set[str]:
+    """Charge en une requête les import_ids d'un compte sur une plage de dates"""
+    rows = (
+        db.query(Transaction.import_id)
+        .filter(
+            Transaction.account_id == account_id,
+            Transaction.date >= start,
+            Transaction.date <= end,
+            Transaction.import_id != None,
+        )
+        .all()
+    )
+    return {row[0] for row in rows}
+
+
 # --- Categorization Rules ---
 
 def get_categorization_rules(db: Session, active_only: bool = True) -> List[CategorizationRule]:
@@ -109,22 +490,116 @@ def create_categorization_rule(db: Session, rule: CategorizationRuleCreate) -> C
     return db_rule
 
 
-def apply_rules_to_uncategorized(db: Session) -> int:
+def preview_rule_keyword(
+    db: Session,
+    rule: CategorizationRuleCreate,
+    uncategorized_only: bool = False,
+    sample_size: int = 20,
+) -> dict:
+    """Transactions qu'une règle toucherait, via l'index plein texte.
+
+    L'index ramène les candidates dont un mot commence par le mot-clé ; la
+    sémantique exacte de la règle (sous-chaîne, repli marchand -> description)
+    est ensuite vérifiée par RuleMatcher. Un mot-clé qui commence au milieu
+    d'un mot n'est pas trouvé ici : le dry_run de /rules/apply reste exhaustif.
+    """
+    columns = ("merchant", "description") if rule.match_field == "merchant" else ("description",)
+    query = select(Transaction.id, Transaction.description, Transaction.merchant).where(
+        search_condition(db, '"' + rule.keyword.replace('"', " ") + '"*', columns)
+    )
+    if uncategorized_only:
+        query = query.where(Transaction.category_id == None)
+    matcher = RuleMatcher([rule])
+    ids = [
+        row.id for row in db.execute(query.order_by(Transaction.date.desc(), Transaction.id.desc()))
+        if matcher.match_rank(row.description, row.merchant) is not None
+    ]
+    sample = db.execute(
+        select_transaction_rows()
+        .where(Transaction.id.in_(ids[:sample_size]))
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+    ).mappings().all()
+    return {"matches": len(ids), "sample": sample}
+
+
+# Lignes traitées (et commitées) par lot lors de l'application des règles
+RULES_BATCH_SIZE = 5000
+# Ids d'exemple renvoyés par règle
+RULES_SAMPLE_SIZE = 10
+
+
+def apply_rules_in_batches(
+    db: Session,
+    dry_run: bool = False,
+    candidate_rules: Iterable[CategorizationRuleCreate] = (),
+    batch_size: int = RULES_BATCH_SIZE,
+    sample_size: int = RULES_SAMPLE_SIZE,
+) -> dict:
+    """Applique les règles aux transactions sans catégorie, lot par lot.
+
+    Les lignes sans catégorie sont parcourues par id croissant (keyset sur
+    l'index partiel), batch_size à la fois, avec un commit par lot : le verrou
+    d'écriture n'est jamais tenu pour tout l'historique. En dry_run rien n'est
+    écrit ; on renvoie seulement, par règle, le nombre de correspondances et
+    quelques ids. Les règles candidates (non enregistrées) ne s'utilisent qu'en dry_run.
+    """
+    candidate_rules = list(candidate_rules)
+    if candidate_rules and not dry_run:
+        raise ValueError("Les règles candidates ne s'utilisent qu'en dry_run")
+
+    matcher = RuleMatcher.from_db(db, candidate_rules)
+    rules = [
+        {
+            "rule_id": getattr(rule, "id", None),
+            "keyword": rule.keyword,
+            "category_id": rule.category_id,
+            "match_field": rule.match_field,
+            "matches": 0,
+            "sample_ids": [],
+        }
+        for rule in matcher.rules
+    ]
+    result = {"dry_run": dry_run, "scanned": 0, "matched": 0, "updated": 0, "batches": 0, "rules": rules}
+    if not len(matcher):
+        return result
+
+    last_id = 0
+    while True:
+        batch = db.execute(
+            select(*_ROLLUP_COLUMNS, Transaction.description, Transaction.merchant)
+            .where(Transaction.category_id == None, Transaction.id > last_id)
+            .order_by(Transaction.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+        result["scanned"] += len(batch)
+        result["batches"] += 1
+
+        assignments = []
+        deltas = RollupDeltas()
+        for row in batch:
+            rank = matcher.match_rank(row.description, row.merchant)
+            if rank is None:
+                continue
+            stats = rules[rank]
+            stats["matches"] += 1
+            if len(stats["sample_ids"]) < sample_size:
+                stats["sample_ids"].append(row.id)
+            assignments.append({"id": row.id, "category_id": stats["category_id"]})
+            deltas.move(row, None, stats["category_id"])
+        result["matched"] += len(assignments)
+
+        if dry_run or not assignments:
+            continue
+        db.execute(update(Transaction).execution_options(synchronize_session=False), assignments)
+        apply_rollup_deltas(db, deltas)
+        db.commit()
+        result["updated"] += len(assignments)
+    return result
+
+
+def apply_rules_to_uncategorized(db: Session, batch_size: int = RULES_BATCH_SIZE) -> int:
     """Applique les règles actives aux transactions sans catégorie. Retourne le nombre de transactions mises à jour."""
-    rules = get_categorization_rules(db, active_only=True)
-    uncategorized = db.query(Transaction).filter(Transaction.category_id == None).all()
-    count = 0
-    for txn in uncategorized:
-        for rule in rules:
-            field_value = ""
-            if rule.match_field == "merchant" and txn.merchant:
-                field_value = txn.merchant.lower()
-            elif txn.description:
-                field_value = txn.description.lower()
-
-            if rule.keyword.lower() in field_value:
-                txn.category_id = rule.category_id
-                count += 1
-                break
-    db.commit()
-    return count
+    return apply_rules_in_batches(db, batch_size=batch_size)["updated"]
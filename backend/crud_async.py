@@ -0,0 +1,87 @@
+# backend/crud_async.py
+"""Versions async (AsyncSession) des lectures de crud.py.
+
+Mêmes signatures et mêmes résultats : les requêtes sont construites par les
+fonctions *_stmt de crud.py, seule l'exécution diffère. Utilisées par les
+routes de async_routes.py en mode FINANCE_DB_ASYNC.
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import RowMapping, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .crud import (
+    ACTIVE_ACCOUNTS,
+    MAX_PAGE_SIZE,
+    budget_summary_from_rows,
+    budget_summary_stmt,
+    date_range_stmt,
+    keyset_page,
+    page_result,
+    search_stmt,
+    transactions_stmt,
+)
+from .models import Account, Category, TransactionType
+
+
+async def _paginate(db: AsyncSession, stmt, limit: int, cursor: Optional[str]) -> tuple[List[RowMapping], Optional[str]]:
+    result = await db.execute(keyset_page(stmt, limit, cursor))
+    return page_result(result.all(), limit)
+
+
+async def get_transactions(
+    db: AsyncSession,
+    limit: int = 100,
+    account_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> tuple[List[RowMapping], Optional[str]]:
+    return await _paginate(db, transactions_stmt(account_id), limit, cursor)
+
+
+async def get_transactions_by_date_range(
+    db: AsyncSession,
+    start: datetime,
+    end: datetime,
+    account_id: Optional[int] = None,
+    transaction_type: Optional[TransactionType] = None,
+    parent_category: Optional[str] = None,
+    sub_category: Optional[str] = None,
+    exclude_internal: bool = False,
+    limit: int = MAX_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> tuple[List[RowMapping], Optional[str]]:
+    stmt = date_range_stmt(
+        start, end, account_id, transaction_type, parent_category, sub_category, exclude_internal,
+    )
+    return await _paginate(db, stmt, limit, cursor)
+
+
+async def search_transactions(
+    db: AsyncSession,
+    q: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    account_id: Optional[int] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> tuple[List[RowMapping], Optional[str]]:
+    return await _paginate(db, search_stmt(db, q, start, end, account_id), limit, cursor)
+
+
+async def get_budget_summary(
+    db: AsyncSession,
+    start: datetime,
+    end: datetime,
+    account_id: Optional[int] = None,
+) -> dict:
+    result = await db.execute(budget_summary_stmt(start, end, account_id))
+    return budget_summary_from_rows(result.all())
+
+
+async def get_accounts(db: AsyncSession) -> List[Account]:
+    return (await db.scalars(ACTIVE_ACCOUNTS)).all()
+
+
+async def get_categories(db: AsyncSession) -> List[Category]:
+    return (await db.scalars(select(Category))).all()
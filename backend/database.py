@@ -1,20 +1,80 @@
 # backend/database.py
-from sqlalchemy import create_engine
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from .models import Base
+from .migrations import LATEST_VERSION, get_schema_version, run_migrations
+from .settings import DatabaseSettings
+
+settings = DatabaseSettings.from_env()
+
+SQLALCHEMY_DATABASE_URL = settings.url
+
+
+def create_db_engine(settings: DatabaseSettings) -> Engine:
+    """Crée le moteur SQLAlchemy ; pour SQLite, applique les PRAGMA à chaque connexion"""
+    kwargs = _engine_kwargs(settings)
+    if not settings.is_sqlite:
+        return create_engine(settings.url, **kwargs)
+
+    db_engine = create_engine(
+        settings.url,
+        connect_args={"check_same_thread": False},
+        **kwargs,
+    )
+    _install_sqlite_pragmas(db_engine, settings)
+    return db_engine
+
+
+def _engine_kwargs(settings: DatabaseSettings) -> dict:
+    kwargs = {"echo": settings.echo}
+    for option in ("pool_size", "max_overflow", "pool_timeout"):
+        value = getattr(settings, option)
+        if value is not None:
+            kwargs[option] = value
+    return kwargs
+
+
+def _install_sqlite_pragmas(db_engine: Engine, settings: DatabaseSettings) -> None:
+    pragmas = settings.sqlite.statements()
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///../finance.db"
+    @event.listens_for(db_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
+
+def create_async_db_engine(settings: DatabaseSettings) -> AsyncEngine:
+    """Moteur async (aiosqlite, asyncpg) sur la même base, mêmes PRAGMA SQLite.
+    Le driver n'est importé qu'ici : il n'est requis qu'en mode FINANCE_DB_ASYNC."""
+    db_engine = create_async_engine(settings.async_url, **_engine_kwargs(settings))
+    if settings.is_sqlite:
+        _install_sqlite_pragmas(db_engine.sync_engine, settings)
+    return db_engine
+
+
+engine = create_db_engine(settings)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Créés au premier usage : le driver async n'est requis qu'en mode FINANCE_DB_ASYNC
+_async_sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+
 def init_db():
-    """Crée toutes les tables dans la base de données"""
+    """Crée toutes les tables dans la base de données et applique les migrations.
+    Base déjà à la dernière version du schéma : rien à faire (démarrage rapide)."""
+    with engine.connect() as conn:
+        if get_schema_version(conn) >= LATEST_VERSION:
+            return
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     print("✓ Base de données initialisée")
 
 def get_db():
@@ -26,4 +86,17 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_sessionmaker = async_sessionmaker(create_async_db_engine(settings), expire_on_commit=False)
+    return _async_sessionmaker
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency async : AsyncSession fermée après la requête"""
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -1,35 +1,62 @@
 # backend/main.py
-from fastapi import FastAPI, UploadFile, File, Depends, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, Depends, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from sqlalchemy.orm import Session
-import tempfile
-import os
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import date, datetime
+import json
+import shutil
+import tempfile
 
-from .database import get_db, init_db
+from .cache import DataVersions, ResponseCache, ResponseCacheMiddleware
+from .async_routes import use_async_reads
+from .database import get_db, init_db, SessionLocal, settings as db_settings
+from .metrics import REGISTRY, PROMETHEUS_MEDIA_TYPE, InstrumentedRoute, MetricsMiddleware, install_query_hooks
+from .settings import CacheSettings, ImportSettings, MetricsSettings
+from .models import TransactionType
+from .streaming import iter_json_array, iter_ndjson, JSON_MEDIA_TYPE, NDJSON_MEDIA_TYPE
 from .schemas import (
     TransactionResponse,
+    TransactionPage,
     TransactionUpdate,
+    BulkCategoryUpdate,
+    BulkCategoryUpdateResult,
     AccountResponse,
     CategoryCreate,
     CategoryResponse,
     CategorizationRuleCreate,
     CategorizationRuleResponse,
-    ImportStats,
+    RulesApplyRequest,
+    RulesApplyResult,
+    RulePreview,
+    BudgetSummary,
+    CashflowMonth,
+    ImportJobResponse,
+    AccountTotals,
 )
 from .crud import (
     get_transactions,
+    get_transaction_row,
     get_transactions_by_date_range,
+    search_transactions,
     update_transaction_category,
+    bulk_update_transaction_categories,
     get_accounts,
     get_categories,
     create_category,
     get_categorization_rules,
     create_categorization_rule,
-    apply_rules_to_uncategorized,
+    preview_rule_keyword,
+    apply_rules_in_batches,
+    get_budget_summary,
+    iter_transactions_by_date_range,
+    MAX_PAGE_SIZE,
 )
-from .services.import_service import BankCSVImporter
+from .services.columnar import ColumnarStore
+from .services.import_jobs import ImportJobManager, stage_batch_uploads
+from .services.parsers import BankParser, available_parsers, get_parser
+from .services.rollup import get_cashflow
 
 app = FastAPI(
     title="Finance Manager API",
@@ -37,6 +64,21 @@ app = FastAPI(
     version="1.0.0",
 )
 
+metrics_settings = MetricsSettings.from_env()
+if metrics_settings.profile_slow_ms is not None:
+    # Endpoints exécutés sous cProfile (avant la déclaration des routes)
+    app.router.route_class = InstrumentedRoute
+install_query_hooks()
+
+cache_settings = CacheSettings.from_env()
+data_versions = DataVersions()
+columnar_store = ColumnarStore(ttl=cache_settings.ttl)
+response_cache = ResponseCache(maxsize=cache_settings.maxsize, ttl=cache_settings.ttl)
+
+app.add_middleware(ResponseCacheMiddleware, cache=response_cache, versions=data_versions)
+# Ajouté après le cache : englobe aussi les réponses servies depuis le cache
+app.add_middleware(MetricsMiddleware, settings=metrics_settings)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -46,16 +88,43 @@ app.add_middleware(
 )
 
 
+# Chaque chunk commité par un import en arrière-plan invalide les lectures de transactions
+import_settings = ImportSettings.from_env()
+import_jobs = ImportJobManager(
+    SessionLocal,
+    on_commit=lambda: data_versions.bump("transactions"),
+    parse_workers=import_settings.parse_workers,
+    job_retention=import_settings.job_retention,
+    max_finished_jobs=import_settings.max_finished_jobs,
+)
+
+
+def get_import_jobs() -> ImportJobManager:
+    """Dependency : gestionnaire des imports en arrière-plan"""
+    return import_jobs
+
+
 @app.on_event("startup")
 def startup_event():
     init_db()
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    import_jobs.shutdown(wait=False)
+
+
 @app.get("/")
 def root():
     return {"message": "Finance Manager API", "status": "running"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Métriques du processus au format texte Prometheus"""
+    return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+
 # --- Accounts ---
 
 @app.get("/accounts", response_model=List[AccountResponse])
@@ -64,6 +133,30 @@ def list_accounts(db: Session = Depends(get_db)):
     return get_accounts(db)
 
 
+@app.get("/accounts/{account_id}/totals", response_model=AccountTotals)
+def account_totals(
+    account_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    group_by: Optional[Literal["category", "month"]] = None,
+    db: Session = Depends(get_db),
+):
+    """Crédits, débits et solde d'un compte (en centimes), éventuellement par catégorie ou par mois.
+
+    Calculé sur l'historique du compte en tableaux NumPy (services/columnar),
+    gardé en mémoire tant que les transactions ne changent pas (au plus FINANCE_CACHE_TTL).
+    """
+    if not any(acc.id == account_id for acc in get_accounts(db)):
+        raise HTTPException(status_code=404, detail=f"Compte {account_id} introuvable")
+    history = columnar_store.get(db, account_id, data_versions.get(("transactions",)))
+    groups = []
+    if group_by == "category":
+        groups = history.by_category(start_date, end_date)
+    elif group_by == "month":
+        groups = history.by_month(start_date, end_date)
+    return {"account_id": account_id, "totals": history.totals(start_date, end_date), "groups": groups}
+
+
 # --- Categories ---
 
 @app.get("/categories", response_model=List[CategoryResponse])
@@ -80,30 +173,101 @@ def create_new_category(payload: CategoryCreate, db: Session = Depends(get_db)):
 
 # --- Transactions ---
 
-@app.get("/transactions", response_model=List[TransactionResponse])
+@app.get("/transactions", response_model=TransactionPage)
 def list_transactions(
-    skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     account_id: Optional[int] = None,
     db: Session = Depends(get_db),
 ):
-    """Liste les transactions avec pagination"""
-    txns = get_transactions(db, skip=skip, limit=limit, account_id=account_id)
-    return _enrich_transactions(txns)
+    """Liste les transactions, paginées par curseur (limit plafonné à MAX_PAGE_SIZE)"""
+    try:
+        txns, next_cursor = get_transactions(db, limit=limit, account_id=account_id, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": txns, "next_cursor": next_cursor}
 
 
-@app.get("/transactions/range", response_model=List[TransactionResponse])
+@app.get("/transactions/range", response_model=TransactionPage)
 def list_transactions_by_range(
     start_date: date,
     end_date: date,
     account_id: Optional[int] = None,
+    transaction_type: Optional[TransactionType] = None,
+    parent_category: Optional[str] = None,
+    sub_category: Optional[str] = None,
+    exclude_internal: bool = False,
+    limit: int = MAX_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Transactions par plage de dates, paginées par curseur
+    (filtres optionnels pour le détail d'une catégorie du budget)"""
+    start_dt = datetime.combine(start_date, datetime.min.time())
+    end_dt = datetime.combine(end_date, datetime.max.time())
+    try:
+        txns, next_cursor = get_transactions_by_date_range(
+            db, start_dt, end_dt, account_id,
+            transaction_type=transaction_type,
+            parent_category=parent_category,
+            sub_category=sub_category,
+            exclude_internal=exclude_internal,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": txns, "next_cursor": next_cursor}
+
+
+@app.get("/transactions/search", response_model=TransactionPage)
+def search_transactions_endpoint(
+    q: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_id: Optional[int] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Recherche plein texte (description, marchand, notes) : mots en ET,
+    "phrase exacte", préfixe*. Paginée par curseur comme /transactions."""
+    start_dt = datetime.combine(start_date, datetime.min.time()) if start_date else None
+    end_dt = datetime.combine(end_date, datetime.max.time()) if end_date else None
+    try:
+        txns, next_cursor = search_transactions(
+            db, q, start_dt, end_dt, account_id, limit=limit, cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": txns, "next_cursor": next_cursor}
+
+
+@app.get("/transactions/range/export")
+def export_transactions_by_range(
+    start_date: date,
+    end_date: date,
+    account_id: Optional[int] = None,
+    format: Literal["json", "ndjson"] = "ndjson",
     db: Session = Depends(get_db),
 ):
-    """Transactions par plage de dates"""
+    """Export en flux de toute une plage (tableau JSON ou NDJSON), sans pagination"""
     start_dt = datetime.combine(start_date, datetime.min.time())
     end_dt = datetime.combine(end_date, datetime.max.time())
-    txns = get_transactions_by_date_range(db, start_dt, end_dt, account_id)
-    return _enrich_transactions(txns)
+    rows = iter_transactions_by_date_range(db, start_dt, end_dt, account_id)
+    if format == "json":
+        return StreamingResponse(iter_json_array(rows), media_type=JSON_MEDIA_TYPE)
+    return StreamingResponse(iter_ndjson(rows), media_type=NDJSON_MEDIA_TYPE)
+
+
+@app.patch("/transactions/category", response_model=BulkCategoryUpdateResult)
+def recategorize_transactions(payload: BulkCategoryUpdate, db: Session = Depends(get_db)):
+    """Re-catégorise un lot (liste {id, category_id} ou filtre + catégorie) en un seul commit,
+    en créant éventuellement la règle correspondante"""
+    try:
+        return bulk_update_transaction_categories(db, payload)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
 
 @app.patch("/transactions/{txn_id}/category", response_model=TransactionResponse)
@@ -112,7 +276,33 @@ def recategorize_transaction(txn_id: int, payload: TransactionUpdate, db: Sessio
     txn = update_transaction_category(db, txn_id, payload.category_id)
     if not txn:
         raise HTTPException(status_code=404, detail="Transaction introuvable")
-    return _enrich_transactions([txn])[0]
+    return get_transaction_row(db, txn_id)
+
+
+# --- Budget ---
+
+@app.get("/budget/summary", response_model=BudgetSummary)
+def budget_summary(
+    start_date: date,
+    end_date: date,
+    account_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    """Totaux revenus / dépenses par catégorie, hors mouvements internes"""
+    start_dt = datetime.combine(start_date, datetime.min.time())
+    end_dt = datetime.combine(end_date, datetime.max.time())
+    return get_budget_summary(db, start_dt, end_dt, account_id)
+
+
+@app.get("/cashflow", response_model=List[CashflowMonth])
+def cashflow(
+    start_month: str = Query(..., pattern=r"^\d{4}-\d{2}$"),
+    end_month: str = Query(..., pattern=r"^\d{4}-\d{2}$"),
+    account_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    """Revenus et dépenses par mois (YYYY-MM), lus depuis l'agrégat mensuel"""
+    return get_cashflow(db, start_month, end_month, account_id)
 
 
 # --- Categorization Rules ---
@@ -129,75 +319,132 @@ def create_rule(payload: CategorizationRuleCreate, db: Session = Depends(get_db)
     return create_categorization_rule(db, payload)
 
 
-@app.post("/rules/apply")
-def apply_rules(db: Session = Depends(get_db)):
-    """Appliquer les règles aux transactions non catégorisées"""
-    count = apply_rules_to_uncategorized(db)
-    return {"updated": count}
+@app.get("/rules/preview", response_model=RulePreview)
+def preview_rule(
+    keyword: str = Query(..., min_length=1),
+    match_field: Literal["description", "merchant"] = "description",
+    uncategorized_only: bool = False,
+    db: Session = Depends(get_db),
+):
+    """Transactions qu'une règle (non enregistrée) toucherait : nombre et échantillon"""
+    rule = CategorizationRuleCreate(keyword=keyword, category_id=0, match_field=match_field)
+    try:
+        result = preview_rule_keyword(db, rule, uncategorized_only=uncategorized_only)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result
+
+
+@app.post("/rules/apply", response_model=RulesApplyResult)
+def apply_rules(payload: Optional[RulesApplyRequest] = None, db: Session = Depends(get_db)):
+    """Appliquer les règles aux transactions non catégorisées, par lots commités.
+
+    Avec dry_run, rien n'est écrit : renvoie le nombre de correspondances et
+    des ids d'exemple par règle (y compris pour des règles candidates).
+    """
+    payload = payload or RulesApplyRequest()
+    return apply_rules_in_batches(db, dry_run=payload.dry_run, candidate_rules=payload.candidate_rules)
 
 
 # --- Import ---
 
-@app.post("/upload")
-async def upload_csv(
+def _get_parser_or_400(bank_type: str) -> BankParser:
+    try:
+        return get_parser(bank_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/import/formats", response_model=List[str])
+def list_import_formats():
+    """Formats d'export bancaire acceptés (paramètre bank_type des uploads)"""
+    return available_parsers()
+
+
+@app.post("/upload", response_model=ImportJobResponse, status_code=202)
+def upload_csv(
     file: UploadFile,
     account_id: int = 1,
+    bank_type: str = "boursorama",
     db: Session = Depends(get_db),
+    jobs: ImportJobManager = Depends(get_import_jobs),
 ):
-    """Upload et importe un CSV bancaire"""
+    """Upload un export bancaire et lance son import en arrière-plan.
+
+    bank_type : format du fichier (GET /import/formats).
+    Retourne immédiatement le job ; sa progression se suit via GET /imports/{job_id}.
+    """
 
     accounts = get_accounts(db)
     if not any(acc.id == account_id for acc in accounts):
         raise HTTPException(status_code=404, detail=f"Compte {account_id} introuvable")
 
-    if not file.filename.endswith(".csv"):
-        raise HTTPException(status_code=400, detail="Le fichier doit être un CSV")
+    parser = _get_parser_or_400(bank_type)
+    if not parser.accepts(file.filename):
+        raise HTTPException(status_code=400, detail=f"Le fichier doit être un {', '.join(parser.extensions)}")
+
+    job = jobs.submit(file.file, file.filename, account_id, bank_type)
+    return job.to_response()
+
 
+@app.post("/upload/batch", response_model=ImportJobResponse, status_code=202)
+def upload_batch(
+    files: List[UploadFile] = File(...),
+    accounts: Optional[str] = Form(None),
+    account_id: int = Form(1),
+    bank_type: str = Form("boursorama"),
+    db: Session = Depends(get_db),
+    jobs: ImportJobManager = Depends(get_import_jobs),
+):
+    """Upload de plusieurs exports (ou d'archives zip) au format bank_type, importés en un seul job.
+
+    accounts : JSON {"nom_du_fichier.csv": account_id} ; les fichiers absents
+    de la correspondance vont sur account_id. Le parsing est parallélisé, les
+    écritures sérialisées ; le job donne les stats par fichier et le cumul.
+    """
+    try:
+        mapping = json.loads(accounts) if accounts else {}
+        if not isinstance(mapping, dict):
+            raise ValueError
+        mapping = {str(name): int(acc) for name, acc in mapping.items()}
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="accounts doit être un objet JSON {fichier: compte}")
+
+    parser = _get_parser_or_400(bank_type)
+    directory = tempfile.mkdtemp(prefix="finance-import-")
     try:
-        content = await file.read()
-
-        with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".csv") as temp_file:
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-
-        importer = BankCSVImporter(db, account_id)
-        stats = importer.import_csv(temp_file_path, "boursorama")
-
-        os.unlink(temp_file_path)
-
-        return stats
-
-    except Exception as e:
-        if "temp_file_path" in locals():
-            try:
-                os.unlink(temp_file_path)
-            except:
-                pass
-        raise HTTPException(status_code=500, detail=f"Erreur: {str(e)}")
-
-
-# --- Helpers ---
-
-def _enrich_transactions(txns) -> List[dict]:
-    """Ajoute les infos de catégorie aux transactions pour la réponse."""
-    results = []
-    for txn in txns:
-        d = {
-            "id": txn.id,
-            "account_id": txn.account_id,
-            "category_id": txn.category_id,
-            "transaction_type": txn.transaction_type,
-            "amount": txn.amount,
-            "description": txn.description,
-            "date": txn.date,
-            "merchant": txn.merchant,
-            "notes": txn.notes,
-            "category_parent_csv": txn.category_parent_csv,
-            "import_id": getattr(txn, "import_id", None),
-            "created_at": txn.created_at,
-            "category_name": txn.category.name if txn.category else None,
-            "parent_category": txn.category.parent_category if txn.category else None,
-            "sub_category": txn.category.sub_category if txn.category else None,
-        }
-        results.append(d)
-    return results
+        staged = stage_batch_uploads([(f.filename, f.file) for f in files], directory, parser.extensions)
+        assignments = [(name, mapping.get(name, account_id), path) for name, path in staged]
+        known = {acc.id for acc in get_accounts(db)}
+        unknown = sorted({acc for _, acc, _ in assignments} - known)
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Compte(s) introuvable(s) : {unknown}")
+    except ValueError as e:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+
+    job = jobs.submit_batch(assignments, directory, bank_type)
+    return job.to_response()
+
+
+@app.get("/imports", response_model=List[ImportJobResponse])
+def list_imports(jobs: ImportJobManager = Depends(get_import_jobs)):
+    """Liste les imports lancés depuis le démarrage du serveur"""
+    return [job.to_response() for job in jobs.list()]
+
+
+@app.get("/imports/{job_id}", response_model=ImportJobResponse)
+def get_import(job_id: str, jobs: ImportJobManager = Depends(get_import_jobs)):
+    """Progression d'un import : lignes traitées, doublons et erreurs à date"""
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import introuvable")
+    return job.to_response()
+
+
+# Mode FINANCE_DB_ASYNC : lectures servies par AsyncSession, à la place des routes sync
+if db_settings.async_mode:
+    use_async_reads(app)
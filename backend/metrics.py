@@ -0,0 +1,318 @@
+# backend/metrics.py
+"""Métriques de l'API au format texte Prometheus (GET /metrics).
+
+- MetricsMiddleware : latence par route (gabarit de chemin, pas l'URL brute),
+  nombre de requêtes SQL et temps SQL cumulé par requête HTTP ;
+- hooks SQLAlchemy (install_query_hooks) : durée de chaque requête SQL, y
+  compris hors requête HTTP (imports en arrière-plan) ;
+- PhaseTimer : chronomètres nommés de l'import (parse, dedup, categorize, insert).
+
+Profilage opt-in (FINANCE_PROFILE_SLOW_MS) : les endpoints sont exécutés sous
+cProfile, dans leur propre thread (InstrumentedRoute), et le profil est écrit
+dans FINANCE_PROFILE_DIR quand la requête dépasse le seuil. Lecture :
+``python -m pstats profiles/<fichier>.prof``.
+
+Les compteurs sont propres au processus, comme le cache de réponses.
+"""
+import contextvars
+import cProfile
+import functools
+import inspect
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .settings import MetricsSettings
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500, 1000)
+PHASE_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+INF_LABEL = 'le="+Inf"'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(labels[n] for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self.buckets = tuple(sorted(buckets))
+        # clé de labels -> [compteurs par bucket (non cumulés), somme, nombre]
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels[n] for n in self.labelnames)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def snapshot(self, **labels) -> Optional[tuple[float, int]]:
+        """(somme, nombre) pour une combinaison de labels, ou None"""
+        key = tuple(labels[n] for n in self.labelnames)
+        with self._lock:
+            entry = self._values.get(key)
+            return (entry[1], entry[2]) if entry else None
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, n in zip(self.buckets, counts):
+                    cumulative += n
+                    le = 'le="%s"' % format(bound, "g")
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, INF_LABEL)} {count}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total:g}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: list = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "finance_http_request_duration_seconds", "Latence des requêtes HTTP par route",
+    ("method", "route", "status"),
+))
+HTTP_REQUEST_QUERIES = REGISTRY.register(Histogram(
+    "finance_http_request_db_queries", "Nombre de requêtes SQL par requête HTTP",
+    ("method", "route"), QUERY_COUNT_BUCKETS,
+))
+HTTP_REQUEST_DB_SECONDS = REGISTRY.register(Histogram(
+    "finance_http_request_db_seconds", "Temps SQL cumulé par requête HTTP",
+    ("method", "route"),
+))
+DB_QUERY_SECONDS = REGISTRY.register(Histogram(
+    "finance_db_query_duration_seconds", "Durée de chaque requête SQL (tous appelants)",
+))
+IMPORT_PHASE_SECONDS = REGISTRY.register(Histogram(
+    "finance_import_phase_duration_seconds", "Durée des phases d'import CSV",
+    ("phase",), PHASE_BUCKETS,
+))
+SLOW_REQUEST_PROFILES = REGISTRY.register(Counter(
+    "finance_slow_request_profiles_total", "Profils cProfile écrits pour des requêtes lentes",
+    ("route",),
+))
+
+
+@dataclass
+class RequestStats:
+    """Compteurs de la requête HTTP en cours (partagés avec le thread de l'endpoint)"""
+    queries: int = 0
+    query_seconds: float = 0.0
+    profiler: Optional[cProfile.Profile] = None
+
+
+_current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "finance_request_stats", default=None
+)
+
+
+# --- SQL ---
+
+_hooks_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("finance_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["finance_query_start"].pop()
+    DB_QUERY_SECONDS.observe(elapsed)
+    stats = _current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += elapsed
+
+
+def _handle_error(context):
+    # Requête en échec : after_cursor_execute n'est pas appelé
+    starts = context.connection.info.get("finance_query_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def install_query_hooks() -> None:
+    """Chronomètre toutes les requêtes SQL de tous les moteurs (idempotent)"""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    _hooks_installed = True
+
+
+# --- Import ---
+
+class PhaseTimer:
+    """Chronomètres nommés cumulés (une phase peut être mesurée plusieurs fois)"""
+
+    def __init__(self):
+        self.totals: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[name] = self.totals.get(name, 0.0) + time.perf_counter() - start
+
+    def rounded(self) -> dict[str, float]:
+        return {name: round(seconds, 6) for name, seconds in self.totals.items()}
+
+    def publish(self) -> None:
+        """Enregistre les durées dans l'histogramme des phases d'import"""
+        for name, seconds in self.totals.items():
+            IMPORT_PHASE_SECONDS.observe(seconds, phase=name)
+
+
+# --- HTTP ---
+
+def _route_template(request: Request, response: Optional[Response]) -> str:
+    route = request.scope.get("route")
+    if route is not None:
+        return route.path
+    # Servie par le cache sans atteindre le routeur : chemins cacheables exacts, sans paramètre
+    if response is not None and response.headers.get("X-Cache") == "HIT":
+        return request.url.path
+    return "unmatched"
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """Latence et SQL par route ; écrit le profil des requêtes lentes si le profilage est actif"""
+
+    def __init__(self, app, settings: MetricsSettings):
+        super().__init__(app)
+        self.settings = settings
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        start = time.perf_counter()
+        response = None
+        try:
+            response = await call_next(request)
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_request.reset(token)
+            status = response.status_code if response is not None else 500
+            route = _route_template(request, response)
+            HTTP_REQUEST_SECONDS.observe(elapsed, method=request.method, route=route, status=str(status))
+            HTTP_REQUEST_QUERIES.observe(stats.queries, method=request.method, route=route)
+            HTTP_REQUEST_DB_SECONDS.observe(stats.query_seconds, method=request.method, route=route)
+            slow_ms = self.settings.profile_slow_ms
+            if stats.profiler is not None and slow_ms is not None and elapsed * 1000 >= slow_ms:
+                self._dump_profile(stats.profiler, request.method, route, elapsed)
+
+    def _dump_profile(self, profiler: cProfile.Profile, method: str, route: str, elapsed: float) -> None:
+        os.makedirs(self.settings.profile_dir, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = os.path.join(self.settings.profile_dir, f"{stamp}_{method}_{slug}_{elapsed * 1000:.0f}ms.prof")
+        profiler.dump_stats(path)
+        SLOW_REQUEST_PROFILES.inc(route=route)
+
+
+def _profiled(endpoint):
+    """Exécute l'endpoint sous cProfile, dans le thread qui l'exécute (threadpool pour les def)"""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            stats = _current_request.get()
+            if stats is None:
+                return await endpoint(*args, **kwargs)
+            stats.profiler = cProfile.Profile()
+            stats.profiler.enable()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                stats.profiler.disable()
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        stats = _current_request.get()
+        if stats is None:
+            return endpoint(*args, **kwargs)
+        stats.profiler = cProfile.Profile()
+        stats.profiler.enable()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            stats.profiler.disable()
+    return wrapper
+
+
+class InstrumentedRoute(APIRoute):
+    """Route dont l'endpoint est profilé (à n'utiliser que si le profilage est actif)"""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _profiled(endpoint), **kwargs)
@@ -0,0 +1,117 @@
+# backend/migrations.py
+"""Migrations de schéma versionnées.
+
+Chaque migration est idempotente (elle vérifie l'existant via l'inspecteur
+SQLAlchemy) et n'est exécutée qu'une fois : la version atteinte est stockée
+dans la table schema_version. Pour ajouter une migration, l'ajouter en fin
+de MIGRATIONS avec le numéro suivant.
+"""
+from typing import Callable
+
+from sqlalchemy import Column, Integer, MetaData, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateIndex
+
+from .models import MonthlyRollup, Transaction, TRANSACTIONS_FTS_DDL
+from .services.rollup import rebuild_rollup
+
+_version_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    _version_metadata,
+    Column("version", Integer, nullable=False),
+)
+
+
+def _add_category_parent_csv(conn: Connection) -> None:
+    """Ajoute transactions.category_parent_csv (bases créées avant la colonne)"""
+    columns = {col["name"] for col in inspect(conn).get_columns("transactions")}
+    if "category_parent_csv" not in columns:
+        conn.execute(text("ALTER TABLE transactions ADD COLUMN category_parent_csv VARCHAR"))
+
+
+def _create_transaction_indexes(conn: Connection) -> None:
+    """Crée les index composites / partiels déclarés sur Transaction"""
+    for index in Transaction.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+def _create_monthly_rollups(conn: Connection) -> None:
+    """Crée l'agrégat mensuel (rempli par la migration 5, une fois les montants en centimes)"""
+    MonthlyRollup.__table__.create(conn, checkfirst=True)
+
+
+def _create_transactions_fts(conn: Connection) -> None:
+    """Index plein texte FTS5 + triggers de synchronisation (SQLite uniquement), rempli depuis l'existant"""
+    if conn.dialect.name != "sqlite":
+        return
+    for statement in TRANSACTIONS_FTS_DDL:
+        conn.exec_driver_sql(statement)
+    conn.exec_driver_sql("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+
+
+def _signed_amount_cents(conn: Connection) -> None:
+    """transactions.amount (valeur absolue, flottant) -> amount_cents signé ; agrégat recréé en centimes"""
+    inspector = inspect(conn)
+    columns = {col["name"] for col in inspector.get_columns("transactions")}
+    if "amount_cents" not in columns:
+        conn.execute(text("ALTER TABLE transactions ADD COLUMN amount_cents BIGINT NOT NULL DEFAULT 0"))
+    if "amount" in columns:
+        conn.execute(text(
+            "UPDATE transactions SET amount_cents = CAST(ROUND(ABS(amount) * 100) AS BIGINT)"
+            " * CASE WHEN transaction_type = 'DEBIT' THEN -1 ELSE 1 END"
+        ))
+        conn.execute(text("ALTER TABLE transactions DROP COLUMN amount"))
+
+    rollup_columns = {col["name"] for col in inspector.get_columns("monthly_rollups")}
+    if "total_cents" not in rollup_columns:
+        MonthlyRollup.__table__.drop(conn)
+        MonthlyRollup.__table__.create(conn)
+    rebuild_rollup(conn)
+
+
+def _unique_monthly_rollup_key(conn: Connection) -> None:
+    """Index unique sur la clé de l'agrégat ; reconstruit d'abord (fusionne d'éventuels doublons)"""
+    rebuild_rollup(conn)
+    # IF NOT EXISTS : l'inspecteur ne voit pas les index sur expression (checkfirst inopérant)
+    for index in MonthlyRollup.__table__.indexes:
+        conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "transactions.category_parent_csv", _add_category_parent_csv),
+    (2, "index transactions (account_id, date), (date), non catégorisées", _create_transaction_indexes),
+    (3, "agrégat mensuel monthly_rollups", _create_monthly_rollups),
+    (4, "recherche plein texte transactions_fts", _create_transactions_fts),
+    (5, "montants signés en centimes (transactions.amount_cents)", _signed_amount_cents),
+    (6, "clé unique de l'agrégat mensuel (upsert)", _unique_monthly_rollup_key),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: Connection) -> int:
+    """Version du schéma en base (0 si jamais migrée)"""
+    if not inspect(conn).has_table("schema_version"):
+        return 0
+    return conn.execute(select(schema_version.c.version)).scalar() or 0
+
+
+def run_migrations(engine: Engine) -> list[int]:
+    """Applique les migrations manquantes, chacune dans sa transaction. Retourne les versions appliquées."""
+    applied = []
+    with engine.begin() as conn:
+        _version_metadata.create_all(conn)
+        if conn.execute(select(schema_version.c.version)).first() is None:
+            conn.execute(schema_version.insert().values(version=0))
+
+    for version, description, migrate in MIGRATIONS:
+        with engine.begin() as conn:
+            if get_schema_version(conn) >= version:
+                continue
+            migrate(conn)
+            conn.execute(schema_version.update().values(version=version))
+            print(f"  ✓ Migration {version} : {description}")
+        applied.append(version)
+    return applied
@@ -1,6 +1,7 @@
 # models.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Enum
+from sqlalchemy import BigInteger, Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Enum, Index, DDL, event, func
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -11,6 +12,12 @@ class TransactionType(str, enum.Enum):
     DEBIT = "debit"
     CREDIT = "credit"
 
+
+def to_cents(amount: float) -> int:
+    """Montant en euros -> centimes entiers (arrondi au plus proche)"""
+    return int(round(amount * 100))
+
+
 class Account(Base):
     __tablename__ = "accounts"
     
@@ -42,7 +49,8 @@ class Transaction(Base):
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
     
     transaction_type = Column(Enum(TransactionType), nullable=False)
-    amount = Column(Float, nullable=False)
+    # Montant signé en centimes (crédit > 0, débit < 0) : sommes exactes, sans flottants
+    amount_cents = Column(BigInteger, nullable=False)
     description = Column(String)
     date = Column(DateTime, nullable=False)
     
@@ -60,6 +68,71 @@ class Transaction(Base):
     account = relationship("Account", back_populates="transactions")
     category = relationship("Category", back_populates="transactions")
 
+    def __init__(self, amount: float | None = None, **kwargs):
+        # amount (valeur absolue en euros) après transaction_type, qui porte le signe
+        super().__init__(**kwargs)
+        if amount is not None:
+            self.amount = amount
+
+    @hybrid_property
+    def amount(self) -> float:
+        """Montant absolu en euros (API : le signe est porté par transaction_type)"""
+        return abs(self.amount_cents) / 100
+
+    @amount.inplace.setter
+    def _amount_setter(self, value: float) -> None:
+        sign = -1 if TransactionType(self.transaction_type) == TransactionType.DEBIT else 1
+        self.amount_cents = sign * to_cents(abs(value))
+
+    @amount.inplace.expression
+    @classmethod
+    def _amount_expression(cls):
+        return (func.abs(cls.amount_cents) / 100.0).label("amount")
+
+    __table_args__ = (
+        # Listes par compte et plages de dates (range, dédoublonnage à l'import)
+        Index("ix_transactions_account_date", "account_id", "date"),
+        Index("ix_transactions_date", "date"),
+        # Index partiel : seules les lignes sans catégorie (/rules/apply)
+        Index(
+            "ix_transactions_uncategorized",
+            "id",
+            sqlite_where=category_id.is_(None),
+            postgresql_where=category_id.is_(None),
+        ),
+    )
+
+
+# Index plein texte (SQLite FTS5) sur description / merchant / notes.
+# Table externe (content=transactions) : l'index ne stocke pas le texte, les
+# triggers le tiennent à jour à chaque écriture, import compris.
+TRANSACTIONS_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5("
+    "description, merchant, notes, content='transactions', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN "
+    "INSERT INTO transactions_fts(rowid, description, merchant, notes) "
+    "VALUES (new.id, new.description, new.merchant, new.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description, merchant, notes) "
+    "VALUES ('delete', old.id, old.description, old.merchant, old.notes); END",
+    # Seules les colonnes indexées déclenchent la mise à jour (pas les re-catégorisations)
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF description, merchant, notes "
+    "ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description, merchant, notes) "
+    "VALUES ('delete', old.id, old.description, old.merchant, old.notes); "
+    "INSERT INTO transactions_fts(rowid, description, merchant, notes) "
+    "VALUES (new.id, new.description, new.merchant, new.notes); END",
+]
+
+for _statement in TRANSACTIONS_FTS_DDL:
+    event.listen(Transaction.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+event.listen(
+    Transaction.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS transactions_fts").execute_if(dialect="sqlite"),
+)
+
 
 class CategorizationRule(Base):
     __tablename__ = "categorization_rules"
@@ -71,4 +144,30 @@ class CategorizationRule(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    category = relationship("Category")
\ No newline at end of file
+    category = relationship("Category")
+
+
+class MonthlyRollup(Base):
+    """Agrégat mensuel maintenu incrémentalement (cashflow, budget multi-mois)"""
+    __tablename__ = "monthly_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
+    month = Column(String(7), nullable=False)  # "YYYY-MM"
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    transaction_type = Column(Enum(TransactionType), nullable=False)
+    # Somme des montants absolus, en centimes
+    total_cents = Column(BigInteger, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_monthly_rollups_account_month", "account_id", "month"),
+        Index("ix_monthly_rollups_month", "month"),
+        # Une ligne par clé ; COALESCE car une contrainte UNIQUE laisse passer
+        # plusieurs NULL (transactions non catégorisées). Cible de l'upsert.
+        Index(
+            "ux_monthly_rollups_key",
+            "account_id", "month", func.coalesce(category_id, 0), "transaction_type",
+            unique=True,
+        ),
+    )
@@ -1,6 +1,6 @@
 # backend/schemas.py
-from pydantic import BaseModel, Field
-from datetime import datetime
+from pydantic import BaseModel, Field, model_validator
+from datetime import date, datetime
 from typing import Optional
 from .models import TransactionType
 
@@ -23,6 +23,8 @@ class TransactionCreate(TransactionBase):
 
 class TransactionResponse(TransactionBase):
     id: int
+    # Montant signé en centimes (crédit > 0, débit < 0), exact
+    amount_cents: int
     created_at: datetime
     category_name: Optional[str] = None
     parent_category: Optional[str] = None
@@ -32,6 +34,11 @@ class TransactionResponse(TransactionBase):
         from_attributes = True
 
 
+class TransactionPage(BaseModel):
+    items: list[TransactionResponse]
+    next_cursor: Optional[str] = None
+
+
 class TransactionUpdate(BaseModel):
     category_id: int
 
@@ -81,9 +88,164 @@ class CategorizationRuleResponse(BaseModel):
         from_attributes = True
 
 
+class CategoryAssignment(BaseModel):
+    id: int
+    category_id: int
+
+
+class TransactionFilter(BaseModel):
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    account_id: Optional[int] = None
+    uncategorized_only: bool = False
+    description_contains: Optional[str] = None
+    merchant_contains: Optional[str] = None
+
+    def has_criteria(self) -> bool:
+        """Au moins un critère restreint les transactions visées"""
+        return bool(
+            self.start_date or self.end_date or self.account_id is not None
+            or self.uncategorized_only or self.description_contains or self.merchant_contains
+        )
+
+
+class BulkCategoryUpdate(BaseModel):
+    """Re-catégorisation en lot : soit une liste {id, category_id},
+    soit un filtre et une catégorie cible (exclusifs)"""
+    items: Optional[list[CategoryAssignment]] = None
+    filter: Optional[TransactionFilter] = None
+    category_id: Optional[int] = None
+    create_rule: Optional[CategorizationRuleCreate] = None
+
+    @model_validator(mode="after")
+    def check_mode(self):
+        if (self.items is None) == (self.filter is None):
+            raise ValueError("Fournir soit 'items', soit 'filter'")
+        if self.filter is not None and self.category_id is None:
+            raise ValueError("'category_id' est requis avec 'filter'")
+        if self.filter is not None and not self.filter.has_criteria():
+            # Un filtre vide re-catégoriserait toute la base
+            raise ValueError("'filter' doit contenir au moins un critère")
+        if self.items is not None and self.category_id is not None:
+            raise ValueError("'category_id' ne s'utilise qu'avec 'filter'")
+        return self
+
+
+class BulkCategoryUpdateResult(BaseModel):
+    updated: int
+    not_found: list[int] = []
+    rule: Optional[CategorizationRuleResponse] = None
+
+
+class RulesApplyRequest(BaseModel):
+    dry_run: bool = False
+    # Règles à prévisualiser sans les enregistrer (dry_run uniquement)
+    candidate_rules: list[CategorizationRuleCreate] = []
+
+    @model_validator(mode="after")
+    def check_candidates(self):
+        if self.candidate_rules and not self.dry_run:
+            raise ValueError("'candidate_rules' exige dry_run=true")
+        return self
+
+
+class RuleMatchStats(BaseModel):
+    rule_id: Optional[int] = None  # None pour une règle candidate
+    keyword: str
+    category_id: int
+    match_field: str
+    matches: int
+    sample_ids: list[int]
+
+
+class RulesApplyResult(BaseModel):
+    dry_run: bool
+    scanned: int
+    matched: int
+    updated: int
+    batches: int
+    rules: list[RuleMatchStats]
+
+
+class RulePreview(BaseModel):
+    matches: int
+    sample: list[TransactionResponse]
+
+
+class BudgetSubCategory(BaseModel):
+    total: float
+    count: int
+
+
+class BudgetParentCategory(BaseModel):
+    total: float
+    count: int
+    subs: dict[str, BudgetSubCategory]
+
+
+class BudgetSummary(BaseModel):
+    income: float
+    expenses: float
+    income_count: int
+    expense_count: int
+    income_tree: dict[str, BudgetParentCategory]
+    expense_tree: dict[str, BudgetParentCategory]
+
+
+class CashflowMonth(BaseModel):
+    month: str
+    income: float
+    expenses: float
+    expenses_by_parent: dict[str, float]
+
+
+class AmountTotals(BaseModel):
+    """Totaux exacts en centimes (débits comptés positivement)"""
+    income_cents: int
+    expense_cents: int
+    net_cents: int
+    count: int
+
+
+class GroupTotals(AmountTotals):
+    category_id: Optional[int] = None
+    month: Optional[str] = None
+
+
+class AccountTotals(BaseModel):
+    account_id: int
+    totals: AmountTotals
+    groups: list[GroupTotals] = []
+
+
 class ImportStats(BaseModel):
     total_rows: int
     imported: int
     duplicates: int
     errors: int
     error_details: list[str] = []
+    # Durée cumulée (s) par phase : parse, dedup, categorize, insert
+    timings: dict[str, float] = {}
+
+
+class FileImportResult(BaseModel):
+    """Résultat d'un fichier d'un import par lot"""
+    filename: str
+    account_id: int
+    status: str  # "pending", "running", "done", "failed"
+    stats: Optional[ImportStats] = None
+    error: Optional[str] = None
+
+
+class ImportJobResponse(BaseModel):
+    id: str
+    status: str  # "pending", "running", "done", "failed"
+    filename: str
+    # None pour un import par lot sur plusieurs comptes
+    account_id: Optional[int] = None
+    stats: ImportStats
+    # Import par lot : un résultat par fichier, stats = cumul
+    files: list[FileImportResult] = []
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,105 @@
+# backend/services/bulk_insert.py
+"""Insertion en masse des transactions importées, selon le dialecte.
+
+    sqlite       INSERT multi-lignes par lots (executemany)
+    postgresql   COPY dans une table temporaire, puis
+                 INSERT ... SELECT ... ON CONFLICT (import_id) DO NOTHING RETURNING
+
+Sous Postgres, le dédoublonnage final est fait par la base : une ligne déjà
+présente (import concurrent, par exemple) est ignorée au lieu de faire
+échouer tout le lot. insert_transactions renvoie les lignes réellement
+insérées, pour l'agrégat mensuel et les statistiques d'import.
+
+Drivers Postgres : psycopg (3) ou psycopg2, détectés sur la connexion.
+"""
+import enum
+import io
+from datetime import datetime
+from typing import Iterable, Sequence
+
+from sqlalchemy import Column, MetaData, Table, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from ..models import Transaction
+
+# Colonnes chargées par COPY (created_at : défaut Python, non appliqué par COPY)
+COPY_COLUMNS = (
+    "account_id", "transaction_type", "amount_cents", "description", "date",
+    "merchant", "category_id", "category_parent_csv", "import_id", "created_at",
+)
+
+# Colonnes renvoyées pour les deltas de l'agrégat mensuel
+_RETURNED_COLUMNS = ("account_id", "date", "transaction_type", "amount_cents", "category_id")
+
+_staging_metadata = MetaData()
+
+transactions_staging = Table(
+    "transactions_staging",
+    _staging_metadata,
+    *(Column(name, Transaction.__table__.c[name].type) for name in COPY_COLUMNS),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value) -> str:
+    """Valeur au format texte de COPY (\\N = NULL, séparateurs échappés)"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, enum.Enum):
+        return value.name  # nom stocké par la colonne Enum de SQLAlchemy
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def copy_text(rows: Iterable[dict], columns: Sequence[str] = COPY_COLUMNS) -> str:
+    """Lignes au format texte de COPY (tabulations, une ligne par transaction)"""
+    return "".join(
+        "\t".join(_copy_value(row.get(col)) for col in columns) + "\n"
+        for row in rows
+    )
+
+
+def insert_transactions(db: Session, payload: list[dict], chunk_size: int) -> list[dict]:
+    """Insère les lignes (sans commit) ; renvoie celles réellement insérées.
+    chunk_size : lignes par INSERT multi-valeurs hors Postgres"""
+    if not payload:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        return _copy_insert(db, payload)
+    for start in range(0, len(payload), chunk_size):
+        db.execute(insert(Transaction), payload[start:start + chunk_size])
+    return payload
+
+
+def _copy_insert(db: Session, payload: list[dict]) -> list[dict]:
+    conn = db.connection()
+    transactions_staging.create(conn, checkfirst=True)
+    # Table temporaire détruite au commit ; vidée si plusieurs lots partagent la transaction
+    conn.execute(transactions_staging.delete())
+
+    created_at = datetime.utcnow()
+    data = copy_text({**row, "created_at": row.get("created_at", created_at)} for row in payload)
+    sql = f"COPY {transactions_staging.name} ({', '.join(COPY_COLUMNS)}) FROM STDIN"
+    cursor = conn.connection.driver_connection.cursor()
+    try:
+        if hasattr(cursor, "copy"):  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(data)
+        else:  # psycopg2
+            cursor.copy_expert(sql, io.StringIO(data))
+    finally:
+        cursor.close()
+
+    staged = select(*(transactions_staging.c[name] for name in COPY_COLUMNS))
+    merge = (
+        pg_insert(Transaction)
+        .from_select(list(COPY_COLUMNS), staged)
+        .on_conflict_do_nothing(index_elements=["import_id"])
+        .returning(*(Transaction.__table__.c[name] for name in _RETURNED_COLUMNS))
+    )
+    return [dict(row) for row in conn.execute(merge).mappings()]
@@ -0,0 +1,135 @@
+# backend/services/categorization.py
+import re
+from typing import Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models import CategorizationRule, Category
+
+
+class RuleMatcher:
+    """Moteur de règles compilé une fois, partagé par l'import et /rules/apply.
+
+    Les mots-clés de chaque match_field sont regroupés dans une seule regex
+    (alternatives dans l'ordre des règles, en lookahead pour trouver les
+    occurrences qui se chevauchent). La règle retenue est celle de plus petit
+    rang parmi toutes les occurrences : même sémantique « première règle qui
+    matche » que l'ancien parcours linéaire.
+    """
+
+    def __init__(self, rules: Iterable[CategorizationRule]):
+        self.rules: list[CategorizationRule] = list(rules)
+        self._categories: list[int] = []
+        merchant_keywords: dict[str, int] = {}
+        description_keywords: dict[str, int] = {}
+
+        for rank, rule in enumerate(self.rules):
+            self._categories.append(rule.category_id)
+            target = merchant_keywords if rule.match_field == "merchant" else description_keywords
+            # Un mot-clé en double garde le rang de sa première règle
+            target.setdefault(rule.keyword.lower(), rank)
+
+        self._merchant = self._compile(merchant_keywords)
+        self._description = self._compile(description_keywords)
+
+    @classmethod
+    def from_db(cls, db: Session, extra_rules: Iterable = ()) -> "RuleMatcher":
+        """Compile les règles actives de la base, dans l'ordre de création.
+
+        extra_rules (règles candidates non enregistrées) passent après,
+        comme si elles venaient d'être créées.
+        """
+        rules = (
+            db.query(CategorizationRule)
+            .filter(CategorizationRule.is_active == True)
+            .order_by(CategorizationRule.id)
+            .all()
+        )
+        return cls([*rules, *extra_rules])
+
+    @staticmethod
+    def _compile(keywords: dict[str, int]) -> Optional[tuple[re.Pattern, dict[str, int]]]:
+        if not keywords:
+            return None
+        ordered = sorted(keywords, key=keywords.get)
+        pattern = re.compile("(?=(" + "|".join(re.escape(k) for k in ordered) + "))")
+        return pattern, keywords
+
+    @staticmethod
+    def _best_rank(compiled, text: str) -> Optional[int]:
+        if compiled is None:
+            return None
+        pattern, ranks = compiled
+        best = None
+        for m in pattern.finditer(text):
+            rank = ranks[m.group(1)]
+            if best is None or rank < best:
+                best = rank
+                if best == 0:
+                    break
+        return best
+
+    def __len__(self) -> int:
+        return len(self._categories)
+
+    def match_rank(self, description: Optional[str], merchant: Optional[str]) -> Optional[int]:
+        """Rang de la première règle qui matche, ou None"""
+        description_value = description.lower() if description else ""
+        # Une règle "merchant" retombe sur la description quand le marchand est vide
+        merchant_value = merchant.lower() if merchant else description_value
+
+        ranks = [
+            r for r in (
+                self._best_rank(self._merchant, merchant_value),
+                self._best_rank(self._description, description_value),
+            )
+            if r is not None
+        ]
+        return min(ranks) if ranks else None
+
+    def match(self, description: Optional[str], merchant: Optional[str]) -> Optional[int]:
+        """category_id de la première règle qui matche, ou None"""
+        rank = self.match_rank(description, merchant)
+        return self._categories[rank] if rank is not None else None
+
+
+class CategoryIndex:
+    """Index en mémoire des noms de catégories (remplace les scans de find_category_by_keyword).
+
+    Reproduit la recherche historique : première catégorie (ordre de la table)
+    dont le nom en minuscules contient le mot-clé. Les résultats sont mémorisés
+    par mot-clé, ce qui rend la résolution des mappings quasi gratuite.
+    """
+
+    def __init__(self, categories: Iterable[Category]):
+        self._names: list[tuple[str, int]] = [(cat.name.lower(), cat.id) for cat in categories]
+        self._by_name: dict[str, int] = {}
+        for name, cat_id in self._names:
+            self._by_name.setdefault(name, cat_id)
+        self._lookups: dict[str, Optional[int]] = {}
+
+    @classmethod
+    def from_db(cls, db: Session) -> "CategoryIndex":
+        return cls(db.query(Category).order_by(Category.id).all())
+
+    def get_id(self, name: str) -> Optional[int]:
+        """id de la catégorie portant exactement ce nom (insensible à la casse)"""
+        return self._by_name.get(name.lower())
+
+    def find_id(self, keyword: str) -> Optional[int]:
+        """id de la première catégorie dont le nom contient le mot-clé"""
+        keyword = keyword.lower()
+        if keyword not in self._lookups:
+            self._lookups[keyword] = next(
+                (cat_id for name, cat_id in self._names if keyword in name), None
+            )
+        return self._lookups[keyword]
+
+    def resolve(self, mapping: dict[str, str]) -> dict[str, int]:
+        """Résout {clé: nom de catégorie} en {clé: category_id}, sans les cibles absentes"""
+        resolved = {}
+        for key, cat_name in mapping.items():
+            cat_id = self.find_id(cat_name)
+            if cat_id is not None:
+                resolved[key] = cat_id
+        return resolved
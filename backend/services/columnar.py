@@ -0,0 +1,142 @@
+# backend/services/columnar.py
+"""Historique d'un compte en tableaux NumPy typés, pour les agrégats en lecture.
+
+Chargé en une requête (sans objets ORM), trié par date :
+
+    days          int32   jours depuis le 1970-01-01
+    cents         int64   montant signé en centimes (crédit > 0, débit < 0)
+    category_ids  int32   NO_CATEGORY (-1) si non catégorisée
+
+Une plage de dates se résout par recherche dichotomique (tableau trié), les
+sommes et regroupements par opérations vectorisées, en entiers exacts.
+
+ColumnarStore garde un historique par compte en mémoire, rechargé quand la
+version des données ("transactions", voir cache.DataVersions) a changé ou
+que le TTL a expiré. Mémoire : ~16 octets par transaction. Propre au
+processus, comme le cache de réponses : avec plusieurs workers, une écriture
+faite par un autre worker n'est vue qu'à l'expiration du TTL.
+NumPy n'est importé qu'au premier chargement d'un historique.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models import Transaction
+
+if TYPE_CHECKING:
+    import numpy as np
+
+NO_CATEGORY = -1
+EPOCH = date(1970, 1, 1)
+
+
+def _to_day(value: date) -> int:
+    return value.toordinal() - EPOCH.toordinal()
+
+
+def _group_sums(keys: np.ndarray, cents: np.ndarray) -> list[tuple[int, int, int, int]]:
+    """(clé, crédits, débits, nombre) par valeur de clé, en centimes (débits positifs)"""
+    import numpy as np
+    if len(keys) == 0:
+        return []
+    order = np.argsort(keys, kind="stable")
+    keys, cents = keys[order], cents[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    income = np.add.reduceat(np.where(cents > 0, cents, 0), starts)
+    expenses = np.add.reduceat(np.where(cents < 0, -cents, 0), starts)
+    counts = np.diff(np.r_[starts, len(keys)])
+    return list(zip(keys[starts].tolist(), income.tolist(), expenses.tolist(), counts.tolist()))
+
+
+@dataclass
+class ColumnarHistory:
+    account_id: int
+    days: np.ndarray
+    cents: np.ndarray
+    category_ids: np.ndarray
+
+    @classmethod
+    def load(cls, db: Session, account_id: int) -> ColumnarHistory:
+        import numpy as np
+        rows = db.execute(
+            select(Transaction.date, Transaction.amount_cents, Transaction.category_id)
+            .where(Transaction.account_id == account_id)
+            .order_by(Transaction.date, Transaction.id)
+        ).all()
+        n = len(rows)
+        days = (np.array([r[0] for r in rows], dtype="datetime64[D]") - np.datetime64(EPOCH, "D")).astype(np.int32)
+        cents = np.fromiter((r[1] for r in rows), dtype=np.int64, count=n)
+        category_ids = np.fromiter(
+            (NO_CATEGORY if r[2] is None else r[2] for r in rows), dtype=np.int32, count=n
+        )
+        return cls(account_id, days, cents, category_ids)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def _range(self, start: Optional[date], end: Optional[date]) -> slice:
+        """Tranche des transactions entre start et end inclus (dates du tableau trié)"""
+        lo = 0 if start is None else int(self.days.searchsorted(_to_day(start), side="left"))
+        hi = len(self.days) if end is None else int(self.days.searchsorted(_to_day(end), side="right"))
+        return slice(lo, hi)
+
+    def totals(self, start: Optional[date] = None, end: Optional[date] = None) -> dict:
+        """Crédits, débits (positifs), solde et nombre, en centimes"""
+        cents = self.cents[self._range(start, end)]
+        income = int(cents[cents > 0].sum())
+        expenses = int(-cents[cents < 0].sum())
+        return {"income_cents": income, "expense_cents": expenses, "net_cents": income - expenses, "count": len(cents)}
+
+    def by_category(self, start: Optional[date] = None, end: Optional[date] = None) -> list[dict]:
+        sl = self._range(start, end)
+        return [
+            {
+                "category_id": None if key == NO_CATEGORY else key,
+                "income_cents": income, "expense_cents": expenses, "net_cents": income - expenses, "count": count,
+            }
+            for key, income, expenses, count in _group_sums(self.category_ids[sl], self.cents[sl])
+        ]
+
+    def by_month(self, start: Optional[date] = None, end: Optional[date] = None) -> list[dict]:
+        import numpy as np
+        sl = self._range(start, end)
+        months = (self.days[sl].astype("datetime64[D]")).astype("datetime64[M]").astype(np.int64)
+        return [
+            {
+                "month": str(np.datetime64(key, "M")),
+                "income_cents": income, "expense_cents": expenses, "net_cents": income - expenses, "count": count,
+            }
+            for key, income, expenses, count in _group_sums(months, self.cents[sl])
+        ]
+
+
+class ColumnarStore:
+    """Historiques par compte, rechargés quand la version des transactions change
+    ou après ttl secondes (0 = rechargé à chaque lecture)"""
+
+    def __init__(self, ttl: float = 60):
+        self.ttl = ttl
+        self._histories: dict[int, tuple[tuple, float, ColumnarHistory]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, account_id: int, version: tuple) -> ColumnarHistory:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._histories.get(account_id)
+        if cached is not None and cached[0] == version and now < cached[1]:
+            return cached[2]
+        history = ColumnarHistory.load(db, account_id)
+        with self._lock:
+            self._histories[account_id] = (version, now + self.ttl, history)
+        return history
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histories.clear()
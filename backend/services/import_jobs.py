@@ -0,0 +1,308 @@
+# backend/services/import_jobs.py
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+import zipfile
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import IO, TYPE_CHECKING, Callable, Iterator, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from ..schemas import FileImportResult, ImportJobResponse, ImportStats
+
+if TYPE_CHECKING:
+    # import_service (pandas, NumPy) n'est chargé qu'au premier import lancé
+    from .import_service import ParsedCSV
+
+# Au-delà, la copie de l'upload est écrite sur disque plutôt qu'en mémoire
+UPLOAD_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+def stage_batch_uploads(
+    uploads: list[tuple[str, IO[bytes]]],
+    directory: str,
+    extensions: tuple[str, ...] = (".csv",),
+) -> list[tuple[str, str]]:
+    """Copie les fichiers uploadés dans directory et déplie les archives zip.
+
+    Retourne (nom du fichier, chemin local) pour chaque fichier d'extension
+    acceptée, dans l'ordre. Seuls ces fichiers sont extraits d'une archive,
+    sous leur nom de base (pas de chemin venant de l'archive). ValueError si
+    un fichier n'a ni une extension acceptée ni .zip, ou si le lot est vide.
+    """
+
+    def _accepted(name: str) -> bool:
+        return name.lower().endswith(extensions)
+
+    staged: list[tuple[str, str]] = []
+
+    def _target(name: str) -> str:
+        # Préfixe numérique : deux fichiers de même nom ne s'écrasent pas
+        return os.path.join(directory, f"{len(staged):04d}_{name}")
+
+    for filename, source in uploads:
+        name = os.path.basename(filename or "")
+        if _accepted(name):
+            path = _target(name)
+            with open(path, "wb") as out:
+                shutil.copyfileobj(source, out)
+            staged.append((name, path))
+        elif name.lower().endswith(".zip"):
+            try:
+                with zipfile.ZipFile(source) as archive:
+                    for member in archive.infolist():
+                        member_name = os.path.basename(member.filename)
+                        if member.is_dir() or member.filename.startswith("__MACOSX/") or not _accepted(member_name):
+                            continue
+                        path = _target(member_name)
+                        with archive.open(member) as src, open(path, "wb") as out:
+                            shutil.copyfileobj(src, out)
+                        staged.append((member_name, path))
+            except zipfile.BadZipFile:
+                raise ValueError(f"Archive zip invalide : {name}")
+        else:
+            raise ValueError(f"Le fichier doit être un {', '.join(extensions)} ou un zip : {name}")
+
+    if not staged:
+        raise ValueError(f"Aucun fichier {', '.join(extensions)} dans le lot")
+    return staged
+
+
+def _add_stats(total: ImportStats, filename: str, stats: ImportStats) -> None:
+    """Cumule les stats d'un fichier dans celles du lot"""
+    total.total_rows += stats.total_rows
+    total.imported += stats.imported
+    total.duplicates += stats.duplicates
+    total.errors += stats.errors
+    total.error_details.extend(f"{filename} : {detail}" for detail in stats.error_details)
+    for phase, seconds in stats.timings.items():
+        total.timings[phase] = round(total.timings.get(phase, 0.0) + seconds, 6)
+
+
+class ImportJob:
+    """État d'un import exécuté en arrière-plan"""
+
+    def __init__(self, filename: str, account_id: Optional[int], bank_type: str):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.account_id = account_id
+        self.bank_type = bank_type
+        self.status = "pending"
+        self.stats = ImportStats(total_rows=0, imported=0, duplicates=0, errors=0, error_details=[])
+        self.error: Optional[str] = None
+        # Import par lot : un résultat par fichier
+        self.files: list[FileImportResult] = []
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+
+    def to_response(self) -> ImportJobResponse:
+        return ImportJobResponse(
+            id=self.id,
+            status=self.status,
+            filename=self.filename,
+            account_id=self.account_id,
+            stats=self.stats,
+            files=[f.model_copy() for f in self.files],
+            error=self.error,
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+        )
+
+
+class ImportJobManager:
+    """Exécute les imports CSV sur un thread dédié et expose leur progression.
+
+    Un seul worker par défaut : SQLite n'accepte qu'un écrivain à la fois,
+    les imports sont donc mis en file plutôt qu'exécutés en parallèle.
+
+    Imports par lot (submit_batch) : le parsing des fichiers, coûteux en CPU,
+    est réparti sur un pool de processus (parse_workers, None = un par CPU,
+    0 = pas de pool) ; les écritures restent sérialisées sur le thread d'import.
+
+    Les jobs terminés sont oubliés après job_retention secondes, et au-delà
+    des max_finished_jobs plus récents : le registre reste borné.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_workers: int = 1,
+        on_commit: Optional[Callable[[], None]] = None,
+        parse_workers: Optional[int] = None,
+        job_retention: float = 3600,
+        max_finished_jobs: int = 100,
+    ):
+        self.session_factory = session_factory
+        self.on_commit = on_commit
+        self.job_retention = timedelta(seconds=job_retention)
+        self.max_finished_jobs = max_finished_jobs
+        self.parse_workers = (os.cpu_count() or 1) if parse_workers is None else parse_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="import")
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._jobs: dict[str, ImportJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, source: IO[bytes], filename: str, account_id: int, bank_type: str = "boursorama") -> ImportJob:
+        """Copie le flux uploadé (fermé à la fin de la requête) et lance l'import"""
+        spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_SIZE)
+        shutil.copyfileobj(source, spool)
+        spool.seek(0)
+
+        job = ImportJob(filename, account_id, bank_type)
+        self._register(job)
+        self._executor.submit(self._run, job, spool)
+        return job
+
+    def submit_batch(
+        self,
+        files: list[tuple[str, int, str]],
+        directory: str,
+        bank_type: str = "boursorama",
+    ) -> ImportJob:
+        """Lance l'import d'un lot de fichiers (nom, compte, chemin local).
+
+        directory (qui contient les fichiers) appartient désormais au job et
+        est supprimé à la fin de l'import.
+        """
+        accounts = {account_id for _, account_id, _ in files}
+        job = ImportJob(
+            f"{len(files)} fichiers" if len(files) > 1 else files[0][0],
+            accounts.pop() if len(accounts) == 1 else None,
+            bank_type,
+        )
+        job.files = [
+            FileImportResult(filename=name, account_id=account_id, status="pending")
+            for name, account_id, _ in files
+        ]
+        self._register(job)
+        self._executor.submit(self._run_batch, job, [path for _, _, path in files], directory)
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        with self._lock:
+            self._evict_finished()
+            return self._jobs.get(job_id)
+
+    def list(self) -> list[ImportJob]:
+        with self._lock:
+            self._evict_finished()
+            return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def _register(self, job: ImportJob) -> None:
+        with self._lock:
+            self._evict_finished()
+            self._jobs[job.id] = job
+
+    def _evict_finished(self) -> None:
+        """Retire les jobs terminés expirés ou en surnombre (appelé sous self._lock)"""
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished_at is not None),
+            key=lambda j: j.finished_at,
+            reverse=True,
+        )
+        expired_before = datetime.utcnow() - self.job_retention
+        for rank, job in enumerate(finished):
+            if rank >= self.max_finished_jobs or job.finished_at < expired_before:
+                del self._jobs[job.id]
+
+    def _update_progress(self, job: ImportJob, stats: ImportStats) -> None:
+        snapshot = stats.model_copy(deep=True)
+        with self._lock:
+            job.stats = snapshot
+        if self.on_commit is not None:
+            self.on_commit()
+
+    def _run(self, job: ImportJob, spool: IO[bytes]) -> None:
+        db = self.session_factory()
+        job.status = "running"
+        try:
+            from .import_service import BankCSVImporter
+            importer = BankCSVImporter(db, job.account_id)
+            stats = importer.import_stream(
+                spool,
+                job.bank_type,
+                on_chunk=lambda s: self._update_progress(job, s),
+            )
+            self._update_progress(job, stats)
+            job.status = "done"
+        except Exception as e:
+            db.rollback()
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = datetime.utcnow()
+            spool.close()
+            db.close()
+
+    def _get_parse_pool(self) -> Optional[Executor]:
+        if self.parse_workers <= 0:
+            return None
+        if self._parse_pool is None:
+            # spawn : pas de fork d'un processus qui détient des threads et des connexions
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._parse_pool
+
+    def _parse_all(self, job: ImportJob, paths: Sequence[str]) -> Iterator[tuple[int, Callable[[], "ParsedCSV"]]]:
+        """(index du fichier, accès au résultat du parsing) au fil de leur disponibilité"""
+        from .import_service import parse_for_import
+        pool = self._get_parse_pool()
+        if pool is None:
+            for index, path in enumerate(paths):
+                yield index, lambda path=path, index=index: parse_for_import(
+                    path, job.files[index].account_id, job.bank_type
+                )
+            return
+        futures: dict[Future, int] = {
+            pool.submit(parse_for_import, path, job.files[index].account_id, job.bank_type): index
+            for index, path in enumerate(paths)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result
+
+    def _set_file(self, job: ImportJob, index: int, **changes) -> None:
+        with self._lock:
+            job.files[index] = job.files[index].model_copy(update=changes)
+
+    def _run_batch(self, job: ImportJob, paths: Sequence[str], directory: str) -> None:
+        from .import_service import BankCSVImporter
+        db = self.session_factory()
+        job.status = "running"
+        try:
+            for index, get_parsed in self._parse_all(job, paths):
+                entry = job.files[index]
+                self._set_file(job, index, status="running")
+                try:
+                    stats = BankCSVImporter(db, entry.account_id).import_parsed(get_parsed())
+                except Exception as e:
+                    # Un fichier en échec n'interrompt pas le lot
+                    db.rollback()
+                    self._set_file(job, index, status="failed", error=str(e))
+                    continue
+                total = job.stats.model_copy(deep=True)
+                _add_stats(total, entry.filename, stats)
+                self._set_file(job, index, status="done", stats=stats)
+                self._update_progress(job, total)
+            failed = sum(1 for f in job.files if f.status == "failed")
+            if failed:
+                job.error = f"{failed} fichier(s) en échec sur {len(job.files)}"
+            job.status = "failed" if failed == len(job.files) else "done"
+        except Exception as e:
+            db.rollback()
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = datetime.utcnow()
+            shutil.rmtree(directory, ignore_errors=True)
+            db.close()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=wait, cancel_futures=not wait)
@@ -1,17 +1,77 @@
 # backend/services/import_service.py
+import numpy as np
 import pandas as pd
+from dataclasses import dataclass, field
 from sqlalchemy.orm import Session
 from datetime import datetime
+from typing import IO, Callable
 import hashlib
 
 from ..crud import (
     create_transaction,
-    transaction_exists,
-    find_category_by_keyword,
-    get_categorization_rules,
+    get_import_ids_in_range,
 )
+from .categorization import CategoryIndex, RuleMatcher
+from .bulk_insert import insert_transactions
+from .parsers import get_parser
+from .rollup import apply_rollup_deltas, deltas_for_rows
 from ..schemas import TransactionCreate, ImportStats
 from ..models import TransactionType
+from ..metrics import PhaseTimer
+
+# Nombre de lignes par INSERT multi-valeurs en mode bulk (et par chunk en lecture en flux)
+BULK_CHUNK_SIZE = 5000
+
+# Mapping catégories Boursorama → nom de catégorie
+BOURSORAMA_MAPPING = {
+    "alimentation": "Épicerie",
+    "carburant": "Carburant",
+    "vêtements": "Vêtements",
+    "hébergement": "Hôtel",
+    "restaurant": "Restaurant",
+    "virements": "Virement interne",
+}
+
+# Mots-clés dans la description → nom de catégorie
+KEYWORDS_MAPPING = {
+    "carrefour": "Épicerie",
+    "leclerc": "Épicerie",
+    "auchan": "Épicerie",
+    "super u": "Épicerie",
+    "intermarche": "Épicerie",
+    "uber": "VTC",
+    "sncf": "Train",
+    "netflix": "Streaming",
+    "spotify": "Streaming",
+    "edf": "Électricité",
+    "bouygues": "Internet",
+    "orange": "Téléphone",
+}
+
+
+@dataclass
+class ParsedCSV:
+    """CSV lu et préparé hors base (voir parse_for_import), prêt pour import_parsed"""
+    frame: pd.DataFrame
+    # import_ids des lignes complètes, alignés sur l'index de frame
+    import_ids: pd.Series
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+def parse_for_import(path: str, account_id: int, bank_type: str = "boursorama") -> ParsedCSV:
+    """Lecture, nettoyage et calcul des import_ids d'un fichier, sans accès à la base.
+
+    Fonction de module (sérialisable) : exécutée dans un processus de travail
+    par l'import par lot, la partie CPU du parsing tourne en parallèle.
+    """
+    parser = get_parser(bank_type)
+    importer = BankCSVImporter(None, account_id)
+    with importer.timer.phase("parse"):
+        df = parser.parse(path)
+    with importer.timer.phase("dedup"):
+        valid = df[~BankCSVImporter._missing_rows(df)]
+        import_ids = importer._compute_import_ids(valid) if not valid.empty else pd.Series(dtype=object)
+    return ParsedCSV(df, import_ids, dict(importer.timer.totals))
 
 
 class BankCSVImporter:
@@ -20,6 +80,10 @@ class BankCSVImporter:
     def __init__(self, db: Session, account_id: int):
         self.db = db
         self.account_id = account_id
+        self._rule_matcher: RuleMatcher | None = None
+        # Chronomètres de l'import en cours (remis à zéro à chaque import)
+        self.timer = PhaseTimer()
+        self._mapping_ids: tuple[dict[str, int], dict[str, int]] | None = None
 
     def _normalize_base_key(self, row: pd.Series) -> str:
         """Construit la clé de base normalisée pour le hashing."""
@@ -45,17 +109,17 @@ class BankCSVImporter:
 
     def _apply_user_rules(self, description: str, merchant: str | None) -> int | None:
         """Applique les règles utilisateur (priorité sur le mapping hardcodé)"""
-        rules = get_categorization_rules(self.db, active_only=True)
-        for rule in rules:
-            field_value = ""
-            if rule.match_field == "merchant" and merchant:
-                field_value = merchant.lower()
-            elif description:
-                field_value = description.lower()
-
-            if rule.keyword.lower() in field_value:
-                return rule.category_id
-        return None
+        if self._rule_matcher is None:
+            self._rule_matcher = RuleMatcher.from_db(self.db)
+        return self._rule_matcher.match(description, merchant)
+
+    def _resolve_mappings(self) -> tuple[dict[str, int], dict[str, int]]:
+        """Résout une fois par import les cibles des mappings hardcodés en category_id"""
+        if self._mapping_ids is None:
+            # Index relu à chaque import : catégories ajoutées hors API ou par un autre worker
+            index = CategoryIndex.from_db(self.db)
+            self._mapping_ids = (index.resolve(BOURSORAMA_MAPPING), index.resolve(KEYWORDS_MAPPING))
+        return self._mapping_ids
 
     def auto_categorize(self, description: str, merchant: str | None = None, category: str | None = None) -> int | None:
         """Essaye de catégoriser automatiquement. Priorité : règles utilisateur > mapping Boursorama > keywords"""
@@ -67,87 +131,116 @@ class BankCSVImporter:
         if rule_result is not None:
             return rule_result
 
-        # 2. Mapping catégories Boursorama
-        boursorama_mapping = {
-            "alimentation": "Épicerie",
-            "carburant": "Carburant",
-            "vêtements": "Vêtements",
-            "hébergement": "Hôtel",
-            "restaurant": "Restaurant",
-            "virements": "Virement interne",
-        }
+        boursorama_ids, keyword_ids = self._resolve_mappings()
 
+        # 2. Mapping catégories Boursorama
         if category:
             category_lower = category.lower()
-            for key, cat_name in boursorama_mapping.items():
+            for key, cat_id in boursorama_ids.items():
                 if key in category_lower:
-                    found_cat = find_category_by_keyword(self.db, cat_name)
-                    if found_cat:
-                        return found_cat.id
+                    return cat_id
 
         # 3. Keywords dans la description
-        keywords_mapping = {
-            "carrefour": "Épicerie",
-            "leclerc": "Épicerie",
-            "auchan": "Épicerie",
-            "super u": "Épicerie",
-            "intermarche": "Épicerie",
-            "uber": "VTC",
-            "sncf": "Train",
-            "netflix": "Streaming",
-            "spotify": "Streaming",
-            "edf": "Électricité",
-            "bouygues": "Internet",
-            "orange": "Téléphone",
-        }
-
         description_lower = description.lower()
-        for keyword, category_name in keywords_mapping.items():
+        for keyword, cat_id in keyword_ids.items():
             if keyword in description_lower:
-                found_cat = find_category_by_keyword(self.db, category_name)
-                if found_cat:
-                    return found_cat.id
+                return cat_id
 
         return None
 
-    def parse_boursorama_csv(self, file_path: str) -> pd.DataFrame:
-        """Parse un CSV Boursorama"""
-        df = pd.read_csv(
-            file_path,
-            sep=";",
-            encoding="utf-8-sig",  # Gère le BOM des CSV Boursorama
-            quotechar='"',
+    def parse_boursorama_csv(self, source: str | IO[bytes]) -> pd.DataFrame:
+        """Parse un CSV Boursorama (chemin ou fichier ouvert)"""
+        return get_parser("boursorama").parse(source)
+
+    def _compute_import_ids(
+        self,
+        df: pd.DataFrame,
+        occurrence_tracker: dict[str, int] | None = None,
+    ) -> pd.Series:
+        """Version vectorisée de _normalize_base_key + generate_import_id.
+
+        Produit exactement les mêmes hash que le chemin ligne par ligne :
+        clé normalisée, compteur d'occurrence (ordre du fichier) puis MD5.
+        occurrence_tracker conserve les compteurs d'un morceau à l'autre
+        quand le fichier est lu par chunks ; il est mis à jour sur place.
+        """
+        if "label" in df.columns:
+            labels = (
+                df["label"].map(str)
+                .str.strip()
+                .str.lower()
+                .str.replace(r"\s+", " ", regex=True)
+            )
+        else:
+            labels = pd.Series("", index=df.index)
+        date_str = df["dateOp"].dt.strftime("%Y-%m-%d")
+        amount_str = df["amount"].map("{:.2f}".format)
+
+        base_keys = f"{self.account_id}_" + date_str + "_" + amount_str + "_" + labels
+        occurrences = base_keys.groupby(base_keys, sort=False).cumcount()
+        if occurrence_tracker is not None:
+            if occurrence_tracker:
+                occurrences = occurrences + base_keys.map(occurrence_tracker).fillna(0).astype(int)
+            for key, count in base_keys.value_counts(sort=False).items():
+                occurrence_tracker[key] = occurrence_tracker.get(key, 0) + int(count)
+
+        return pd.Series(
+            [
+                hashlib.md5(f"{key}_{occ}".encode()).hexdigest()
+                for key, occ in zip(base_keys, occurrences)
+            ],
+            index=df.index,
         )
 
-        # Nettoyer les guillemets dans les colonnes
-        for col in df.columns:
-            if df[col].dtype == "object":
-                df[col] = df[col].str.strip('"')
-
-        # Convertir amount en float (virgule → point, espaces normaux et insécables)
-        if "amount" in df.columns:
-            df["amount"] = (
-                df["amount"]
-                .astype(str)
-                .str.replace(",", ".", regex=False)
-                .str.replace(" ", "", regex=False)
-                .str.replace("\xa0", "", regex=False)
-                .astype(float)
-            )
+    def _prefetch_import_ids(self, df: pd.DataFrame) -> set[str]:
+        """import_ids déjà en base pour le compte, sur la fenêtre de dates du fichier.
+
+        Un import_id encode le compte et la date de l'opération : une ligne du
+        fichier ne peut donc être un doublon que d'une transaction de cette
+        fenêtre. Une seule requête remplace un SELECT par ligne.
+        """
+        if "dateOp" not in df.columns or df["dateOp"].isna().all():
+            return set()
+        start, end = df["dateOp"].min(), df["dateOp"].max()
+        return get_import_ids_in_range(
+            self.db, self.account_id, start.to_pydatetime(), end.to_pydatetime()
+        )
 
-        # Parser les dates
-        if "dateOp" in df.columns:
-            df["dateOp"] = pd.to_datetime(df["dateOp"], format="%Y-%m-%d")
+    @staticmethod
+    def _clean_text_column(df: pd.DataFrame, col: str) -> pd.Series:
+        """Colonne texte nettoyée (strip), None pour les valeurs manquantes."""
+        if col not in df.columns:
+            return pd.Series([None] * len(df), index=df.index, dtype=object)
+        return pd.Series(
+            [v.strip() if pd.notna(v) else None for v in df[col]],
+            index=df.index,
+            dtype=object,
+        )
 
-        return df
+    def import_csv(
+        self,
+        file_path: str,
+        bank_type: str = "boursorama",
+        bulk: bool = False,
+    ) -> ImportStats:
+        """Importe un fichier (CSV, OFX, QIF selon bank_type, voir parsers) dans la base.
+
+        Avec ``bulk=True``, les clés de dédoublonnage sont calculées sur tout
+        le DataFrame et les nouvelles lignes sont insérées par lots dans une
+        seule transaction (voir _import_bulk).
+        """
 
-    def import_csv(self, file_path: str, bank_type: str = "boursorama") -> ImportStats:
-        """Importe un fichier CSV dans la base"""
+        parser = get_parser(bank_type)
+        self.timer = PhaseTimer()
+        with self.timer.phase("parse"):
+            df = parser.parse(file_path)
 
-        if bank_type == "boursorama":
-            df = self.parse_boursorama_csv(file_path)
-        else:
-            raise ValueError(f"Type de banque '{bank_type}' non supporté")
+        # Règles et mappings recompilés à chaque import pour prendre en compte les ajouts
+        self._rule_matcher = RuleMatcher.from_db(self.db)
+        self._mapping_ids = None
+
+        if bulk:
+            return self._import_bulk(df)
 
         stats = ImportStats(
             total_rows=len(df),
@@ -158,6 +251,8 @@ class BankCSVImporter:
         )
 
         occurrence_tracker: dict[str, int] = {}
+        with self.timer.phase("dedup"):
+            known_ids = self._prefetch_import_ids(df)
 
         for idx, row in df.iterrows():
             try:
@@ -166,13 +261,13 @@ class BankCSVImporter:
                     stats.error_details.append(f"Ligne {idx}: données manquantes")
                     continue
 
-                base_key = self._normalize_base_key(row)
-                occurrence = occurrence_tracker.get(base_key, 0)
-                occurrence_tracker[base_key] = occurrence + 1
-
-                import_id = self.generate_import_id(base_key, occurrence)
+                with self.timer.phase("dedup"):
+                    base_key = self._normalize_base_key(row)
+                    occurrence = occurrence_tracker.get(base_key, 0)
+                    occurrence_tracker[base_key] = occurrence + 1
+                    import_id = self.generate_import_id(base_key, occurrence)
 
-                if transaction_exists(self.db, import_id):
+                if import_id in known_ids:
                     stats.duplicates += 1
                     continue
 
@@ -192,6 +287,9 @@ class BankCSVImporter:
 
                 category_raw = row.get("category") if pd.notna(row.get("category")) else None
 
+                with self.timer.phase("categorize"):
+                    category_id = self.auto_categorize(description, merchant, category_raw)
+
                 transaction = TransactionCreate(
                     account_id=self.account_id,
                     transaction_type=self.detect_transaction_type(row["amount"]),
@@ -199,16 +297,184 @@ class BankCSVImporter:
                     description=description,
                     date=row["dateOp"],
                     merchant=merchant,
-                    category_id=self.auto_categorize(description, merchant, category_raw),
+                    category_id=category_id,
                     category_parent_csv=category_parent_csv,
                     import_id=import_id,
                 )
 
-                create_transaction(self.db, transaction)
+                with self.timer.phase("insert"):
+                    create_transaction(self.db, transaction)
+                known_ids.add(import_id)
                 stats.imported += 1
 
             except Exception as e:
                 stats.errors += 1
                 stats.error_details.append(f"Ligne {idx}: {str(e)}")
 
+        self._finish_timings(stats)
         return stats
+
+    def import_stream(
+        self,
+        source: IO[bytes],
+        bank_type: str = "boursorama",
+        chunksize: int = BULK_CHUNK_SIZE,
+        on_chunk: Callable[[ImportStats], None] | None = None,
+    ) -> ImportStats:
+        """Importe un CSV lu en flux (ex: fichier uploadé), morceau par morceau.
+
+        Chaque chunk est dédoublonné, catégorisé, inséré puis commité avant de
+        lire le suivant : la mémoire dépend de chunksize, pas de la taille du
+        fichier. Les compteurs d'occurrence sont conservés entre les chunks,
+        les import_ids sont donc identiques à ceux d'un import en une fois.
+        on_chunk reçoit les statistiques cumulées après chaque chunk.
+        """
+        parser = get_parser(bank_type)
+        self._rule_matcher = RuleMatcher.from_db(self.db)
+        self._mapping_ids = None
+        self.timer = PhaseTimer()
+
+        stats = self._empty_stats()
+        occurrence_tracker: dict[str, int] = {}
+        chunks = parser.iter_chunks(source, chunksize)
+        while True:
+            with self.timer.phase("parse"):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            payload = self._prepare_bulk_rows(chunk, stats, occurrence_tracker)
+            self._insert_bulk_rows(payload, stats)
+            stats.timings = self.timer.rounded()
+            if on_chunk is not None:
+                on_chunk(stats)
+        self._finish_timings(stats)
+        return stats
+
+    def _finish_timings(self, stats: ImportStats) -> None:
+        """Reporte les chronomètres dans les stats et dans /metrics"""
+        stats.timings = self.timer.rounded()
+        self.timer.publish()
+
+    def import_parsed(self, parsed: ParsedCSV) -> ImportStats:
+        """Importe un fichier déjà préparé par parse_for_import : dédoublonnage
+        contre la base, catégorisation et insertion en une transaction."""
+        self._rule_matcher = RuleMatcher.from_db(self.db)
+        self._mapping_ids = None
+        self.timer = PhaseTimer()
+        self.timer.totals.update(parsed.timings)
+
+        stats = self._empty_stats()
+        payload = self._prepare_bulk_rows(parsed.frame, stats, {}, parsed.import_ids)
+        self._insert_bulk_rows(payload, stats)
+        self._finish_timings(stats)
+        return stats
+
+    @staticmethod
+    def _empty_stats() -> ImportStats:
+        return ImportStats(total_rows=0, imported=0, duplicates=0, errors=0, error_details=[])
+
+    def _import_bulk(self, df: pd.DataFrame) -> ImportStats:
+        """Import en masse : hash vectorisés, un INSERT par lot, un seul commit."""
+        stats = self._empty_stats()
+        payload = self._prepare_bulk_rows(df, stats, {})
+        self._insert_bulk_rows(payload, stats)
+        self._finish_timings(stats)
+        return stats
+
+    def _insert_bulk_rows(self, payload: list[dict], stats: ImportStats) -> None:
+        """Insère les lignes dans une seule transaction (INSERT par lots, COPY sous Postgres)"""
+        if not payload:
+            return
+        try:
+            with self.timer.phase("insert"):
+                inserted = insert_transactions(self.db, payload, BULK_CHUNK_SIZE)
+                apply_rollup_deltas(self.db, deltas_for_rows(inserted))
+                self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            stats.errors += len(payload)
+            stats.error_details.append(f"Insertion en masse annulée: {str(e)}")
+            return
+        stats.imported += len(inserted)
+        # Postgres : lignes écartées par ON CONFLICT (insérées entre-temps par un autre import)
+        stats.duplicates += len(payload) - len(inserted)
+
+    def _prepare_bulk_rows(
+        self,
+        df: pd.DataFrame,
+        stats: ImportStats,
+        occurrence_tracker: dict[str, int],
+        import_ids: pd.Series | None = None,
+    ) -> list[dict]:
+        """Calcule les import_ids (sauf s'ils sont fournis), écarte les doublons
+        et construit les lignes à insérer"""
+        stats.total_rows += len(df)
+
+        missing = self._missing_rows(df)
+        for idx in df.index[missing]:
+            stats.errors += 1
+            stats.error_details.append(f"Ligne {idx}: données manquantes")
+
+        valid = df[~missing]
+        if valid.empty:
+            return []
+
+        with self.timer.phase("dedup"):
+            if import_ids is None:
+                import_ids = self._compute_import_ids(valid, occurrence_tracker)
+            else:
+                import_ids = import_ids.loc[valid.index]
+            is_new = ~import_ids.isin(self._prefetch_import_ids(valid))
+        stats.duplicates += int((~is_new).sum())
+
+        new_rows = valid[is_new]
+        new_ids = import_ids[is_new]
+        if new_rows.empty:
+            return []
+        with self.timer.phase("categorize"):
+            return self._build_payload(new_rows, new_ids, stats)
+
+    @staticmethod
+    def _missing_rows(df: pd.DataFrame) -> pd.Series:
+        """Masque des lignes sans montant ou sans date (comptées en erreur)"""
+        amount_col = df["amount"] if "amount" in df.columns else pd.Series(float("nan"), index=df.index)
+        date_col = df["dateOp"] if "dateOp" in df.columns else pd.Series(pd.NaT, index=df.index)
+        return amount_col.isna() | date_col.isna()
+
+    def _build_payload(self, new_rows: pd.DataFrame, new_ids: pd.Series, stats: ImportStats) -> list[dict]:
+        """Lignes à insérer (nettoyage des textes et catégorisation automatique)"""
+        descriptions = self._clean_text_column(new_rows, "label").fillna("")
+        merchants = self._clean_text_column(new_rows, "supplierFound")
+        parents_csv = self._clean_text_column(new_rows, "categoryParent")
+        categories_raw = (
+            [v if pd.notna(v) else None for v in new_rows["category"]]
+            if "category" in new_rows.columns
+            else [None] * len(new_rows)
+        )
+        dates = list(new_rows["dateOp"].dt.to_pydatetime())
+        # Centimes signés, arrondis en colonne (int64 exact)
+        cents = np.rint(new_rows["amount"].to_numpy(dtype="float64") * 100).astype(np.int64)
+
+        payload: list[dict] = []
+        rows = zip(
+            new_rows.index, new_ids, new_rows["amount"], cents.tolist(), dates,
+            descriptions, merchants, parents_csv, categories_raw,
+        )
+        for idx, import_id, amount, amount_cents, date, description, merchant, parent_csv, category_raw in rows:
+            try:
+                payload.append({
+                    "account_id": self.account_id,
+                    "transaction_type": self.detect_transaction_type(amount),
+                    "amount_cents": amount_cents,
+                    "description": description,
+                    "date": date,
+                    "merchant": merchant,
+                    "category_id": self.auto_categorize(description, merchant, category_raw),
+                    "category_parent_csv": parent_csv,
+                    "import_id": import_id,
+                })
+            except Exception as e:
+                stats.errors += 1
+                stats.error_details.append(f"Ligne {idx}: {str(e)}")
+
+        return payload
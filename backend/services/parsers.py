@@ -0,0 +1,322 @@
+# backend/services/parsers.py
+"""Registre des formats d'export bancaire.
+
+Chaque parser lit un fichier (chemin ou flux binaire) et produit un
+DataFrame normalisé, typé, commun à tous les formats :
+
+    dateOp          datetime64  date d'opération (obligatoire)
+    amount          float64     montant signé, négatif = débit (obligatoire)
+    label           str         libellé
+    supplierFound   str         marchand, si le format le fournit
+    category        str         catégorie de la banque, si fournie
+    categoryParent  str         catégorie parente de la banque, si fournie
+
+Les noms de colonnes sont ceux de l'export Boursorama, historique : les
+import_ids (dédoublonnage) en dépendent. Une valeur illisible (date, montant)
+lève une ValueError ; une valeur absente donne NaT/NaN (ligne comptée en erreur).
+
+Formats enregistrés : boursorama, csv (profil générique, voir CSVProfile),
+ofx, qif. register_parser en ajoute d'autres.
+
+Le CSV Boursorama est lu avec le moteur C de pandas ; le moteur pyarrow
+(multi-thread, pyarrow à installer) est opt-in : FINANCE_CSV_ENGINE=pyarrow.
+Les options sont typées (decimal=",", dates parsées à la lecture) dans les deux cas.
+
+pandas n'est importé qu'au premier parsing : le registre (noms, extensions)
+est consultable par l'API sans charger pandas.
+"""
+from __future__ import annotations
+
+import io
+import re
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Iterator, Optional
+
+from ..settings import CSV_ENGINES, ImportSettings
+
+if TYPE_CHECKING:
+    import pandas as pd
+DEFAULT_CHUNK_SIZE = 5000
+
+# Espaces possibles dans un montant : séparateur de milliers normal, insécable, fine insécable
+AMOUNT_SPACES = (" ", "\xa0", "\u202f")
+
+TEXT_COLUMNS = ("label", "supplierFound", "category", "categoryParent")
+
+
+def _coerce_dates(values: pd.Series, date_format: str) -> pd.Series:
+    """Dates déjà typées par le lecteur, sinon conversion stricte (ValueError si illisible)"""
+    import pandas as pd
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_datetime(values, format=date_format)
+
+
+def _coerce_amounts(values: pd.Series, decimal: str = ",") -> pd.Series:
+    """Montants déjà numériques, sinon nettoyage des espaces (séparateur de milliers,
+    insécables) et du séparateur décimal ; ValueError si un montant reste illisible"""
+    import pandas as pd
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype("float64")
+    cleaned = values.astype(str)
+    # Remplacements littéraux : avec des chaînes pyarrow, la regex \s (RE2) ne couvre pas \xa0
+    for space in AMOUNT_SPACES:
+        cleaned = cleaned.str.replace(space, "", regex=False)
+    if decimal == ",":
+        cleaned = cleaned.str.replace(",", ".", regex=False)
+    else:
+        cleaned = cleaned.str.replace(",", "", regex=False)
+    return cleaned.astype("float64")
+
+
+def _read_text(source: str | IO[bytes]) -> str:
+    """Contenu texte d'un fichier (UTF-8, sinon Windows-1252, courant pour OFX/QIF)"""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            raw = f.read()
+    else:
+        raw = source.read()
+    try:
+        return raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return raw.decode("cp1252", errors="replace")
+
+
+class BankParser:
+    """Format d'export : parse() renvoie le DataFrame normalisé du fichier entier"""
+
+    name: str = ""
+    extensions: tuple[str, ...] = ()
+
+    def parse(self, source: str | IO[bytes]) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def iter_chunks(self, source: str | IO[bytes], chunksize: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """Morceaux de chunksize lignes (index continu) ; par défaut, découpe du fichier parsé"""
+        df = self.parse(source)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+
+    def accepts(self, filename: str) -> bool:
+        return filename.lower().endswith(self.extensions)
+
+
+class BoursoramaParser(BankParser):
+    """Export CSV Boursorama : dateOp;dateVal;label;category;categoryParent;supplierFound;amount;..."""
+
+    name = "boursorama"
+    extensions = (".csv",)
+    date_format = "%Y-%m-%d"
+    read_options = {
+        "sep": ";",
+        "encoding": "utf-8-sig",  # Gère le BOM des CSV Boursorama
+        "quotechar": '"',
+        "decimal": ",",
+        "parse_dates": ["dateOp"],
+        "date_format": "%Y-%m-%d",
+        "dtype": {col: "str" for col in TEXT_COLUMNS},
+    }
+
+    def __init__(self, engine: str = "c"):
+        if engine not in CSV_ENGINES:
+            raise ValueError(f"Moteur CSV '{engine}' inconnu ({', '.join(CSV_ENGINES)})")
+        self.engine = engine
+
+    def parse(self, source: str | IO[bytes]) -> pd.DataFrame:
+        import pandas as pd
+        return self._normalize(pd.read_csv(source, engine=self.engine, **self.read_options))
+
+    def iter_chunks(self, source: str | IO[bytes], chunksize: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        import pandas as pd
+        # Le moteur pyarrow ne lit pas par morceaux : moteur C, mêmes options typées
+        with pd.read_csv(source, chunksize=chunksize, engine="c", **self.read_options) as reader:
+            for chunk in reader:
+                yield self._normalize(chunk)
+
+    def _normalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Colonnes typées à la lecture ; conversion de secours seulement pour les
+        # valeurs que le lecteur n'a pas su typer (ex. "1 250,00")
+        if "amount" in df.columns:
+            df["amount"] = _coerce_amounts(df["amount"])
+        if "dateOp" in df.columns:
+            df["dateOp"] = _coerce_dates(df["dateOp"], self.date_format)
+        # Guillemets isolés que le lecteur laisse (champ mal fermé) : retirés comme
+        # avant, le libellé entre dans l'import_id
+        for col in TEXT_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].str.strip('"')
+        return df
+
+
+@dataclass(frozen=True)
+class CSVProfile:
+    """Correspondance entre les colonnes d'un CSV quelconque et le format normalisé.
+
+    Montant : une colonne signée (amount_column) ou deux colonnes débit / crédit
+    (débit compté en négatif, qu'il soit écrit positif ou négatif).
+    """
+    name: str
+    date_column: str = "date"
+    label_column: str = "libelle"
+    amount_column: Optional[str] = "montant"
+    debit_column: Optional[str] = None
+    credit_column: Optional[str] = None
+    merchant_column: Optional[str] = None
+    category_column: Optional[str] = None
+    sep: str = ";"
+    decimal: str = ","
+    encoding: str = "utf-8-sig"
+    date_format: str = "%d/%m/%Y"
+
+
+class GenericCSVParser(BankParser):
+    """CSV décrit par un CSVProfile"""
+
+    extensions = (".csv",)
+
+    def __init__(self, profile: CSVProfile):
+        self.profile = profile
+        self.name = profile.name
+
+    def _read_options(self) -> dict:
+        p = self.profile
+        text_columns = [c for c in (p.label_column, p.merchant_column, p.category_column) if c]
+        return {
+            "sep": p.sep,
+            "encoding": p.encoding,
+            "decimal": p.decimal,
+            "dtype": {col: "str" for col in text_columns},
+        }
+
+    def parse(self, source: str | IO[bytes]) -> pd.DataFrame:
+        import pandas as pd
+        return self._normalize(pd.read_csv(source, **self._read_options()))
+
+    def iter_chunks(self, source: str | IO[bytes], chunksize: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        import pandas as pd
+        with pd.read_csv(source, chunksize=chunksize, **self._read_options()) as reader:
+            for chunk in reader:
+                yield self._normalize(chunk)
+
+    def _normalize(self, raw: pd.DataFrame) -> pd.DataFrame:
+        import pandas as pd
+        p = self.profile
+        missing = [c for c in (p.date_column, p.amount_column, p.debit_column, p.credit_column)
+                   if c and c not in raw.columns]
+        if missing:
+            raise ValueError(f"Colonnes absentes pour le format '{p.name}' : {', '.join(missing)}")
+
+        if p.amount_column:
+            amount = _coerce_amounts(raw[p.amount_column], p.decimal)
+        else:
+            debit = _coerce_amounts(raw[p.debit_column], p.decimal).abs()
+            credit = _coerce_amounts(raw[p.credit_column], p.decimal).abs()
+            amount = credit.fillna(0.0) - debit.fillna(0.0)
+            amount = amount.where(debit.notna() | credit.notna())
+
+        df = pd.DataFrame({
+            "dateOp": _coerce_dates(raw[p.date_column], p.date_format),
+            "amount": amount,
+            "label": raw[p.label_column] if p.label_column in raw.columns else pd.Series("", index=raw.index),
+        }, index=raw.index)
+        if p.merchant_column and p.merchant_column in raw.columns:
+            df["supplierFound"] = raw[p.merchant_column]
+        if p.category_column and p.category_column in raw.columns:
+            df["category"] = raw[p.category_column]
+        return df
+
+
+_OFX_TRANSACTION = re.compile(r"<STMTTRN>(.*?)(?:</STMTTRN>|(?=<STMTTRN>)|(?=</BANKTRANLIST>))", re.S | re.I)
+_OFX_FIELD = re.compile(r"<(DTPOSTED|TRNAMT|NAME|MEMO|PAYEE)>([^<\r\n]*)", re.I)
+
+
+class OFXParser(BankParser):
+    """OFX 1.x (SGML, balises non fermées) et 2.x (XML) : blocs STMTTRN"""
+
+    name = "ofx"
+    extensions = (".ofx", ".qfx")
+
+    def parse(self, source: str | IO[bytes]) -> pd.DataFrame:
+        import pandas as pd
+        dates, amounts, labels, merchants = [], [], [], []
+        for block in _OFX_TRANSACTION.findall(_read_text(source)):
+            fields = {key.upper(): value.strip() for key, value in _OFX_FIELD.findall(block)}
+            dates.append(fields.get("DTPOSTED", "")[:8] or None)
+            amounts.append(fields.get("TRNAMT"))
+            name = fields.get("NAME") or fields.get("PAYEE")
+            labels.append(fields.get("MEMO") or name or "")
+            merchants.append(name if fields.get("MEMO") else None)
+
+        raw_amounts = pd.Series(amounts, dtype=object)
+        return pd.DataFrame({
+            "dateOp": pd.to_datetime(pd.Series(dates, dtype=object), format="%Y%m%d"),
+            # OFX : point décimal, mais certaines banques françaises écrivent une virgule
+            "amount": _coerce_amounts(raw_amounts.str.replace(",", ".", regex=False), decimal="."),
+            "label": pd.Series(labels, dtype="str"),
+            "supplierFound": pd.Series(merchants, dtype="str"),
+        })
+
+
+class QIFParser(BankParser):
+    """QIF : une ligne par champ (D date, T montant, P bénéficiaire, M mémo, L catégorie), ^ fin d'opération"""
+
+    name = "qif"
+    extensions = (".qif",)
+
+    def __init__(self, date_format: str = "%d/%m/%Y"):
+        self.date_format = date_format
+
+    def parse(self, source: str | IO[bytes]) -> pd.DataFrame:
+        import pandas as pd
+        records: list[dict[str, str]] = []
+        current: dict[str, str] = {}
+        for line in io.StringIO(_read_text(source)):
+            line = line.strip()
+            if not line or line.startswith("!"):
+                continue
+            if line == "^":
+                if current:
+                    records.append(current)
+                current = {}
+                continue
+            current.setdefault(line[0], line[1:].strip())
+        if current:
+            records.append(current)
+
+        dates = pd.Series([r.get("D") for r in records], dtype=object)
+        # Années abrégées de Quicken : l'apostrophe marque les années 2000 (15/06'25)
+        dates = dates.str.replace(r"'\s*(\d{2})$", r"/20\1", regex=True)
+        amounts = pd.Series([r.get("T") for r in records], dtype=object)
+        return pd.DataFrame({
+            "dateOp": pd.to_datetime(dates, format=self.date_format),
+            "amount": _coerce_amounts(amounts, decimal="."),
+            "label": pd.Series([r.get("M") or r.get("P") or "" for r in records], dtype="str"),
+            "supplierFound": pd.Series([r.get("P") if r.get("M") else None for r in records], dtype="str"),
+            "category": pd.Series([r.get("L") for r in records], dtype="str"),
+        })
+
+
+_REGISTRY: dict[str, BankParser] = {}
+
+
+def register_parser(parser: BankParser) -> BankParser:
+    """Enregistre (ou remplace) un format sous parser.name"""
+    _REGISTRY[parser.name] = parser
+    return parser
+
+
+def get_parser(bank_type: str) -> BankParser:
+    parser = _REGISTRY.get(bank_type)
+    if parser is None:
+        raise ValueError(f"Type de banque '{bank_type}' non supporté")
+    return parser
+
+
+def available_parsers() -> list[str]:
+    return sorted(_REGISTRY)
+
+
+register_parser(BoursoramaParser(engine=ImportSettings.from_env().csv_engine))
+register_parser(GenericCSVParser(CSVProfile(name="csv")))
+register_parser(OFXParser())
+register_parser(QIFParser())
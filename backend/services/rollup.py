@@ -0,0 +1,241 @@
+# backend/services/rollup.py
+"""Agrégat mensuel (account_id, month, category_id, transaction_type) -> total_cents, count.
+
+Les totaux sont des sommes de montants absolus en centimes (entiers) : le
+maintien incrémental et le recalcul donnent exactement le même résultat.
+
+Les écritures sur transactions passent des deltas à apply_rollup_deltas dans
+la même transaction que la modification : la table reste à jour sans jamais
+relire l'historique. Les deltas sont appliqués par upsert (INSERT ... ON
+CONFLICT DO UPDATE sur l'index unique de la clé) : deux écritures concurrentes
+(import en arrière-plan, PATCH, application des règles) ne créent jamais deux
+lignes pour la même clé. check_rollup_consistency recalcule l'agrégat depuis les
+transactions et le compare à la copie maintenue.
+
+    python -m backend.services.rollup            # affiche les écarts
+    python -m backend.services.rollup --repair   # reconstruit la table
+"""
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, insert, literal_column, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models import Category, MonthlyRollup, Transaction, TransactionType
+
+RollupKey = tuple[int, str, Optional[int], TransactionType]
+
+# Expressions de l'index unique ux_monthly_rollups_key (cible ON CONFLICT) ;
+# 0 en littéral : un paramètre lié ne correspondrait plus à l'expression indexée
+ROLLUP_KEY_ELEMENTS = (
+    MonthlyRollup.account_id,
+    MonthlyRollup.month,
+    func.coalesce(MonthlyRollup.category_id, literal_column("0")),
+    MonthlyRollup.transaction_type,
+)
+
+# Clés par INSERT multi-valeurs (6 paramètres par clé, sous la limite de SQLite)
+UPSERT_CHUNK_SIZE = 1000
+
+
+def month_key(date: datetime) -> str:
+    return date.strftime("%Y-%m")
+
+
+class RollupDeltas:
+    """Variations à appliquer à l'agrégat, cumulées par clé"""
+
+    def __init__(self):
+        self.items: dict[RollupKey, list] = {}
+
+    def add(
+        self,
+        account_id: int,
+        date: datetime,
+        category_id: Optional[int],
+        transaction_type: TransactionType,
+        amount_cents: int,
+        sign: int = 1,
+    ) -> None:
+        key = (account_id, month_key(date), category_id, TransactionType(transaction_type))
+        entry = self.items.setdefault(key, [0, 0])
+        entry[0] += sign * abs(amount_cents)
+        entry[1] += sign
+
+    def move(self, txn: Transaction, old_category_id: Optional[int], new_category_id: Optional[int]) -> None:
+        """Re-catégorisation : retire la transaction de l'ancienne catégorie, l'ajoute à la nouvelle"""
+        if old_category_id == new_category_id:
+            return
+        self.add(txn.account_id, txn.date, old_category_id, txn.transaction_type, txn.amount_cents, sign=-1)
+        self.add(txn.account_id, txn.date, new_category_id, txn.transaction_type, txn.amount_cents)
+
+    def __bool__(self) -> bool:
+        return bool(self.items)
+
+
+def apply_rollup_deltas(db: Session, deltas: RollupDeltas) -> None:
+    """Applique les deltas par upsert, puis retire les lignes vidées
+    (sans commit : à appeler dans la transaction de l'écriture)"""
+    if not deltas:
+        return
+    dialect_insert = sqlite.insert if db.get_bind().dialect.name == "sqlite" else postgresql.insert
+    values = [
+        {
+            "account_id": account_id, "month": month, "category_id": category_id,
+            "transaction_type": txn_type, "total_cents": total, "count": count,
+        }
+        for (account_id, month, category_id, txn_type), (total, count) in deltas.items.items()
+    ]
+    for start in range(0, len(values), UPSERT_CHUNK_SIZE):
+        stmt = dialect_insert(MonthlyRollup).values(values[start:start + UPSERT_CHUNK_SIZE])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=list(ROLLUP_KEY_ELEMENTS),
+            set_={
+                "total_cents": MonthlyRollup.total_cents + stmt.excluded.total_cents,
+                "count": MonthlyRollup.count + stmt.excluded.count,
+            },
+        ))
+    db.execute(
+        delete(MonthlyRollup)
+        .where(
+            MonthlyRollup.count <= 0,
+            MonthlyRollup.account_id.in_({key[0] for key in deltas.items}),
+            MonthlyRollup.month.in_({key[1] for key in deltas.items}),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _month_expr(db):
+    dialect = db.dialect if hasattr(db, "dialect") else db.get_bind().dialect
+    if dialect.name == "sqlite":
+        return func.strftime("%Y-%m", Transaction.date)
+    return func.to_char(Transaction.date, "YYYY-MM")
+
+
+def _aggregate_select(db):
+    """SELECT de l'agrégat complet recalculé depuis transactions"""
+    month = _month_expr(db)
+    return (
+        select(
+            Transaction.account_id,
+            month.label("month"),
+            Transaction.category_id,
+            Transaction.transaction_type,
+            func.sum(func.abs(Transaction.amount_cents)).label("total_cents"),
+            func.count(Transaction.id).label("count"),
+        )
+        .group_by(Transaction.account_id, month, Transaction.category_id, Transaction.transaction_type)
+    )
+
+
+def rebuild_rollup(db) -> None:
+    """Reconstruit entièrement la table (migration, réparation). Accepte Session ou Connection."""
+    db.execute(delete(MonthlyRollup))
+    db.execute(
+        insert(MonthlyRollup).from_select(
+            ["account_id", "month", "category_id", "transaction_type", "total_cents", "count"],
+            _aggregate_select(db),
+        )
+    )
+
+
+def check_rollup_consistency(db: Session) -> list[dict]:
+    """Compare l'agrégat maintenu à un recalcul complet. Retourne la liste des écarts."""
+    expected = {
+        (r.account_id, r.month, r.category_id, TransactionType(r.transaction_type)): (r.total_cents, r.count)
+        for r in db.execute(_aggregate_select(db))
+    }
+    # Colonnes lues en SQL (pas d'entités de la session) : l'upsert ne met pas l'identity map à jour
+    actual = {
+        (r.account_id, r.month, r.category_id, r.transaction_type): (r.total_cents, r.count)
+        for r in db.execute(select(
+            MonthlyRollup.account_id, MonthlyRollup.month, MonthlyRollup.category_id,
+            MonthlyRollup.transaction_type, MonthlyRollup.total_cents, MonthlyRollup.count,
+        ))
+    }
+    diffs = []
+    for key in sorted(expected.keys() | actual.keys(), key=str):
+        exp = expected.get(key, (0, 0))
+        act = actual.get(key, (0, 0))
+        if exp != act:
+            account_id, month, category_id, txn_type = key
+            diffs.append({
+                "account_id": account_id,
+                "month": month,
+                "category_id": category_id,
+                "transaction_type": txn_type.value,
+                "expected": {"total": exp[0] / 100, "count": exp[1]},
+                "actual": {"total": act[0] / 100, "count": act[1]},
+            })
+    return diffs
+
+
+def get_cashflow(
+    db: Session,
+    start_month: str,
+    end_month: str,
+    account_id: Optional[int] = None,
+) -> list[dict]:
+    """Revenus, dépenses et dépenses par catégorie parent, mois par mois, lus depuis l'agrégat"""
+    query = (
+        db.query(
+            MonthlyRollup.month,
+            MonthlyRollup.transaction_type,
+            Category.parent_category,
+            func.sum(MonthlyRollup.total_cents),
+        )
+        .outerjoin(Category, MonthlyRollup.category_id == Category.id)
+        .filter(MonthlyRollup.month >= start_month, MonthlyRollup.month <= end_month)
+    )
+    if account_id:
+        query = query.filter(MonthlyRollup.account_id == account_id)
+    query = query.group_by(MonthlyRollup.month, MonthlyRollup.transaction_type, Category.parent_category)
+
+    # Cumul en centimes, conversion en euros à la fin
+    months: dict[str, dict] = {}
+    for month, txn_type, parent, total in query.all():
+        entry = months.setdefault(month, {"month": month, "income": 0, "expenses": 0, "expenses_by_parent": {}})
+        if txn_type == TransactionType.CREDIT:
+            entry["income"] += total
+        else:
+            entry["expenses"] += total
+            parent = parent or "Autres"
+            entry["expenses_by_parent"][parent] = entry["expenses_by_parent"].get(parent, 0) + total
+    result = []
+    for m in sorted(months):
+        entry = months[m]
+        entry["income"] /= 100
+        entry["expenses"] /= 100
+        entry["expenses_by_parent"] = {k: v / 100 for k, v in entry["expenses_by_parent"].items()}
+        result.append(entry)
+    return result
+
+
+def deltas_for_rows(rows: Iterable[dict]) -> RollupDeltas:
+    """Deltas d'insertion pour des lignes de transactions (dicts du mode bulk)"""
+    deltas = RollupDeltas()
+    for row in rows:
+        deltas.add(row["account_id"], row["date"], row.get("category_id"), row["transaction_type"], row["amount_cents"])
+    return deltas
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from ..database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Vérifie (et répare) l'agrégat mensuel")
+    parser.add_argument("--repair", action="store_true", help="reconstruit la table depuis transactions")
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        diffs = check_rollup_consistency(session)
+        for diff in diffs:
+            print(diff)
+        print(f"{len(diffs)} écart(s)")
+        if diffs and args.repair:
+            rebuild_rollup(session)
+            session.commit()
+            print("✓ Agrégat reconstruit")
@@ -0,0 +1,63 @@
+# backend/services/search.py
+"""Recherche plein texte sur les transactions.
+
+La saisie utilisateur est traduite en requête FTS5 sûre : chaque mot devient
+un terme entre guillemets (plus d'erreur de syntaxe sur « e.leclerc » ou
+« 100% »), "plusieurs mots" reste une phrase, un * final (après un mot ou une
+phrase) fait une recherche par préfixe. Les termes sont combinés en ET.
+
+Hors SQLite (pas de FTS5), la même requête retombe sur des ILIKE.
+"""
+import re
+from typing import Optional, Sequence
+
+from sqlalchemy import Column, Integer, MetaData, Table, and_, or_, select, text
+from sqlalchemy.orm import Session
+
+from ..models import Transaction
+
+# Table virtuelle créée par TRANSACTIONS_FTS_DDL (hors métadonnées : jamais créée par create_all)
+transactions_fts = Table("transactions_fts", MetaData(), Column("rowid", Integer))
+
+SEARCH_COLUMNS = ("description", "merchant", "notes")
+
+_TERM = re.compile(r'"([^"]*)"(\*?)|(\S+)')
+_WORD = re.compile(r"\w+")
+
+
+def parse_search_terms(q: str) -> list[tuple[str, bool]]:
+    """Découpe la saisie en termes (texte normalisé, recherche par préfixe)"""
+    terms = []
+    for phrase, phrase_star, word in _TERM.findall(q):
+        words = _WORD.findall(phrase or word)
+        if words:
+            terms.append((" ".join(words), bool(phrase_star) or word.endswith("*")))
+    return terms
+
+
+def build_match_query(q: str, columns: Optional[Sequence[str]] = None) -> str:
+    """Requête FTS5 MATCH pour la saisie q ; lève ValueError si elle ne contient aucun mot"""
+    terms = parse_search_terms(q)
+    if not terms:
+        raise ValueError("Recherche vide")
+    expr = " AND ".join(f'"{term}"' + ("*" if prefix else "") for term, prefix in terms)
+    if columns:
+        expr = "{" + " ".join(columns) + "} : (" + expr + ")"
+    return expr
+
+
+def search_condition(db: Session, q: str, columns: Sequence[str] = SEARCH_COLUMNS):
+    """Condition SQL « la transaction correspond à q » (FTS5 sous SQLite, ILIKE sinon)"""
+    if db.get_bind().dialect.name == "sqlite":
+        match = select(transactions_fts.c.rowid).where(
+            text("transactions_fts MATCH :fts_query").bindparams(fts_query=build_match_query(q, columns))
+        )
+        return Transaction.id.in_(match)
+
+    terms = parse_search_terms(q)
+    if not terms:
+        raise ValueError("Recherche vide")
+    return and_(*(
+        or_(*(getattr(Transaction, col).icontains(term, autoescape=True) for col in columns))
+        for term, _ in terms
+    ))
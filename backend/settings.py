@@ -0,0 +1,148 @@
+# backend/settings.py
+"""Configuration de la base de données, lue depuis l'environnement.
+
+Variables reconnues (toutes optionnelles) :
+    FINANCE_DATABASE_URL          URL SQLAlchemy (défaut : sqlite:///../finance.db) ; Postgres :
+                                  postgresql+psycopg://user:mdp@hôte/base (driver psycopg ou psycopg2 à installer)
+    FINANCE_DB_POOL_SIZE          taille du pool de connexions
+    FINANCE_DB_MAX_OVERFLOW       connexions supplémentaires autorisées
+    FINANCE_DB_POOL_TIMEOUT       attente max d'une connexion (s)
+    FINANCE_DB_ECHO               1 pour logger le SQL
+    FINANCE_DB_ASYNC              1 pour servir les lectures par AsyncSession (aiosqlite, asyncpg sous Postgres)
+    FINANCE_SQLITE_JOURNAL_MODE   WAL (défaut) : les lectures ne sont plus bloquées par un import
+    FINANCE_SQLITE_SYNCHRONOUS    NORMAL (défaut, sûr en WAL), FULL, OFF
+    FINANCE_SQLITE_CACHE_SIZE     PRAGMA cache_size (négatif = en Kio, défaut -65536 = 64 Mio)
+    FINANCE_SQLITE_MMAP_SIZE      PRAGMA mmap_size en octets (défaut 256 Mio)
+    FINANCE_SQLITE_BUSY_TIMEOUT   PRAGMA busy_timeout en ms (défaut 5000)
+    FINANCE_CACHE_TTL             durée de vie du cache de réponses et des historiques colonnaires en s (défaut 60, 0 = désactivé)
+    FINANCE_CACHE_MAXSIZE         nombre max de réponses en cache (défaut 256)
+    FINANCE_PROFILE_SLOW_MS       active cProfile : profil écrit pour toute requête plus lente (ms)
+    FINANCE_PROFILE_DIR           dossier des profils .prof (défaut : profiles)
+    FINANCE_IMPORT_WORKERS        processus de parsing des imports par lot (défaut : nombre de CPU, 0 = sans pool)
+    FINANCE_IMPORT_JOB_RETENTION  durée de conservation d'un import terminé dans /imports, en s (défaut 3600)
+    FINANCE_IMPORT_JOBS_MAX       nombre max d'imports terminés conservés (défaut 100)
+    FINANCE_CSV_ENGINE            moteur read_csv du format Boursorama : c (défaut) ou pyarrow (à installer)
+"""
+import os
+from typing import Optional
+
+from pydantic import BaseModel
+
+DEFAULT_DATABASE_URL = "sqlite:///../finance.db"
+
+# Driver async utilisé pour chaque dialecte en mode FINANCE_DB_ASYNC
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+# Moteurs read_csv acceptés pour le format Boursorama
+CSV_ENGINES = ("c", "pyarrow")
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+class SQLitePragmas(BaseModel):
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size: int = -65536
+    mmap_size: int = 256 * 1024 * 1024
+    busy_timeout: int = 5000
+
+    def statements(self) -> list[str]:
+        """PRAGMA à exécuter à l'ouverture de chaque connexion"""
+        return [
+            f"PRAGMA journal_mode={self.journal_mode}",
+            f"PRAGMA synchronous={self.synchronous}",
+            f"PRAGMA cache_size={self.cache_size}",
+            f"PRAGMA mmap_size={self.mmap_size}",
+            f"PRAGMA busy_timeout={self.busy_timeout}",
+        ]
+
+
+class DatabaseSettings(BaseModel):
+    url: str = DEFAULT_DATABASE_URL
+    pool_size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    pool_timeout: Optional[int] = None
+    echo: bool = False
+    async_mode: bool = False
+    sqlite: SQLitePragmas = SQLitePragmas()
+
+    @property
+    def is_sqlite(self) -> bool:
+        return self.url.startswith("sqlite")
+
+    @property
+    def async_url(self) -> str:
+        """URL équivalente avec le driver async (sqlite+aiosqlite, postgresql+asyncpg)"""
+        scheme, sep, rest = self.url.partition("://")
+        dialect = scheme.split("+", 1)[0]
+        driver = ASYNC_DRIVERS.get(dialect)
+        if driver is None:
+            raise ValueError(f"Pas de driver async connu pour '{dialect}'")
+        return f"{dialect}+{driver}{sep}{rest}"
+
+    @classmethod
+    def from_env(cls) -> "DatabaseSettings":
+        defaults = SQLitePragmas()
+        return cls(
+            url=os.environ.get("FINANCE_DATABASE_URL", DEFAULT_DATABASE_URL),
+            pool_size=_env_int("FINANCE_DB_POOL_SIZE", None),
+            max_overflow=_env_int("FINANCE_DB_MAX_OVERFLOW", None),
+            pool_timeout=_env_int("FINANCE_DB_POOL_TIMEOUT", None),
+            echo=os.environ.get("FINANCE_DB_ECHO", "") == "1",
+            async_mode=os.environ.get("FINANCE_DB_ASYNC", "") == "1",
+            sqlite=SQLitePragmas(
+                journal_mode=os.environ.get("FINANCE_SQLITE_JOURNAL_MODE", defaults.journal_mode),
+                synchronous=os.environ.get("FINANCE_SQLITE_SYNCHRONOUS", defaults.synchronous),
+                cache_size=_env_int("FINANCE_SQLITE_CACHE_SIZE", defaults.cache_size),
+                mmap_size=_env_int("FINANCE_SQLITE_MMAP_SIZE", defaults.mmap_size),
+                busy_timeout=_env_int("FINANCE_SQLITE_BUSY_TIMEOUT", defaults.busy_timeout),
+            ),
+        )
+
+
+class CacheSettings(BaseModel):
+    ttl: int = 60
+    maxsize: int = 256
+
+    @classmethod
+    def from_env(cls) -> "CacheSettings":
+        defaults = cls()
+        return cls(
+            ttl=_env_int("FINANCE_CACHE_TTL", defaults.ttl),
+            maxsize=_env_int("FINANCE_CACHE_MAXSIZE", defaults.maxsize),
+        )
+
+
+class MetricsSettings(BaseModel):
+    # None : pas de profilage (aucun surcoût sur les endpoints)
+    profile_slow_ms: Optional[int] = None
+    profile_dir: str = "profiles"
+
+    @classmethod
+    def from_env(cls) -> "MetricsSettings":
+        defaults = cls()
+        return cls(
+            profile_slow_ms=_env_int("FINANCE_PROFILE_SLOW_MS", defaults.profile_slow_ms),
+            profile_dir=os.environ.get("FINANCE_PROFILE_DIR", defaults.profile_dir),
+        )
+
+
+class ImportSettings(BaseModel):
+    # None : un processus par CPU ; 0 : parsing dans le thread d'import
+    parse_workers: Optional[int] = None
+    csv_engine: str = "c"
+    job_retention: int = 3600
+    max_finished_jobs: int = 100
+
+    @classmethod
+    def from_env(cls) -> "ImportSettings":
+        defaults = cls()
+        return cls(
+            parse_workers=_env_int("FINANCE_IMPORT_WORKERS", None),
+            csv_engine=os.environ.get("FINANCE_CSV_ENGINE", defaults.csv_engine),
+            job_retention=_env_int("FINANCE_IMPORT_JOB_RETENTION", defaults.job_retention),
+            max_finished_jobs=_env_int("FINANCE_IMPORT_JOBS_MAX", defaults.max_finished_jobs),
+        )
@@ -0,0 +1,44 @@
+# backend/streaming.py
+"""Sérialisation en flux des grandes listes (export de plages de transactions).
+
+Les lignes sont encodées directement avec orjson, sans passer par les
+modèles Pydantic, et envoyées par paquets : la mémoire reste bornée par la
+taille d'un paquet quelle que soit la longueur de la plage.
+"""
+from typing import Iterable, Iterator
+
+import orjson
+
+# Nombre de lignes encodées par paquet envoyé au client
+STREAM_CHUNK_ROWS = 500
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def iter_ndjson(rows: Iterable[dict], chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    """Une ligne JSON par objet (NDJSON)"""
+    buffer: list[bytes] = []
+    for row in rows:
+        buffer.append(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE))
+        if len(buffer) >= chunk_rows:
+            yield b"".join(buffer)
+            buffer.clear()
+    if buffer:
+        yield b"".join(buffer)
+
+
+def iter_json_array(rows: Iterable[dict], chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    """Un tableau JSON unique, émis par morceaux"""
+    yield b"["
+    buffer: list[bytes] = []
+    first = True
+    for row in rows:
+        encoded = orjson.dumps(row)
+        buffer.append(encoded if first else b"," + encoded)
+        first = False
+        if len(buffer) >= chunk_rows:
+            yield b"".join(buffer)
+            buffer.clear()
+    buffer.append(b"]")
+    yield b"".join(buffer)
@@ -0,0 +1,156 @@
+"""Benchmark : lectures concurrentes, routes sync (threadpool) vs routes async (AsyncSession).
+
+N clients enchaînent des pages larges de /transactions/range (500 lignes,
+curseurs variés) pendant qu'un client léger interroge /accounts en boucle.
+En sync, chaque requête occupe un thread du threadpool (--threads jetons) :
+une fois tous pris par les lectures larges, /accounts attend son tour. En
+async, l'attente de la base ne bloque aucun thread.
+
+L'app est servie en mémoire (httpx + ASGITransport), cache de réponses coupé.
+
+Usage (depuis la racine du projet) :
+    python -m benchmarks.bench_async --rows 100000 --clients 1,8,32 --threads 4 --duration 10
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+import httpx
+from anyio import to_thread
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from backend import crud
+from backend.async_routes import use_async_reads
+from backend.database import create_async_db_engine, create_db_engine, get_async_db, get_db
+from backend.main import app, response_cache
+from backend.settings import DatabaseSettings
+
+from .data import fresh_database, seed_transactions
+
+RANGE_PARAMS = {"start_date": "2015-01-01", "end_date": "2025-12-31", "limit": crud.MAX_PAGE_SIZE}
+
+
+def _cursors(db_url: str, count: int = 50) -> list[str]:
+    """Curseurs répartis sur tout l'historique : les pages lues ne sont pas toujours les mêmes"""
+    engine = create_db_engine(DatabaseSettings(url=db_url))
+    cursors, cursor = [], None
+    with sessionmaker(bind=engine)() as db:
+        while len(cursors) < count:
+            _, cursor = crud.get_transactions_by_date_range(
+                db, datetime(2015, 1, 1), datetime(2025, 12, 31), cursor=cursor,
+            )
+            if cursor is None:
+                break
+            cursors.append(cursor)
+    engine.dispose()
+    return cursors
+
+
+async def run(clients: int, duration: float, cursors: list[str]) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        deadline = time.perf_counter() + duration
+        pages = [0]
+        probe_latencies: list[float] = []
+
+        async def wide_reader(seed: int):
+            rng = random.Random(seed)
+            while time.perf_counter() < deadline:
+                params = dict(RANGE_PARAMS, cursor=rng.choice(cursors))
+                resp = await client.get("/transactions/range", params=params)
+                resp.raise_for_status()
+                pages[0] += 1
+
+        async def probe():
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                (await client.get("/accounts")).raise_for_status()
+                probe_latencies.append(time.perf_counter() - t0)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(probe(), *(wide_reader(i) for i in range(clients)))
+
+    probe_latencies.sort()
+    return {
+        "pages_s": pages[0] / duration,
+        "rows_s": pages[0] * crud.MAX_PAGE_SIZE / duration,
+        "probe_p50_ms": statistics.median(probe_latencies) * 1000,
+        "probe_p95_ms": probe_latencies[int(len(probe_latencies) * 0.95)] * 1000,
+    }
+
+
+async def run_mode(mode: str, clients_list: list[int], threads: int, duration: float, db_url: str, cursors) -> None:
+    to_thread.current_default_thread_limiter().total_tokens = threads
+    # Pool assez large pour tous les clients : en sync, la session n'est fermée
+    # (connexion rendue) qu'une fois un jeton du threadpool obtenu
+    settings = DatabaseSettings(url=db_url, pool_size=max(clients_list) + 1, max_overflow=0)
+    if mode == "sync":
+        engine = create_db_engine(settings)
+        Session = sessionmaker(bind=engine)
+
+        def _get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = _get_db
+    else:
+        engine = create_async_db_engine(settings)
+        AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def _get_async_db():
+            async with AsyncSessionLocal() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db] = _get_async_db
+
+    for clients in clients_list:
+        r = await run(clients, duration, cursors)
+        print(
+            f"{mode:>5} | {clients:3d} clients | {r['pages_s']:7.1f} pages/s ({r['rows_s']:8.0f} l/s) "
+            f"| /accounts p50 {r['probe_p50_ms']:7.1f} ms p95 {r['probe_p95_ms']:7.1f} ms"
+        )
+    if mode == "async":
+        await engine.dispose()
+    else:
+        engine.dispose()
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--clients", type=_int_list, default=[1, 8, 32])
+    parser.add_argument("--threads", type=int, default=4, help="jetons du threadpool (routes sync)")
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    response_cache.ttl = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine, session = fresh_database(engine=create_db_engine(DatabaseSettings(url=db_url)))
+        seed_transactions(session, args.rows)
+        session.close()
+        engine.dispose()
+        cursors = _cursors(db_url)
+
+        asyncio.run(run_mode("sync", args.clients, args.threads, args.duration, db_url, cursors))
+        use_async_reads(app)
+        asyncio.run(run_mode("async", args.clients, args.threads, args.duration, db_url, cursors))
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
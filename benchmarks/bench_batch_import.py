@@ -0,0 +1,83 @@
+"""Benchmark : import par lot, parsing dans le thread d'import vs pool de processus.
+
+Chaque fichier a son propre compte ; seul le parsing est parallélisé, les
+écritures restent sérialisées : le gain dépend de la part du parsing.
+
+Usage (depuis la racine du projet) :
+    python -m benchmarks.bench_batch_import --files 8 --rows 50000 --workers 0,2,4
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.models import Account
+from backend.services.import_jobs import ImportJobManager
+
+from .data import fresh_database, generate_boursorama_csv
+
+
+def run(csv_paths: list[str], parse_workers: int) -> tuple[float, int]:
+    """Retourne (durée du lot, lignes importées) sur une base SQLite neuve."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, session = fresh_database(os.path.join(tmp, "bench.db"))
+        for account_id in range(2, len(csv_paths) + 1):
+            session.add(Account(id=account_id, name=f"Compte {account_id}", account_type="checking"))
+        session.commit()
+        session.close()
+
+        # Le job supprime son dossier à la fin : on lui en donne une copie
+        directory = os.path.join(tmp, "lot")
+        os.makedirs(directory)
+        files = []
+        for account_id, path in enumerate(csv_paths, start=1):
+            copy = os.path.join(directory, os.path.basename(path))
+            shutil.copy(path, copy)
+            files.append((os.path.basename(path), account_id, copy))
+
+        manager = ImportJobManager(sessionmaker(bind=engine), parse_workers=parse_workers)
+        try:
+            if parse_workers:
+                manager._get_parse_pool().submit(int).result()  # démarrage des processus hors mesure
+            t0 = time.perf_counter()
+            job = manager.submit_batch(files, directory)
+            manager._executor.shutdown(wait=True)
+            elapsed = time.perf_counter() - t0
+        finally:
+            manager.shutdown(wait=True)
+            engine.dispose()
+    return elapsed, job.stats.imported
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--workers", type=_int_list, default=[0, 2, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp, f"export_{i}.csv")
+            generate_boursorama_csv(path, args.rows, seed=i)
+            csv_paths.append(path)
+
+        for workers in args.workers:
+            elapsed, imported = run(csv_paths, workers)
+            print(
+                f"{workers:>3} processus | {args.files} x {args.rows} lignes | {elapsed:7.2f}s "
+                f"({imported / elapsed:9.0f} l/s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark : lectures /transactions/range concurrentes pendant un import.
+
+Compare les réglages SQLite par défaut (journal rollback, synchronous=FULL)
+aux réglages de backend.settings (WAL, synchronous=NORMAL, cache, mmap).
+
+Usage (depuis la racine du projet) :
+    python -m benchmarks.bench_concurrency --rows 50000 --readers 4
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import create_db_engine, get_db
+from backend.main import app
+from backend.services.import_service import BankCSVImporter
+from backend.settings import DatabaseSettings, SQLitePragmas
+
+from .data import fresh_database, generate_boursorama_csv
+
+PROFILES = {
+    # Valeurs par défaut de SQLite (timeout 5 s du module sqlite3 conservé)
+    "défaut": SQLitePragmas(journal_mode="DELETE", synchronous="FULL", cache_size=-2000, mmap_size=0, busy_timeout=5000),
+    "optimisé": SQLitePragmas(),
+}
+
+
+def run(profile: str, csv_path: str, readers: int, chunksize: int, per_row: bool = False) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = DatabaseSettings(url=f"sqlite:///{os.path.join(tmp, 'bench.db')}", sqlite=PROFILES[profile])
+        engine, session = fresh_database(engine=create_db_engine(settings))
+        session.close()
+        Session = sessionmaker(bind=engine)
+
+        def _get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = _get_db
+        done = threading.Event()
+        latencies: list[float] = []
+        failures = [0]
+        lock = threading.Lock()
+
+        def reader():
+            client = TestClient(app)
+            params = {"start_date": "2015-01-01", "end_date": "2025-12-31", "limit": 500}
+            while not done.is_set():
+                t0 = time.perf_counter()
+                try:
+                    ok = client.get("/transactions/range", params=params).status_code == 200
+                except Exception:
+                    ok = False
+                elapsed = time.perf_counter() - t0
+                with lock:
+                    if ok:
+                        latencies.append(elapsed)
+                    else:
+                        failures[0] += 1
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        for t in threads:
+            t.start()
+
+        t0 = time.perf_counter()
+        with Session() as session, open(csv_path, "rb") as f:
+            importer = BankCSVImporter(session, account_id=1)
+            if per_row:
+                # Un commit par ligne : le cas le plus défavorable pour le verrou d'écriture
+                importer.import_csv(csv_path)
+            else:
+                importer.import_stream(f, chunksize=chunksize)
+        import_time = time.perf_counter() - t0
+
+        done.set()
+        for t in threads:
+            t.join()
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+    latencies.sort()
+    return {
+        "import_s": import_time,
+        "reads": len(latencies),
+        "failures": failures[0],
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else float("nan"),
+        "max_ms": latencies[-1] * 1000 if latencies else float("nan"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--chunksize", type=int, default=2_000)
+    parser.add_argument("--per-row", action="store_true", help="import ligne par ligne (commit par ligne)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "bench.csv")
+        generate_boursorama_csv(csv_path, args.rows)
+        for profile in PROFILES:
+            r = run(profile, csv_path, args.readers, args.chunksize, args.per_row)
+            print(
+                f"{profile:>9} | import {r['import_s']:6.2f}s | {r['reads']:5d} lectures "
+                f"({r['failures']} échecs) | p50 {r['p50_ms']:7.1f} ms | p95 {r['p95_ms']:7.1f} ms "
+                f"| max {r['max_ms']:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark : import ligne par ligne vs import en masse, par dialecte.
+
+SQLite (fichier temporaire) toujours ; chaque --database-url ajoute une base
+(ex. Postgres, où l'import en masse passe par COPY). Les tables de ces bases
+sont supprimées et recréées à chaque mesure.
+
+Usage (depuis la racine du projet) :
+    python -m benchmarks.bench_import --rows 20000
+    python -m benchmarks.bench_import --rows 100000 --database-url postgresql+psycopg://postgres@localhost/bench
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Optional
+
+from sqlalchemy import create_engine
+
+from backend.models import Base
+from backend.services.import_service import BankCSVImporter
+
+from .data import fresh_database, generate_boursorama_csv
+
+
+def run(csv_path: str, bulk: bool, database_url: Optional[str] = None) -> tuple[float, float]:
+    """Retourne (durée import initial, durée ré-import) sur une base neuve
+    (SQLite temporaire si database_url est None)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        if database_url is None:
+            engine, session = fresh_database(os.path.join(tmp, "bench.db"))
+        else:
+            engine = create_engine(database_url)
+            Base.metadata.drop_all(bind=engine)
+            engine, session = fresh_database(engine=engine)
+        importer = BankCSVImporter(session, account_id=1)
+        try:
+            t0 = time.perf_counter()
+            importer.import_csv(csv_path, bulk=bulk)
+            t1 = time.perf_counter()
+            importer.import_csv(csv_path, bulk=bulk)
+            t2 = time.perf_counter()
+        finally:
+            session.close()
+            engine.dispose()
+    return t1 - t0, t2 - t1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--database-url", action="append", default=[], help="base supplémentaire (répétable)")
+    parser.add_argument("--bulk-only", action="store_true", help="sans l'import ligne par ligne")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "bench.csv")
+        generate_boursorama_csv(csv_path, args.rows)
+
+        modes = (("bulk", True),) if args.bulk_only else (("ligne par ligne", False), ("bulk", True))
+        for database_url in [None, *args.database_url]:
+            dialect = "sqlite" if database_url is None else create_engine(database_url).dialect.name
+            for label, bulk in modes:
+                first, again = run(csv_path, bulk, database_url)
+                print(
+                    f"{dialect:>10} | {label:>16} | {args.rows} lignes | import {first:7.2f}s "
+                    f"({args.rows / first:9.0f} l/s) | ré-import {again:7.2f}s"
+                )
+
+
+if __name__ == "__main__":
+    main()
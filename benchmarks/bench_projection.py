@@ -0,0 +1,111 @@
+"""Benchmark : pages de transactions, objets ORM + dict vs projection Core (RowMapping).
+
+Parcourt toutes les pages de /transactions/range (pagination par clé) sur une
+base de n lignes, par les deux chemins :
+
+    orm   Query(Transaction) + joinedload(category), puis un dict par
+          transaction (ancien _enrich_transactions de main.py)
+    core  crud.get_transactions_by_date_range : SELECT des seules colonnes
+          de la réponse, vues RowMapping validées directement par TransactionResponse
+
+Mesure la lecture seule, puis lecture + sérialisation JSON (TransactionPage).
+
+Usage (depuis la racine du projet) :
+    python -m benchmarks.bench_projection --rows 100000 --page-size 500
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from pydantic import TypeAdapter
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, joinedload
+
+from backend import crud
+from backend.models import Transaction
+from backend.schemas import TransactionPage
+
+from .data import fresh_database, seed_transactions
+
+START, END = datetime(2000, 1, 1), datetime(2100, 1, 1)
+PAGE = TypeAdapter(TransactionPage)
+
+
+def _orm_page(db: Session, limit: int, cursor):
+    query = (
+        db.query(Transaction)
+        .options(joinedload(Transaction.category))
+        .filter(Transaction.date >= START, Transaction.date <= END)
+    )
+    if cursor:
+        cursor_date, cursor_id = crud.decode_cursor(cursor)
+        query = query.filter(or_(
+            Transaction.date < cursor_date,
+            and_(Transaction.date == cursor_date, Transaction.id < cursor_id),
+        ))
+    txns = query.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(limit + 1).all()
+    next_cursor = crud.encode_cursor(txns[limit - 1]) if len(txns) > limit else None
+    items = [
+        {
+            "id": t.id, "account_id": t.account_id, "category_id": t.category_id,
+            "transaction_type": t.transaction_type, "amount": t.amount, "amount_cents": t.amount_cents,
+            "description": t.description, "date": t.date, "merchant": t.merchant, "notes": t.notes,
+            "category_parent_csv": t.category_parent_csv, "created_at": t.created_at,
+            "category_name": t.category.name if t.category else None,
+            "parent_category": t.category.parent_category if t.category else None,
+            "sub_category": t.category.sub_category if t.category else None,
+        }
+        for t in txns[:limit]
+    ]
+    return items, next_cursor
+
+
+def _core_page(db: Session, limit: int, cursor):
+    return crud.get_transactions_by_date_range(db, START, END, limit=limit, cursor=cursor)
+
+
+PATHS = {"orm": _orm_page, "core": _core_page}
+
+
+def walk(db: Session, fetch_page, limit: int, serialize: bool) -> tuple[float, int]:
+    """Retourne (durée, lignes) pour le parcours complet ; session vidée entre les pages
+    comme entre deux requêtes HTTP"""
+    rows, cursor = 0, None
+    t0 = time.perf_counter()
+    while True:
+        items, cursor = fetch_page(db, limit, cursor)
+        if serialize:
+            PAGE.dump_json(PAGE.validate_python({"items": items, "next_cursor": cursor}))
+        rows += len(items)
+        db.expunge_all()
+        if cursor is None:
+            break
+    return time.perf_counter() - t0, rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=crud.MAX_PAGE_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, session = fresh_database(os.path.join(tmp, "bench.db"))
+        seed_transactions(session, args.rows)
+        try:
+            for serialize in (False, True):
+                for name, fetch_page in PATHS.items():
+                    walk(session, fetch_page, args.page_size, serialize)  # cache de pages SQLite chaud
+                    elapsed, rows = walk(session, fetch_page, args.page_size, serialize)
+                    phase = "lecture + JSON" if serialize else "lecture"
+                    print(f"{name:>4} | {phase:<14} | {rows} lignes | {elapsed:6.2f}s ({rows / elapsed:9.0f} l/s)")
+        finally:
+            session.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark : démarrage à froid d'un worker de l'API.
+
+Mesure, dans des processus neufs :
+    import      durée de `import backend.main` (python -X importtime), modules
+                les plus coûteux, pandas / NumPy chargés ou non
+    démarrage   temps jusqu'à la première réponse de uvicorn (GET /) et RSS
+                du worker, sur base neuve (création + migrations) puis sur
+                base déjà à jour (création du schéma sautée)
+
+Usage (depuis la racine du projet) :
+    python -m benchmarks.bench_startup --runs 3
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("pandas", "numpy")
+
+IMPORT_SNIPPET = (
+    "import sys, backend.main; "
+    f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+
+
+def _env(db_path: str) -> dict:
+    return {**os.environ, "FINANCE_DATABASE_URL": f"sqlite:///{db_path}", "PYTHONPATH": ROOT}
+
+
+def measure_import(db_path: str, top: int) -> tuple[float, list[tuple[str, float]], str]:
+    """(durée totale en ms, imports directs les plus coûteux en ms cumulées, modules lourds chargés)"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET],
+        cwd=ROOT, env=_env(db_path), capture_output=True, text=True, check=True,
+    )
+    # importtime écrit les enfants avant leur parent, indentés de 2 espaces par niveau
+    children: list[tuple[str, float]] = []
+    total, heaviest = float("nan"), []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, raw = line[len("import time:"):].split("|")
+        if not cum.strip().isdigit():
+            continue
+        depth = (len(raw) - len(raw.lstrip()) - 1) // 2
+        if depth == 1:
+            children.append((raw.strip(), int(cum) / 1000))
+        elif depth == 0:
+            if raw.strip() == "backend.main":
+                total = int(cum) / 1000
+                heaviest = sorted(children, key=lambda item: item[1], reverse=True)[:top]
+            children = []
+    return total, heaviest, proc.stdout.strip() or "aucun"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_mb(pid: int) -> float:
+    """RSS du processus (Linux : /proc), nan ailleurs"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+def measure_boot(db_path: str, timeout: float = 30.0) -> tuple[float, float]:
+    """(ms jusqu'à la première réponse 200 sur GET /, RSS du worker en Mo)"""
+    port = _free_port()
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=_env(db_path), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as resp:
+                    if resp.status == 200:
+                        break
+            except OSError:
+                if proc.poll() is not None or time.perf_counter() - t0 > timeout:
+                    raise RuntimeError("le serveur n'a pas démarré")
+                time.sleep(0.005)
+        elapsed = (time.perf_counter() - t0) * 1000
+        return elapsed, _rss_mb(proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8, help="imports directs de backend.main les plus coûteux affichés")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "finance.db")
+        imports = [measure_import(db_path, args.top) for _ in range(args.runs)]
+        _, heaviest, loaded = imports[-1]
+        print(f"import backend.main : {statistics.median(i[0] for i in imports):7.1f} ms (médiane) "
+              f"| chargés : {loaded}")
+        for name, ms in heaviest:
+            print(f"    {name:<32} {ms:7.1f} ms")
+
+        for label in ("base neuve", "base à jour"):
+            runs = []
+            for _ in range(args.runs):
+                if label == "base neuve" and os.path.exists(db_path):
+                    os.remove(db_path)
+                runs.append(measure_boot(db_path))
+            print(
+                f"{label:>12} | première réponse {statistics.median(r[0] for r in runs):7.1f} ms "
+                f"| RSS worker {statistics.median(r[1] for r in runs):6.1f} Mo"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Compare deux rapports de benchmarks.suite (médianes, mesure par mesure).
+
+Usage (depuis la racine du projet) :
+    python -m benchmarks.compare avant.json apres.json --threshold 1.2
+
+Code de sortie 1 si une mesure ralentit au-delà du seuil (ratio après / avant).
+"""
+
+import argparse
+import json
+import sys
+
+
+def _key(result: dict) -> tuple:
+    return result["name"], result["rows"], json.dumps(result.get("params", {}), sort_keys=True)
+
+
+def compare(before: dict, after: dict, threshold: float) -> list[tuple]:
+    """Liste (clé, médiane avant, médiane après, ratio, régression) des mesures communes"""
+    previous = {_key(r): r for r in before["results"]}
+    rows = []
+    for result in after["results"]:
+        old = previous.get(_key(result))
+        if old is None or not old["median_s"]:
+            continue
+        ratio = result["median_s"] / old["median_s"]
+        rows.append((_key(result), old["median_s"], result["median_s"], ratio, ratio > threshold))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args()
+
+    with open(args.before, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(args.after, encoding="utf-8") as f:
+        after = json.load(f)
+
+    print(f"{before['environment'].get('commit')} -> {after['environment'].get('commit')}")
+    rows = compare(before, after, args.threshold)
+    for (name, n_rows, params), old, new, ratio, regression in rows:
+        flag = "  RÉGRESSION" if regression else ""
+        print(f"{name:<24} {n_rows:>9} {params:<16} {old * 1000:10.1f} ms -> {new * 1000:10.1f} ms  x{ratio:5.2f}{flag}")
+    sys.exit(1 if any(r[-1] for r in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Données synthétiques et bases jetables partagées par les benchmarks."""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.models import Base, Account, CategorizationRule, Category, Transaction, TransactionType
+
+LABELS = np.array([
+    "CARREFOUR MARKET", "LECLERC DRIVE", "UBER TRIP", "SNCF VOYAGES", "NETFLIX.COM",
+    "BOULANGERIE PAUL", "PHARMACIE CENTRALE", "EDF PARTICULIERS", "VIR SALAIRE", "CAFE DU COIN",
+])
+CATEGORIES = np.array(["Alimentation", "Carburant", "Restaurant", "Virements", "Divers"])
+SUPPLIERS = np.array(["carrefour", "uber", "", "sncf"])
+
+# Étendue des dates générées : 10 ans à partir du 1er janvier 2015
+START_DATE = np.datetime64("2015-01-01")
+SPAN_DAYS = 3650
+
+
+def generate_boursorama_csv(path: str, n_rows: int, seed: int = 42) -> None:
+    """Écrit un CSV Boursorama synthétique de n_rows lignes (vectorisé : 1M lignes en quelques secondes)."""
+    rng = np.random.default_rng(seed)
+    dates = (START_DATE + np.arange(n_rows) * SPAN_DAYS // max(n_rows, 1)).astype(str)
+    signs = rng.choice([-1, -1, -1, 1], size=n_rows)
+    amounts = signs * rng.integers(100, 250_000, size=n_rows) / 100
+    labels = pd.Series(LABELS[rng.integers(0, len(LABELS), size=n_rows)])
+    suffixes = pd.Series(rng.integers(1, 1000, size=n_rows)).astype(str)
+    pd.DataFrame({
+        "dateOp": dates,
+        "dateVal": dates,
+        "label": labels + " " + suffixes,
+        "category": CATEGORIES[rng.integers(0, len(CATEGORIES), size=n_rows)],
+        "categoryParent": "Vie quotidienne",
+        "supplierFound": SUPPLIERS[rng.integers(0, len(SUPPLIERS), size=n_rows)],
+        "amount": pd.Series(amounts).map("{:.2f}".format).str.replace(".", ",", regex=False),
+    }).to_csv(path, sep=";", index=False, encoding="utf-8-sig")
+
+
+def fresh_database(db_path: Optional[str] = None, engine: Optional[Engine] = None) -> tuple[Engine, Session]:
+    """Base neuve (schéma complet + compte id=1) : fichier SQLite db_path ou moteur fourni.
+    Retourne (engine, session)."""
+    if engine is None:
+        engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Account(id=1, name="Bench", account_type="checking"))
+    session.commit()
+    return engine, session
+
+
+def seed_rules(session: Session, n_rules: int, seed: int = 42) -> None:
+    """Crée n_rules règles actives : des mots-clés sans correspondance d'abord, puis
+    une règle par libellé connu (le cas le plus coûteux pour un parcours linéaire)."""
+    rng = np.random.default_rng(seed)
+    category = Category(name="Bench", parent_category="Bench", sub_category="Bench")
+    session.add(category)
+    session.flush()
+    matching = [label.split()[0].lower() for label in LABELS][:n_rules]
+    keywords = [
+        "kw" + "".join(rng.choice(list("abcdefghijklmnopqrstuvwxyz"), size=8))
+        for _ in range(n_rules - len(matching))
+    ] + matching
+    session.add_all([
+        CategorizationRule(keyword=kw, category_id=category.id, match_field="merchant" if i % 2 else "description")
+        for i, kw in enumerate(keywords)
+    ])
+    session.commit()
+
+
+def seed_transactions(session: Session, n_rows: int, seed: int = 42) -> None:
+    """Insère n_rows transactions sur le compte 1 (la moitié catégorisées), sans passer par l'import.
+    L'agrégat mensuel n'est pas tenu à jour : réservé aux benchmarks de lecture."""
+    rng = np.random.default_rng(seed)
+    categories = [Category(name=f"Bench {i}", parent_category="Bench", sub_category=f"Sous {i}") for i in range(5)]
+    session.add_all(categories)
+    session.flush()
+    category_ids = [None] * len(categories) + [c.id for c in categories]
+    days = (START_DATE + np.arange(n_rows) * SPAN_DAYS // max(n_rows, 1)).astype("datetime64[s]").tolist()
+    cents = (rng.choice([-1, -1, -1, 1], size=n_rows) * rng.integers(100, 250_000, size=n_rows)).tolist()
+    labels = LABELS[rng.integers(0, len(LABELS), size=n_rows)].tolist()
+    picks = rng.integers(0, len(category_ids), size=n_rows).tolist()
+    rows = [
+        {
+            "account_id": 1,
+            "transaction_type": TransactionType.CREDIT if c > 0 else TransactionType.DEBIT,
+            "amount_cents": c,
+            "description": label,
+            "date": day,
+            "category_id": category_ids[pick],
+        }
+        for day, c, label, pick in zip(days, cents, labels, picks)
+    ]
+    for start in range(0, n_rows, 5000):
+        session.execute(insert(Transaction), rows[start:start + 5000])
+    session.commit()
@@ -0,0 +1,206 @@
+"""Suite de benchmarks : import, ré-import, règles de catégorisation et endpoints de lecture.
+
+Pour chaque taille de CSV synthétique, sur une base SQLite neuve :
+  - parsing seul (fichier entier et par morceaux), ramené aussi à 100k lignes ;
+  - import_csv (bulk) puis ré-import du même fichier (100 % de doublons) ;
+  - application des règles à 10 / 100 / 1000 règles (aperçu dry_run et écriture) ;
+  - endpoints de lecture via TestClient, cache de réponses vidé avant chaque appel.
+
+Les résultats (médiane et min de chaque mesure, métadonnées de l'environnement
+et du commit) sont écrits en JSON ; benchmarks.compare compare deux fichiers.
+
+Usage (depuis la racine du projet) :
+    python -m benchmarks.suite --sizes 1000,100000 --output bench-$(git rev-parse --short HEAD).json
+    python -m benchmarks.suite --sizes 1000000 --rules 10 --repeat 1
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import pandas as pd
+import sqlalchemy
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, update
+from sqlalchemy.orm import sessionmaker
+
+from backend import crud
+from backend.database import get_db
+from backend.main import app, response_cache
+from backend.models import CategorizationRule, Category, Transaction
+from backend.services.import_service import BankCSVImporter
+from backend.services.parsers import get_parser
+from backend.services.rollup import rebuild_rollup
+
+from .data import fresh_database, generate_boursorama_csv, seed_rules
+
+SIZES = (1_000, 100_000, 1_000_000)
+RULE_COUNTS = (10, 100, 1000)
+
+# Lectures mesurées : (nom, chemin, paramètres). Les dates couvrent les 10 ans générés.
+FULL_RANGE = {"start_date": "2015-01-01", "end_date": "2024-12-31"}
+READ_ENDPOINTS = [
+    ("range_first_page", "/transactions/range", {**FULL_RANGE, "limit": 500}),
+    ("range_one_month", "/transactions/range", {"start_date": "2020-03-01", "end_date": "2020-03-31"}),
+    ("range_category_detail", "/transactions/range", {
+        **FULL_RANGE, "transaction_type": "debit", "parent_category": "Non catégorisé", "limit": 100,
+    }),
+    ("budget_summary_year", "/budget/summary", {"start_date": "2020-01-01", "end_date": "2020-12-31"}),
+    ("budget_summary_all", "/budget/summary", FULL_RANGE),
+    ("cashflow_all", "/cashflow", {"start_month": "2015-01", "end_month": "2024-12"}),
+    ("search_word", "/transactions/search", {"q": "carrefour", "limit": 100}),
+    # Store colonnaire NumPy (chargé à l'échauffement, gardé tant que les données ne changent pas)
+    ("account_totals_by_month", "/accounts/1/totals", {"group_by": "month"}),
+]
+
+
+def _measure(fn: Callable[[], object], repeat: int) -> list[float]:
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return runs
+
+
+def _result(name: str, rows: int, runs: list[float], **params) -> dict:
+    result = {
+        "name": name,
+        "rows": rows,
+        "params": params,
+        "runs_s": [round(r, 6) for r in runs],
+        "median_s": round(statistics.median(runs), 6),
+        "min_s": round(min(runs), 6),
+    }
+    print(f"  {name:<24} {rows:>9} lignes {json.dumps(params) if params else '':<28} "
+          f"médiane {result['median_s'] * 1000:10.1f} ms")
+    return result
+
+
+def _reset_categorization(session) -> None:
+    """Remet toutes les transactions sans catégorie et supprime les règles de bench"""
+    session.execute(update(Transaction).values(category_id=None))
+    session.execute(delete(CategorizationRule))
+    session.execute(delete(Category).where(Category.name == "Bench"))
+    rebuild_rollup(session)
+    session.commit()
+
+
+def bench_size(n_rows: int, rule_counts: tuple[int, ...], repeat: int, tmp: str) -> list[dict]:
+    """Toutes les mesures pour un CSV de n_rows lignes, sur une base neuve"""
+    results = []
+    csv_path = os.path.join(tmp, f"bench_{n_rows}.csv")
+    generate_boursorama_csv(csv_path, n_rows)
+    parser = get_parser("boursorama")
+    for name, parse in (
+        ("parse", lambda: parser.parse(csv_path)),
+        ("parse_chunks", lambda: sum(len(chunk) for chunk in parser.iter_chunks(csv_path))),
+    ):
+        result = _result(name, n_rows, _measure(parse, repeat), engine=parser.engine if name == "parse" else "c")
+        result["per_100k_s"] = round(result["median_s"] * 100_000 / n_rows, 6)
+        results.append(result)
+
+    engine, session = fresh_database(os.path.join(tmp, f"bench_{n_rows}.db"))
+    try:
+        importer = BankCSVImporter(session, account_id=1)
+        # L'import ne se répète pas sur la même base : une seule mesure
+        results.append(_result("import", n_rows, _measure(lambda: importer.import_csv(csv_path, bulk=True), 1)))
+        results.append(_result("reimport", n_rows, _measure(lambda: importer.import_csv(csv_path, bulk=True), repeat)))
+
+        for n_rules in rule_counts:
+            _reset_categorization(session)
+            seed_rules(session, n_rules)
+            results.append(_result(
+                "apply_rules_dry_run", n_rows,
+                _measure(lambda: crud.apply_rules_in_batches(session, dry_run=True), repeat),
+                rules=n_rules,
+            ))
+            results.append(_result(
+                "apply_rules", n_rows, _measure(lambda: crud.apply_rules_to_uncategorized(session), 1),
+                rules=n_rules,
+            ))
+
+        Session = sessionmaker(bind=engine)
+
+        def _get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = _get_db
+        client = TestClient(app)
+        try:
+            for name, path, params in READ_ENDPOINTS:
+                def _call():
+                    response_cache.clear()
+                    assert client.get(path, params=params).status_code == 200
+                _call()  # échauffement (cache de pages SQLite, compilation des requêtes)
+                results.append(_result(name, n_rows, _measure(_call, repeat)))
+        finally:
+            app.dependency_overrides.clear()
+    finally:
+        session.close()
+        engine.dispose()
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True)
+        return rev.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    return {
+        "commit": _git_revision(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sqlite": sqlite3.sqlite_version,
+        "sqlalchemy": sqlalchemy.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def run_suite(sizes=SIZES, rule_counts=RULE_COUNTS, repeat: int = 3) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in sizes:
+            print(f"{n_rows} lignes")
+            results.extend(bench_size(n_rows, tuple(rule_counts), repeat, tmp))
+    return {"environment": environment(), "results": results}
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=_int_list, default=list(SIZES))
+    parser.add_argument("--rules", type=_int_list, default=list(RULE_COUNTS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark-results.json")
+    args = parser.parse_args()
+
+    report = run_suite(args.sizes, args.rules, args.repeat)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
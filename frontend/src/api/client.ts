@@ -1,21 +1,58 @@
 import axios from 'axios';
-import type { Transaction, Category, Account, ImportStats, CategorizationRule } from '../types';
+import type {
+  Transaction, TransactionPage, Category, Account, AccountTotals, ImportJob, CategorizationRule, BudgetSummary, CashflowMonth,
+  BulkCategoryUpdate, BulkCategoryUpdateResult, RulePayload, RulesApplyResult, RulePreview,
+} from '../types';
 
 const api = axios.create({
   baseURL: '/api',
 });
 
+export interface RangeFilters {
+  transaction_type?: 'debit' | 'credit';
+  parent_category?: string;
+  sub_category?: string;
+  exclude_internal?: boolean;
+  limit?: number;
+  cursor?: string;
+}
+
 export async function getTransactionsByRange(
+  startDate: string,
+  endDate: string,
+  accountId?: number,
+  filters: RangeFilters = {}
+): Promise<TransactionPage> {
+  const params: Record<string, string | number | boolean> = {
+    start_date: startDate,
+    end_date: endDate,
+    ...filters,
+  };
+  if (accountId) params.account_id = accountId;
+  const { data } = await api.get<TransactionPage>('/transactions/range', { params });
+  return data;
+}
+
+// Recherche plein texte : mots en ET, "phrase exacte", préfixe*
+export async function searchTransactions(
+  q: string,
+  filters: { start_date?: string; end_date?: string; account_id?: number; limit?: number; cursor?: string } = {}
+): Promise<TransactionPage> {
+  const { data } = await api.get<TransactionPage>('/transactions/search', { params: { q, ...filters } });
+  return data;
+}
+
+export async function getBudgetSummary(
   startDate: string,
   endDate: string,
   accountId?: number
-): Promise<Transaction[]> {
+): Promise<BudgetSummary> {
   const params: Record<string, string | number> = {
     start_date: startDate,
     end_date: endDate,
   };
   if (accountId) params.account_id = accountId;
-  const { data } = await api.get<Transaction[]>('/transactions/range', { params });
+  const { data } = await api.get<BudgetSummary>('/budget/summary', { params });
   return data;
 }
 
@@ -29,6 +66,28 @@ export async function updateTransactionCategory(
   return data;
 }
 
+// Re-catégorisation en lot (liste ou filtre), règle optionnelle, un seul commit côté serveur
+export async function recategorizeTransactions(
+  payload: BulkCategoryUpdate
+): Promise<BulkCategoryUpdateResult> {
+  const { data } = await api.patch<BulkCategoryUpdateResult>('/transactions/category', payload);
+  return data;
+}
+
+export async function getCashflow(
+  startMonth: string,
+  endMonth: string,
+  accountId?: number
+): Promise<CashflowMonth[]> {
+  const params: Record<string, string | number> = {
+    start_month: startMonth,
+    end_month: endMonth,
+  };
+  if (accountId) params.account_id = accountId;
+  const { data } = await api.get<CashflowMonth[]>('/cashflow', { params });
+  return data;
+}
+
 export async function getCategories(): Promise<Category[]> {
   const { data } = await api.get<Category[]>('/categories');
   return data;
@@ -48,11 +107,46 @@ export async function getAccounts(): Promise<Account[]> {
   return data;
 }
 
-export async function uploadCSV(file: File, accountId: number = 1): Promise<ImportStats> {
+export async function getAccountTotals(
+  accountId: number,
+  params: { start_date?: string; end_date?: string; group_by?: 'category' | 'month' } = {},
+): Promise<AccountTotals> {
+  const { data } = await api.get<AccountTotals>(`/accounts/${accountId}/totals`, { params });
+  return data;
+}
+
+export async function getImportFormats(): Promise<string[]> {
+  const { data } = await api.get<string[]>('/import/formats');
+  return data;
+}
+
+export async function uploadCSV(file: File, accountId: number = 1, bankType: string = 'boursorama'): Promise<ImportJob> {
   const form = new FormData();
   form.append('file', file);
-  form.append('account_id', String(accountId));
-  const { data } = await api.post<ImportStats>('/upload', form);
+  const { data } = await api.post<ImportJob>('/upload', form, {
+    params: { account_id: accountId, bank_type: bankType },
+  });
+  return data;
+}
+
+// Plusieurs CSV (ou zip) ; accounts : nom de fichier -> compte, les autres vont sur defaultAccountId
+export async function uploadBatch(
+  files: File[],
+  accounts: Record<string, number> = {},
+  defaultAccountId: number = 1,
+  bankType: string = 'boursorama',
+): Promise<ImportJob> {
+  const form = new FormData();
+  files.forEach((file) => form.append('files', file));
+  form.append('accounts', JSON.stringify(accounts));
+  form.append('account_id', String(defaultAccountId));
+  form.append('bank_type', bankType);
+  const { data } = await api.post<ImportJob>('/upload/batch', form);
+  return data;
+}
+
+export async function getImportJob(jobId: string): Promise<ImportJob> {
+  const { data } = await api.get<ImportJob>(`/imports/${jobId}`);
   return data;
 }
 
@@ -61,16 +155,29 @@ export async function getRules(): Promise<CategorizationRule[]> {
   return data;
 }
 
-export async function createRule(payload: {
-  keyword: string;
-  category_id: number;
-  match_field: string;
-}): Promise<CategorizationRule> {
+export async function createRule(payload: RulePayload): Promise<CategorizationRule> {
   const { data } = await api.post<CategorizationRule>('/rules', payload);
   return data;
 }
 
-export async function applyRules(): Promise<{ updated: number }> {
-  const { data } = await api.post<{ updated: number }>('/rules/apply');
+export async function previewRule(
+  keyword: string,
+  matchField: string
+): Promise<RulePreview> {
+  const { data } = await api.get<RulePreview>('/rules/preview', {
+    params: { keyword, match_field: matchField },
+  });
+  return data;
+}
+
+// dryRun : aperçu des correspondances par règle, sans écriture
+export async function applyRules(
+  dryRun = false,
+  candidateRules: RulePayload[] = []
+): Promise<RulesApplyResult> {
+  const { data } = await api.post<RulesApplyResult>('/rules/apply', {
+    dry_run: dryRun,
+    candidate_rules: candidateRules,
+  });
   return data;
 }
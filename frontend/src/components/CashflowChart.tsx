@@ -2,7 +2,7 @@ import { useMemo } from 'react';
 import {
   BarChart, Bar, XAxis, YAxis, Tooltip, ResponsiveContainer, CartesianGrid, Legend,
 } from 'recharts';
-import type { Transaction } from '../types';
+import type { CashflowMonth } from '../types';
 
 const CATEGORY_COLORS: Record<string, string> = {
   BesoinsEssentiels: '#6366f1',
@@ -18,29 +18,20 @@ const CATEGORY_COLORS: Record<string, string> = {
 };
 
 interface Props {
-  transactions: Transaction[];
+  months: CashflowMonth[];
 }
 
-export default function CashflowChart({ transactions }: Props) {
-  const data = useMemo(() => {
-    const grouped: Record<string, Record<string, number>> = {};
-
-    transactions.forEach((t) => {
-      const month = t.date.slice(0, 7); // YYYY-MM
-      if (!grouped[month]) grouped[month] = { Revenus: 0 };
-
-      if (t.transaction_type === 'credit') {
-        grouped[month].Revenus = (grouped[month].Revenus || 0) + Math.abs(t.amount);
-      } else {
-        const cat = t.parent_category || 'Autres';
-        grouped[month][cat] = (grouped[month][cat] || 0) + Math.abs(t.amount);
-      }
-    });
-
-    return Object.entries(grouped)
-      .sort(([a], [b]) => a.localeCompare(b))
-      .map(([month, vals]) => ({ month, ...vals }));
-  }, [transactions]);
+// Agrégats mensuels calculés côté serveur (GET /cashflow)
+export default function CashflowChart({ months }: Props) {
+  const data = useMemo(
+    () =>
+      months.map((m) => ({
+        month: m.month,
+        Revenus: m.income,
+        ...m.expenses_by_parent,
+      })),
+    [months]
+  );
 
   const expenseKeys = useMemo(() => {
     const keys = new Set<string>();
@@ -1,6 +1,10 @@
-import { useState } from 'react';
+import { useState, useEffect } from 'react';
 import type { Transaction, CategoryTree } from '../types';
 import { CATEGORY_COLORS } from '../constants/colors';
+import { getTransactionsByRange } from '../api/client';
+import type { RangeFilters } from '../api/client';
+
+const PAGE_SIZE = 100;
 
 function fmt(n: number): string {
   return Math.abs(n).toLocaleString('fr-FR', { minimumFractionDigits: 0, maximumFractionDigits: 2 }) + ' €';
@@ -8,12 +12,64 @@ function fmt(n: number): string {
 
 interface Props {
   tree: CategoryTree;
+  startDate: string;
+  endDate: string;
+  transactionType: 'debit' | 'credit';
+  version: number;
   onRecategorize: (txn: Transaction) => void;
 }
 
-export default function CategoryAccordion({ tree, onRecategorize }: Props) {
+export default function CategoryAccordion({ tree, startDate, endDate, transactionType, version, onRecategorize }: Props) {
   const [openParent, setOpenParent] = useState<string | null>(null);
   const [openSub, setOpenSub] = useState<string | null>(null);
+  const [details, setDetails] = useState<Transaction[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingDetails, setLoadingDetails] = useState(false);
+
+  const detailFilters = (): RangeFilters | null => {
+    if (!openParent || !openSub?.startsWith(`${openParent}/`)) return null;
+    return {
+      transaction_type: transactionType,
+      parent_category: openParent,
+      sub_category: openSub.slice(openParent.length + 1),
+      exclude_internal: true,
+      limit: PAGE_SIZE,
+    };
+  };
+
+  // Détail chargé à l'ouverture d'une sous-catégorie uniquement
+  useEffect(() => {
+    const filters = detailFilters();
+    if (!filters) return;
+    let cancelled = false;
+    setLoadingDetails(true);
+    getTransactionsByRange(startDate, endDate, undefined, filters)
+      .then((page) => {
+        if (cancelled) return;
+        setDetails(page.items);
+        setNextCursor(page.next_cursor);
+      })
+      .catch((err) => console.error('Erreur chargement détail:', err))
+      .finally(() => {
+        if (!cancelled) setLoadingDetails(false);
+      });
+    return () => {
+      cancelled = true;
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [openParent, openSub, startDate, endDate, transactionType, version]);
+
+  const loadMore = async () => {
+    const filters = detailFilters();
+    if (!filters || !nextCursor) return;
+    try {
+      const page = await getTransactionsByRange(startDate, endDate, undefined, { ...filters, cursor: nextCursor });
+      setDetails((prev) => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      console.error('Erreur chargement détail:', err);
+    }
+  };
 
   const sorted = Object.entries(tree).sort(([, a], [, b]) => Math.abs(b.total) - Math.abs(a.total));
 
@@ -48,7 +104,7 @@ export default function CategoryAccordion({ tree, onRecategorize }: Props) {
               <div className="border-t border-border-card">
                 {Object.entries(subs)
                   .sort(([, a], [, b]) => Math.abs(b.total) - Math.abs(a.total))
-                  .map(([sub, { total: subTotal, transactions }]) => {
+                  .map(([sub, { total: subTotal, count }]) => {
                     const subKey = `${parent}/${sub}`;
                     const subIsOpen = openSub === subKey;
 
@@ -61,7 +117,7 @@ export default function CategoryAccordion({ tree, onRecategorize }: Props) {
                           <div className="flex items-center gap-2">
                             <span className="text-sm text-text-secondary">{sub}</span>
                             <span className="text-xs text-text-secondary/60">
-                              ({transactions.length})
+                              ({count})
                             </span>
                           </div>
                           <div className="flex items-center gap-3">
@@ -74,8 +130,10 @@ export default function CategoryAccordion({ tree, onRecategorize }: Props) {
 
                         {subIsOpen && (
                           <div className="bg-bg-primary/50">
-                            {transactions
-                              .sort((a, b) => new Date(b.date).getTime() - new Date(a.date).getTime())
+                            {loadingDetails && (
+                              <div className="px-5 py-2.5 pl-20 text-xs text-text-secondary">Chargement…</div>
+                            )}
+                            {!loadingDetails && details
                               .map((txn) => (
                                 <div
                                   key={txn.id}
@@ -112,6 +170,14 @@ export default function CategoryAccordion({ tree, onRecategorize }: Props) {
                                   </div>
                                 </div>
                               ))}
+                            {!loadingDetails && nextCursor && (
+                              <button
+                                onClick={loadMore}
+                                className="w-full px-5 py-2.5 pl-20 text-left text-xs text-accent hover:bg-white/3 border-t border-border-card/50"
+                              >
+                                Voir plus
+                              </button>
+                            )}
                           </div>
                         )}
                       </div>
@@ -1,6 +1,6 @@
-import { useState, useMemo } from 'react';
+import { useState, useMemo, useEffect } from 'react';
 import type { Transaction, Category } from '../types';
-import { updateTransactionCategory, createCategory, createRule } from '../api/client';
+import { recategorizeTransactions, createCategory, previewRule } from '../api/client';
 
 interface Props {
   transaction: Transaction;
@@ -19,6 +19,25 @@ export default function RecatModal({ transaction, categories, onClose, onDone }:
   const [newCatParent, setNewCatParent] = useState('');
   const [newCatSub, setNewCatSub] = useState('');
   const [loading, setLoading] = useState(false);
+  const [ruleMatches, setRuleMatches] = useState<number | null>(null);
+
+  // Aperçu (index plein texte) des transactions que la règle toucherait
+  useEffect(() => {
+    if (!wantRule || !ruleKeyword.trim()) {
+      setRuleMatches(null);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      previewRule(ruleKeyword, ruleMatchField)
+        .then((preview) => { if (!cancelled) setRuleMatches(preview.matches); })
+        .catch(() => { if (!cancelled) setRuleMatches(null); });
+    }, 300);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [wantRule, ruleKeyword, ruleMatchField]);
 
   const grouped = useMemo(() => {
     const map: Record<string, Record<string, Category[]>> = {};
@@ -53,15 +72,13 @@ export default function RecatModal({ transaction, categories, onClose, onDone }:
       }
 
       if (catId) {
-        await updateTransactionCategory(transaction.id, catId);
-
-        if (wantRule && ruleKeyword) {
-          await createRule({
-            keyword: ruleKeyword,
-            category_id: catId,
-            match_field: ruleMatchField,
-          });
-        }
+        // Transaction et règle éventuelle écrites dans le même appel
+        await recategorizeTransactions({
+          items: [{ id: transaction.id, category_id: catId }],
+          create_rule: wantRule && ruleKeyword
+            ? { keyword: ruleKeyword, category_id: catId, match_field: ruleMatchField }
+            : undefined,
+        });
       }
 
       onDone();
@@ -206,6 +223,11 @@ export default function RecatModal({ transaction, categories, onClose, onDone }:
                   <option value="merchant">Commerçant</option>
                 </select>
               </div>
+              {ruleMatches !== null && (
+                <p className="text-xs text-text-secondary">
+                  Cette règle correspond à {ruleMatches} transaction(s)
+                </p>
+              )}
             </div>
           )}
         </div>
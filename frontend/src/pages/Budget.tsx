@@ -1,12 +1,12 @@
-import { useState, useEffect, useCallback, useMemo } from 'react';
+import { useState, useEffect, useCallback } from 'react';
 import DateRangePicker from '../components/DateRangePicker';
 import SummaryCards from '../components/SummaryCards';
 import DistributionDonut from '../components/DistributionDonut';
 import CategoryAccordion from '../components/CategoryAccordion';
 import RecatModal from '../components/RecatModal';
-import { getTransactionsByRange, getCategories } from '../api/client';
+import { getBudgetSummary, getCategories } from '../api/client';
 import type { ViewMode } from '../components/SummaryCards';
-import type { Transaction, Category, CategoryTree } from '../types';
+import type { Transaction, Category, BudgetSummary } from '../types';
 
 function startOfMonth(d: Date): string {
   return new Date(d.getFullYear(), d.getMonth(), 1).toISOString().slice(0, 10);
@@ -16,45 +16,25 @@ function endOfMonth(d: Date): string {
   return new Date(d.getFullYear(), d.getMonth() + 1, 0).toISOString().slice(0, 10);
 }
 
-const INTERNAL_FILTERS = ['Mouvements internes débiteurs', 'Mouvements internes créditeurs'];
-
-function isInternalTransfer(t: Transaction): boolean {
-  return INTERNAL_FILTERS.includes(t.category_parent_csv || '');
-}
-
-function buildTree(transactions: Transaction[], type: 'debit' | 'credit'): CategoryTree {
-  const tree: CategoryTree = {};
-  transactions.forEach((t) => {
-    if (t.transaction_type !== type || isInternalTransfer(t)) return;
-    const parent = t.parent_category || 'Non catégorisé';
-    const sub = t.sub_category || 'Non catégorisé';
-    if (!tree[parent]) tree[parent] = { total: 0, subs: {} };
-    if (!tree[parent].subs[sub]) tree[parent].subs[sub] = { total: 0, transactions: [] };
-    tree[parent].total += Math.abs(t.amount);
-    tree[parent].subs[sub].total += Math.abs(t.amount);
-    tree[parent].subs[sub].transactions.push(t);
-  });
-  return tree;
-}
-
 export default function Budget() {
   const now = new Date();
   const [startDate, setStartDate] = useState(startOfMonth(now));
   const [endDate, setEndDate] = useState(endOfMonth(now));
-  const [transactions, setTransactions] = useState<Transaction[]>([]);
+  const [summary, setSummary] = useState<BudgetSummary | null>(null);
   const [categories, setCategories] = useState<Category[]>([]);
   const [recatTxn, setRecatTxn] = useState<Transaction | null>(null);
   const [loading, setLoading] = useState(false);
   const [viewMode, setViewMode] = useState<ViewMode>('depenses');
+  const [version, setVersion] = useState(0);
 
   const fetchData = useCallback(async () => {
     setLoading(true);
     try {
-      const [txns, cats] = await Promise.all([
-        getTransactionsByRange(startDate, endDate),
+      const [sum, cats] = await Promise.all([
+        getBudgetSummary(startDate, endDate),
         getCategories(),
       ]);
-      setTransactions(txns);
+      setSummary(sum);
       setCategories(cats);
     } catch (err) {
       console.error('Erreur chargement:', err);
@@ -67,23 +47,10 @@ export default function Budget() {
     fetchData();
   }, [fetchData]);
 
-  const filtered = useMemo(
-    () => transactions.filter((t) => !isInternalTransfer(t)),
-    [transactions]
-  );
-
-  const income = useMemo(
-    () => filtered.filter((t) => t.transaction_type === 'credit').reduce((s, t) => s + Math.abs(t.amount), 0),
-    [filtered]
-  );
-
-  const expenses = useMemo(
-    () => filtered.filter((t) => t.transaction_type === 'debit').reduce((s, t) => s + Math.abs(t.amount), 0),
-    [filtered]
-  );
-
-  const expenseTree = useMemo(() => buildTree(transactions, 'debit'), [transactions]);
-  const incomeTree = useMemo(() => buildTree(transactions, 'credit'), [transactions]);
+  const income = summary?.income ?? 0;
+  const expenses = summary?.expenses ?? 0;
+  const expenseTree = summary?.expense_tree ?? {};
+  const incomeTree = summary?.income_tree ?? {};
 
   const handleDateChange = (start: string, end: string) => {
     setStartDate(start);
@@ -92,6 +59,7 @@ export default function Budget() {
 
   const handleRecatDone = () => {
     setRecatTxn(null);
+    setVersion((v) => v + 1);
     fetchData();
   };
 
@@ -119,6 +87,10 @@ export default function Budget() {
               </p>
               <CategoryAccordion
                 tree={viewMode === 'depenses' ? expenseTree : incomeTree}
+                startDate={startDate}
+                endDate={endDate}
+                transactionType={viewMode === 'depenses' ? 'debit' : 'credit'}
+                version={version}
                 onRecategorize={setRecatTxn}
               />
             </div>
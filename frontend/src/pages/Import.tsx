@@ -1,7 +1,13 @@
 import { useState } from 'react';
 import FileUpload from '../components/FileUpload';
-import { uploadCSV, applyRules, getAccounts } from '../api/client';
-import type { ImportStats, Account } from '../types';
+import { uploadCSV, getImportJob, applyRules, getAccounts } from '../api/client';
+import type { ImportStats, Account, RuleMatchStats } from '../types';
+
+const POLL_INTERVAL_MS = 500;
+
+function sleep(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
 
 export default function Import() {
   const [file, setFile] = useState<File | null>(null);
@@ -11,6 +17,7 @@ export default function Import() {
   const [stats, setStats] = useState<ImportStats | null>(null);
   const [loading, setLoading] = useState(false);
   const [rulesResult, setRulesResult] = useState<number | null>(null);
+  const [rulesPreview, setRulesPreview] = useState<RuleMatchStats[] | null>(null);
 
   const handleFileSelected = async (f: File) => {
     setFile(f);
@@ -45,8 +52,15 @@ export default function Import() {
     if (!file) return;
     setLoading(true);
     try {
-      const result = await uploadCSV(file, selectedAccount);
-      setStats(result);
+      // L'import tourne côté serveur : on suit sa progression jusqu'à la fin
+      let job = await uploadCSV(file, selectedAccount);
+      while (job.status === 'pending' || job.status === 'running') {
+        setStats(job.stats);
+        await sleep(POLL_INTERVAL_MS);
+        job = await getImportJob(job.id);
+      }
+      setStats(job.stats);
+      if (job.status === 'failed') console.error('Erreur import:', job.error);
     } catch (err) {
       console.error('Erreur import:', err);
     } finally {
@@ -58,11 +72,22 @@ export default function Import() {
     try {
       const result = await applyRules();
       setRulesResult(result.updated);
+      setRulesPreview(null);
     } catch (err) {
       console.error('Erreur application règles:', err);
     }
   };
 
+  const handlePreviewRules = async () => {
+    try {
+      const result = await applyRules(true);
+      setRulesPreview(result.rules.filter((r) => r.matches > 0));
+      setRulesResult(null);
+    } catch (err) {
+      console.error('Erreur aperçu règles:', err);
+    }
+  };
+
   return (
     <div className="max-w-4xl space-y-6">
       <h2 className="text-xl font-semibold">Import CSV</h2>
@@ -164,16 +189,32 @@ export default function Import() {
               Catégorise automatiquement les transactions sans catégorie
             </p>
           </div>
-          <button
-            onClick={handleApplyRules}
-            className="px-4 py-2 rounded-lg text-sm bg-bg-primary border border-border-card text-text-secondary hover:text-text-primary hover:border-accent/50 transition-colors"
-          >
-            Appliquer
-          </button>
+          <div className="flex gap-2">
+            <button
+              onClick={handlePreviewRules}
+              className="px-4 py-2 rounded-lg text-sm bg-bg-primary border border-border-card text-text-secondary hover:text-text-primary hover:border-accent/50 transition-colors"
+            >
+              Aperçu
+            </button>
+            <button
+              onClick={handleApplyRules}
+              className="px-4 py-2 rounded-lg text-sm bg-bg-primary border border-border-card text-text-secondary hover:text-text-primary hover:border-accent/50 transition-colors"
+            >
+              Appliquer
+            </button>
+          </div>
         </div>
         {rulesResult !== null && (
           <p className="text-sm text-green mt-3">{rulesResult} transaction(s) mise(s) à jour</p>
         )}
+        {rulesPreview !== null && (
+          <ul className="text-sm text-text-secondary mt-3 space-y-1">
+            {rulesPreview.length === 0 && <li>Aucune transaction concernée</li>}
+            {rulesPreview.map((r, i) => (
+              <li key={i}>• « {r.keyword} » ({r.match_field}) : {r.matches} transaction(s)</li>
+            ))}
+          </ul>
+        )}
       </div>
     </div>
   );
@@ -4,6 +4,8 @@ export interface Transaction {
   category_id: number | null;
   transaction_type: 'debit' | 'credit';
   amount: number;
+  // Montant signé en centimes (crédit > 0, débit < 0), exact
+  amount_cents: number;
   description: string | null;
   date: string;
   merchant: string | null;
@@ -16,6 +18,11 @@ export interface Transaction {
   sub_category: string | null;
 }
 
+export interface TransactionPage {
+  items: Transaction[];
+  next_cursor: string | null;
+}
+
 export interface Category {
   id: number;
   name: string;
@@ -37,6 +44,28 @@ export interface ImportStats {
   duplicates: number;
   errors: number;
   error_details: string[];
+  timings: Record<string, number>;  // secondes par phase : parse, dedup, categorize, insert
+}
+
+export interface FileImportResult {
+  filename: string;
+  account_id: number;
+  status: 'pending' | 'running' | 'done' | 'failed';
+  stats: ImportStats | null;
+  error: string | null;
+}
+
+export interface ImportJob {
+  id: string;
+  status: 'pending' | 'running' | 'done' | 'failed';
+  filename: string;
+  // null pour un import par lot sur plusieurs comptes
+  account_id: number | null;
+  stats: ImportStats;
+  files: FileImportResult[];
+  error: string | null;
+  created_at: string;
+  finished_at: string | null;
 }
 
 export interface CategorizationRule {
@@ -48,14 +77,92 @@ export interface CategorizationRule {
   created_at: string;
 }
 
+export interface TransactionFilter {
+  start_date?: string;
+  end_date?: string;
+  account_id?: number;
+  uncategorized_only?: boolean;
+  description_contains?: string;
+  merchant_contains?: string;
+}
+
+export interface RulePayload {
+  keyword: string;
+  category_id: number;
+  match_field: string;
+}
+
+export type BulkCategoryUpdate =
+  | { items: { id: number; category_id: number }[]; create_rule?: RulePayload }
+  | { filter: TransactionFilter; category_id: number; create_rule?: RulePayload };
+
+export interface RuleMatchStats {
+  rule_id: number | null;
+  keyword: string;
+  category_id: number;
+  match_field: string;
+  matches: number;
+  sample_ids: number[];
+}
+
+export interface RulesApplyResult {
+  dry_run: boolean;
+  scanned: number;
+  matched: number;
+  updated: number;
+  batches: number;
+  rules: RuleMatchStats[];
+}
+
+export interface RulePreview {
+  matches: number;
+  sample: Transaction[];
+}
+
+export interface BulkCategoryUpdateResult {
+  updated: number;
+  not_found: number[];
+  rule: CategorizationRule | null;
+}
+
 export interface CategoryTree {
   [parentCategory: string]: {
     total: number;
+    count: number;
     subs: {
       [subCategory: string]: {
         total: number;
-        transactions: Transaction[];
+        count: number;
       };
     };
   };
 }
+
+export interface CashflowMonth {
+  month: string;
+  income: number;
+  expenses: number;
+  expenses_by_parent: Record<string, number>;
+}
+
+export interface BudgetSummary {
+  income: number;
+  expenses: number;
+  income_count: number;
+  expense_count: number;
+  income_tree: CategoryTree;
+  expense_tree: CategoryTree;
+}
+
+export interface AmountTotals {
+  income_cents: number;
+  expense_cents: number;
+  net_cents: number;
+  count: number;
+}
+
+export interface AccountTotals {
+  account_id: number;
+  totals: AmountTotals;
+  groups: (AmountTotals & { category_id: number | null; month: string | null })[];
+}
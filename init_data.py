@@ -1,32 +1,10 @@
 # init_data.py (à la racine du projet analyse-financiere/)
 import json
-import sqlite3
 
-from backend.database import SessionLocal, init_db, engine
+from backend.database import SessionLocal, init_db
 from backend.models import Category, Account
 
 
-def migrate_add_columns():
-    """Ajoute les nouvelles colonnes si elles n'existent pas (migration manuelle pour SQLite)"""
-    # Utiliser le même chemin de DB que SQLAlchemy
-    db_path = str(engine.url.database)
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    # Vérifier si category_parent_csv existe dans transactions
-    cursor.execute("PRAGMA table_info(transactions)")
-    columns = [col[1] for col in cursor.fetchall()]
-
-    if "category_parent_csv" not in columns:
-        cursor.execute("ALTER TABLE transactions ADD COLUMN category_parent_csv TEXT")
-        print("  ✓ Colonne category_parent_csv ajoutée à transactions")
-    else:
-        print("  ✓ Colonne category_parent_csv déjà présente")
-
-    conn.commit()
-    conn.close()
-
-
 def populate_categories(json_file="backend/category.json"):
     """Importe les catégories depuis ton JSON"""
 
@@ -99,20 +77,16 @@ if __name__ == "__main__":
     print("Initialisation de la base de données")
     print("=" * 50)
 
-    # Créer les tables (y compris categorization_rules)
-    print("\n1. Création des tables...")
+    # Créer les tables (y compris categorization_rules) et appliquer les migrations
+    print("\n1. Création des tables et migrations...")
     init_db()
 
-    # Migration : ajouter les nouvelles colonnes
-    print("\n2. Migration des colonnes...")
-    migrate_add_columns()
-
     # Importer les catégories
-    print("\n3. Import des catégories...")
+    print("\n2. Import des catégories...")
     populate_categories()
 
     # Créer les comptes
-    print("\n4. Création des comptes...")
+    print("\n3. Création des comptes...")
     create_default_accounts()
 
     print("\n" + "=" * 50)
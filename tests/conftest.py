@@ -1,14 +1,56 @@
+import os
+import shutil
+import socket
+import subprocess
+
+import pandas as pd
 import pytest
+from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
+from backend.database import get_db
+from backend.main import app, columnar_store, get_import_jobs, response_cache
+from backend.services.import_jobs import ImportJobManager
 from backend.models import Base, Account
 
 
+def write_csv(rows: list[dict], path: str) -> None:
+    """Écrit un CSV Boursorama minimal."""
+    df = pd.DataFrame(rows)
+    df.to_csv(path, sep=";", index=False, encoding="utf-8-sig")
+
+
+def make_row(
+    date: str = "2025-06-15",
+    amount: str = "-50,00",
+    label: str = "CARREFOUR MARKET",
+    category: str = "",
+    category_parent: str = "Alimentation",
+    supplier: str = "Carrefour",
+) -> dict:
+    """Ligne d'export Boursorama (champs texte, comme dans le fichier)."""
+    return {
+        "dateOp": date,
+        "dateVal": date,
+        "label": label,
+        "category": category,
+        "categoryParent": category_parent,
+        "supplierFound": supplier,
+        "amount": amount,
+    }
+
+
 @pytest.fixture
 def db():
     """Session SQLite en mémoire, recréée à chaque test."""
-    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    # StaticPool : une seule connexion partagée, visible depuis le threadpool de FastAPI
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
     Base.metadata.create_all(bind=engine)
     Session = sessionmaker(bind=engine)
     session = Session()
@@ -22,3 +64,55 @@ def db():
 
     session.close()
     engine.dispose()
+
+
+@pytest.fixture
+def import_jobs(db):
+    """Gestionnaire d'imports en arrière-plan branché sur la base de test."""
+    manager = ImportJobManager(sessionmaker(bind=db.get_bind()))
+    yield manager
+    manager.shutdown(wait=True)
+
+
+@pytest.fixture
+def client(db, import_jobs):
+    """Client HTTP de l'API branché sur la session de test (sans l'événement startup)."""
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_import_jobs] = lambda: import_jobs
+    response_cache.clear()
+    columnar_store.clear()
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    response_cache.clear()
+    columnar_store.clear()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="session")
+def postgres_url(tmp_path_factory):
+    """URL d'un Postgres de test : FINANCE_TEST_POSTGRES_URL, sinon une instance jetable
+    lancée avec initdb / pg_ctl s'ils sont installés ; test ignoré sinon."""
+    pytest.importorskip("psycopg")
+    url = os.environ.get("FINANCE_TEST_POSTGRES_URL")
+    if url:
+        yield url
+        return
+    if not (shutil.which("initdb") and shutil.which("pg_ctl")):
+        pytest.skip("Postgres indisponible (FINANCE_TEST_POSTGRES_URL ou initdb/pg_ctl)")
+
+    data_dir = tmp_path_factory.mktemp("pgdata")
+    port = _free_port()
+    subprocess.run(["initdb", "-D", str(data_dir), "-U", "postgres", "-A", "trust"], check=True, capture_output=True)
+    subprocess.run(
+        ["pg_ctl", "-D", str(data_dir), "-o", f"-p {port} -k {data_dir} -h 127.0.0.1", "-w", "start"],
+        check=True, capture_output=True,
+    )
+    try:
+        yield f"postgresql+psycopg://postgres@127.0.0.1:{port}/postgres"
+    finally:
+        subprocess.run(["pg_ctl", "-D", str(data_dir), "-m", "fast", "stop"], capture_output=True)
@@ -0,0 +1,137 @@
+"""Tests du mode async : moteur aiosqlite, crud_async et routes async_routes."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from backend import crud, crud_async
+from backend.async_routes import use_async_reads
+from backend.database import create_async_db_engine, create_db_engine, get_async_db
+from backend.models import Account, Base, Category, Transaction, TransactionType
+from backend.settings import DatabaseSettings, SQLitePragmas
+
+START, END = datetime(2025, 1, 1), datetime(2025, 12, 31, 23, 59)
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    """Base SQLite fichier (partagée entre les moteurs sync et async), quelques transactions."""
+    url = f"sqlite:///{tmp_path / 'finance.db'}"
+    engine = create_db_engine(DatabaseSettings(url=url))
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add(Account(id=1, name="Boursorama", account_type="checking"))
+        groceries = Category(name="Courses", parent_category="Vie quotidienne", sub_category="Alimentation")
+        session.add(groceries)
+        session.flush()
+        for day in range(1, 8):
+            session.add(Transaction(
+                account_id=1, transaction_type=TransactionType.DEBIT, amount=10.0 * day,
+                description=f"CB CARREFOUR {day}", date=datetime(2025, 6, day),
+                category_id=groceries.id if day % 2 else None,
+            ))
+        session.add(Transaction(
+            account_id=1, transaction_type=TransactionType.CREDIT, amount=2500.0,
+            description="VIR SALAIRE", date=datetime(2025, 6, 30),
+        ))
+        session.commit()
+    yield url
+    engine.dispose()
+
+
+def _run_async(url: str, fn):
+    """Exécute fn(session) dans une AsyncSession sur url"""
+    async def main():
+        engine = create_async_engine(DatabaseSettings(url=url).async_url, poolclass=NullPool)
+        try:
+            async with AsyncSession(engine) as session:
+                return await fn(session)
+        finally:
+            await engine.dispose()
+    return asyncio.run(main())
+
+
+def test_async_url():
+    assert DatabaseSettings(url="sqlite:///../finance.db").async_url == "sqlite+aiosqlite:///../finance.db"
+    assert DatabaseSettings(url="postgresql+psycopg2://u:p@h/db").async_url == "postgresql+asyncpg://u:p@h/db"
+    with pytest.raises(ValueError):
+        DatabaseSettings(url="oracle://h/db").async_url
+
+
+def test_async_engine_applies_pragmas(db_url):
+    async def pragmas():
+        engine = create_async_db_engine(DatabaseSettings(url=db_url, sqlite=SQLitePragmas(busy_timeout=1234)))
+        try:
+            async with engine.connect() as conn:
+                return [
+                    (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+                    for name in ("journal_mode", "busy_timeout")
+                ]
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(pragmas()) == ["wal", 1234]
+
+
+def test_async_crud_matches_sync(db_url):
+    engine = create_db_engine(DatabaseSettings(url=db_url))
+    with sessionmaker(bind=engine)() as db:
+        first, cursor = crud.get_transactions_by_date_range(db, START, END, limit=3)
+        second, _ = crud.get_transactions_by_date_range(db, START, END, limit=3, cursor=cursor)
+        search, _ = crud.search_transactions(db, "carrefour")
+        budget = crud.get_budget_summary(db, START, END)
+    engine.dispose()
+
+    async def read(db):
+        a_first, a_cursor = await crud_async.get_transactions_by_date_range(db, START, END, limit=3)
+        a_second, _ = await crud_async.get_transactions_by_date_range(db, START, END, limit=3, cursor=a_cursor)
+        a_search, _ = await crud_async.search_transactions(db, "carrefour")
+        a_budget = await crud_async.get_budget_summary(db, START, END)
+        accounts = await crud_async.get_accounts(db)
+        return a_first, a_cursor, a_second, a_search, a_budget, [acc.id for acc in accounts]
+
+    a_first, a_cursor, a_second, a_search, a_budget, account_ids = _run_async(db_url, read)
+    assert a_cursor == cursor
+    assert [dict(r) for r in a_first] == [dict(r) for r in first]
+    assert [dict(r) for r in a_second] == [dict(r) for r in second]
+    assert [r["id"] for r in a_search] == [r["id"] for r in search] and len(search) == 7
+    assert a_budget == budget
+    assert account_ids == [1]
+
+
+def test_async_routes_replace_sync_routes(db_url):
+    app = FastAPI()
+
+    @app.get("/accounts")
+    def sync_accounts():
+        return []
+
+    use_async_reads(app)
+    assert not any(getattr(r, "endpoint", None) is sync_accounts for r in app.router.routes)
+
+    engine = create_async_engine(DatabaseSettings(url=db_url).async_url, poolclass=NullPool)
+    Session = async_sessionmaker(engine)
+
+    async def _get_db():
+        async with Session() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = _get_db
+    client = TestClient(app)
+
+    assert [acc["id"] for acc in client.get("/accounts").json()] == [1]
+    page = client.get("/transactions/range", params={"start_date": "2025-06-01", "end_date": "2025-06-30", "limit": 5})
+    assert page.status_code == 200
+    body = page.json()
+    assert [t["description"] for t in body["items"]][:2] == ["VIR SALAIRE", "CB CARREFOUR 7"]
+    assert body["items"][1]["category_name"] == "Courses"
+    assert body["next_cursor"]
+    assert client.get("/transactions", params={"cursor": "pas-un-curseur"}).status_code == 400
+    assert client.get("/budget/summary", params={"start_date": "2025-01-01", "end_date": "2025-12-31"}).json()["income"] == 2500.0
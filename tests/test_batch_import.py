@@ -0,0 +1,117 @@
+"""Tests de l'import par lot (POST /upload/batch) : plusieurs CSV ou un zip, répartis sur des comptes."""
+
+import io
+import json
+import zipfile
+
+import pytest
+
+from backend.models import Account, Transaction
+
+
+def _csv(*rows: tuple[str, str, str]) -> bytes:
+    lines = ["dateOp;label;amount"] + [";".join(row) for row in rows]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+COURANT = _csv(("2025-06-01", "CARREFOUR", "-10,00"), ("2025-06-02", "SALAIRE", "2500,00"))
+LIVRET = _csv(("2025-06-05", "INTERETS", "12,50"), ("", "SANS DATE", "1,00"))
+
+
+def _zip(**members: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def second_account(db):
+    db.add(Account(id=2, name="Livret A", account_type="savings"))
+    db.commit()
+
+
+def _run(client, import_jobs, files, **data):
+    resp = client.post("/upload/batch", files=[("files", f) for f in files], data=data)
+    assert resp.status_code == 202, resp.text
+    import_jobs.shutdown(wait=True)
+    return client.get(f"/imports/{resp.json()['id']}").json()
+
+
+@pytest.mark.parametrize("parse_workers", [0, 2])
+def test_batch_maps_files_to_accounts(client, db, import_jobs, second_account, parse_workers):
+    import_jobs.parse_workers = parse_workers
+    job = _run(
+        client, import_jobs,
+        [("courant.csv", io.BytesIO(COURANT), "text/csv"), ("livret.csv", io.BytesIO(LIVRET), "text/csv")],
+        accounts=json.dumps({"livret.csv": 2}),
+    )
+
+    assert job["status"] == "done"
+    assert job["account_id"] is None
+    by_name = {f["filename"]: f for f in job["files"]}
+    assert by_name["courant.csv"]["account_id"] == 1
+    assert by_name["courant.csv"]["stats"]["imported"] == 2
+    assert by_name["livret.csv"]["account_id"] == 2
+    assert by_name["livret.csv"]["stats"]["imported"] == 1
+    assert by_name["livret.csv"]["stats"]["errors"] == 1
+    assert {"parse", "dedup"} <= set(by_name["livret.csv"]["stats"]["timings"])
+
+    # Cumul du lot
+    assert job["stats"]["total_rows"] == 4
+    assert job["stats"]["imported"] == 3
+    assert job["stats"]["errors"] == 1
+    assert job["stats"]["error_details"][0].startswith("livret.csv : ")
+
+    counts = {acc: db.query(Transaction).filter_by(account_id=acc).count() for acc in (1, 2)}
+    assert counts == {1: 2, 2: 1}
+
+
+def test_zip_is_expanded_and_duplicates_detected(client, db, import_jobs):
+    import_jobs.parse_workers = 0
+    archive = _zip(**{
+        "exports/juin.csv": COURANT,
+        "exports/juin-copie.csv": COURANT,
+        "__MACOSX/exports/._juin.csv": b"\x00",
+        "notes.txt": b"ignore",
+    })
+    job = _run(client, import_jobs, [("exports.zip", io.BytesIO(archive), "application/zip")])
+
+    assert job["status"] == "done"
+    assert sorted(f["filename"] for f in job["files"]) == ["juin-copie.csv", "juin.csv"]
+    assert job["stats"]["imported"] == 2
+    assert job["stats"]["duplicates"] == 2
+    assert db.query(Transaction).count() == 2
+
+
+def test_failed_file_does_not_stop_the_batch(client, db, import_jobs):
+    import_jobs.parse_workers = 0
+    job = _run(client, import_jobs, [
+        ("illisible.csv", io.BytesIO(_csv(("2025-06-01", "X", "pas un montant"))), "text/csv"),
+        ("courant.csv", io.BytesIO(COURANT), "text/csv"),
+    ])
+
+    by_name = {f["filename"]: f for f in job["files"]}
+    assert by_name["illisible.csv"]["status"] == "failed"
+    assert by_name["illisible.csv"]["error"]
+    assert by_name["courant.csv"]["status"] == "done"
+    assert job["status"] == "done"
+    assert job["error"] == "1 fichier(s) en échec sur 2"
+    assert db.query(Transaction).count() == 2
+
+
+def test_batch_rejected_synchronously(client):
+    csv = ("a.csv", io.BytesIO(COURANT), "text/csv")
+    resp = client.post("/upload/batch", files=[("files", csv)], data={"accounts": json.dumps({"a.csv": 99})})
+    assert resp.status_code == 404
+
+    resp = client.post("/upload/batch", files=[("files", ("a.txt", io.BytesIO(b""), "text/plain"))])
+    assert resp.status_code == 400
+
+    resp = client.post("/upload/batch", files=[("files", ("a.zip", io.BytesIO(b"pas un zip"), "application/zip"))])
+    assert resp.status_code == 400
+
+    resp = client.post("/upload/batch", files=[("files", ("a.csv", io.BytesIO(COURANT), "text/csv"))],
+                       data={"accounts": "[1, 2]"})
+    assert resp.status_code == 400
@@ -0,0 +1,19 @@
+"""Vérifie que la suite de benchmarks tourne de bout en bout (petite taille) et que son rapport se compare."""
+
+from benchmarks.compare import compare
+from benchmarks.suite import READ_ENDPOINTS, run_suite
+
+
+def test_suite_runs_and_reports():
+    report = run_suite(sizes=[200], rule_counts=[10], repeat=1)
+
+    names = {r["name"] for r in report["results"]}
+    assert {"parse", "parse_chunks", "import", "reimport", "apply_rules", "apply_rules_dry_run"} <= names
+    assert {name for name, _, _ in READ_ENDPOINTS} <= names
+    assert all(r["rows"] == 200 and r["median_s"] >= 0 for r in report["results"])
+    assert report["environment"]["sqlite"]
+
+    slower = {**report, "results": [{**r, "median_s": r["median_s"] * 2 + 1} for r in report["results"]]}
+    rows = compare(report, slower, threshold=1.2)
+    assert len(rows) == len(report["results"])
+    assert all(regression for *_, regression in rows)
@@ -0,0 +1,77 @@
+"""Tests de l'agrégation serveur du budget (/budget/summary)."""
+
+from datetime import datetime
+
+import pytest
+
+from backend.models import Category, Transaction, TransactionType
+
+
+@pytest.fixture
+def budget_data(db):
+    groceries = Category(name="Épicerie", parent_category="BesoinsEssentiels", sub_category="Alimentation")
+    rent = Category(name="Loyer", parent_category="BesoinsEssentiels", sub_category="Logement")
+    salary = Category(name="Salaire", parent_category="Revenus", sub_category="Travail")
+    db.add_all([groceries, rent, salary])
+    db.commit()
+
+    def txn(amount, txn_type, category=None, day=10, parent_csv=None):
+        return Transaction(
+            account_id=1,
+            transaction_type=txn_type,
+            amount=amount,
+            description="x",
+            date=datetime(2025, 6, day),
+            category_id=category.id if category else None,
+            category_parent_csv=parent_csv,
+        )
+
+    db.add_all([
+        txn(50.0, TransactionType.DEBIT, groceries),
+        txn(25.5, TransactionType.DEBIT, groceries),
+        txn(800.0, TransactionType.DEBIT, rent),
+        txn(12.0, TransactionType.DEBIT),
+        txn(2500.0, TransactionType.CREDIT, salary),
+        # Exclus : mouvements internes et hors période
+        txn(300.0, TransactionType.DEBIT, parent_csv="Mouvements internes débiteurs"),
+        txn(300.0, TransactionType.CREDIT, parent_csv="Mouvements internes créditeurs"),
+        Transaction(account_id=1, transaction_type=TransactionType.DEBIT, amount=99.0,
+                    date=datetime(2025, 7, 1), category_id=groceries.id),
+    ])
+    db.commit()
+
+
+def test_budget_summary(client, budget_data):
+    resp = client.get("/budget/summary", params={"start_date": "2025-06-01", "end_date": "2025-06-30"})
+    assert resp.status_code == 200
+    data = resp.json()
+
+    assert data["expenses"] == pytest.approx(887.5)
+    assert data["expense_count"] == 4
+    assert data["income"] == pytest.approx(2500.0)
+    assert data["income_count"] == 1
+
+    essentials = data["expense_tree"]["BesoinsEssentiels"]
+    assert essentials["total"] == pytest.approx(875.5)
+    assert essentials["count"] == 3
+    assert essentials["subs"]["Alimentation"] == {"total": pytest.approx(75.5), "count": 2}
+    assert data["expense_tree"]["Non catégorisé"]["subs"]["Non catégorisé"]["count"] == 1
+    assert list(data["income_tree"]) == ["Revenus"]
+
+
+def test_range_filters_for_accordion_details(client, budget_data):
+    params = {
+        "start_date": "2025-06-01",
+        "end_date": "2025-06-30",
+        "transaction_type": "debit",
+        "parent_category": "Non catégorisé",
+        "sub_category": "Non catégorisé",
+        "exclude_internal": True,
+    }
+    resp = client.get("/transactions/range", params=params)
+    assert resp.status_code == 200
+    assert [t["amount"] for t in resp.json()["items"]] == [12.0]
+
+    params.update(parent_category="BesoinsEssentiels", sub_category="Alimentation")
+    resp = client.get("/transactions/range", params=params)
+    assert sorted(t["amount"] for t in resp.json()["items"]) == [25.5, 50.0]
@@ -0,0 +1,142 @@
+"""Tests du mode d'import en masse (bulk=True)."""
+
+import os
+import tempfile
+
+import pytest
+
+from backend.models import Category, Transaction, TransactionType
+from backend.services.import_service import BankCSVImporter
+
+from .conftest import make_row, write_csv
+
+
+@pytest.fixture
+def csv_path():
+    """Chemin d'un CSV temporaire supprimé en fin de test."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8-sig") as f:
+        path = f.name
+    yield path
+    os.unlink(path)
+
+
+ROWS = [
+    make_row(date="2025-06-15", amount="-4,50", label="CAFE DU COIN"),
+    make_row(date="2025-06-15", amount="-4,50", label="cafe  du coin"),
+    make_row(date="2025-06-16", amount="1 250,00", label="SALAIRE", supplier=""),
+    make_row(date="2025-06-17", amount="-62,30", label="CARREFOUR CITY", category="Alimentation"),
+]
+
+
+class TestBulkImport:
+
+    def test_same_import_ids_as_row_path(self, db, csv_path):
+        """Les hash calculés en colonne sont identiques à ceux du chemin ligne par ligne."""
+        write_csv(ROWS, csv_path)
+        importer = BankCSVImporter(db, account_id=1)
+        df = importer.parse_boursorama_csv(csv_path)
+
+        expected = []
+        tracker: dict[str, int] = {}
+        for _, row in df.iterrows():
+            key = importer._normalize_base_key(row)
+            occ = tracker.get(key, 0)
+            tracker[key] = occ + 1
+            expected.append(importer.generate_import_id(key, occ))
+
+        assert importer._compute_import_ids(df).tolist() == expected
+
+    def test_bulk_then_reimport(self, db, csv_path):
+        write_csv(ROWS, csv_path)
+        importer = BankCSVImporter(db, account_id=1)
+
+        stats1 = importer.import_csv(csv_path, bulk=True)
+        assert stats1.total_rows == 4
+        assert stats1.imported == 4
+        assert stats1.duplicates == 0
+
+        stats2 = importer.import_csv(csv_path, bulk=True)
+        assert stats2.imported == 0
+        assert stats2.duplicates == 4
+        assert db.query(Transaction).count() == 4
+
+    def test_bulk_dedups_against_row_path(self, db, csv_path):
+        """Un fichier importé ligne par ligne est reconnu comme doublon en mode bulk."""
+        write_csv(ROWS, csv_path)
+        importer = BankCSVImporter(db, account_id=1)
+        importer.import_csv(csv_path)
+
+        stats = importer.import_csv(csv_path, bulk=True)
+        assert stats.imported == 0
+        assert stats.duplicates == 4
+
+    def test_bulk_row_content(self, db, csv_path):
+        db.add(Category(name="Épicerie", parent_category="BesoinsEssentiels", sub_category="Alimentation"))
+        db.commit()
+        write_csv(ROWS, csv_path)
+
+        BankCSVImporter(db, account_id=1).import_csv(csv_path, bulk=True)
+
+        salaire = db.query(Transaction).filter(Transaction.description == "SALAIRE").one()
+        assert salaire.transaction_type == TransactionType.CREDIT
+        assert salaire.amount == 1250.0
+        assert salaire.merchant is None
+        assert salaire.category_parent_csv == "Alimentation"
+        assert salaire.created_at is not None
+
+        carrefour = db.query(Transaction).filter(Transaction.description == "CARREFOUR CITY").one()
+        assert carrefour.transaction_type == TransactionType.DEBIT
+        assert carrefour.amount == pytest.approx(62.30)
+        assert carrefour.category.name == "Épicerie"
+
+    def test_bulk_missing_data_counted_as_error(self, db, csv_path):
+        rows = ROWS[:1] + [make_row(date="2025-06-18", amount="")]
+        write_csv(rows, csv_path)
+
+        stats = BankCSVImporter(db, account_id=1).import_csv(csv_path, bulk=True)
+        assert stats.imported == 1
+        assert stats.errors == 1
+        assert stats.error_details == ["Ligne 1: données manquantes"]
+
+
+class TestStreamImport:
+    """Import en flux par chunks (POST /upload)."""
+
+    def test_chunks_give_same_import_ids(self, db, csv_path):
+        """Les compteurs d'occurrence survivent aux frontières de chunks."""
+        rows = [make_row(date="2025-06-15", amount="-4,50", label="CAFE DU COIN")] * 5 + ROWS
+        write_csv(rows, csv_path)
+
+        importer = BankCSVImporter(db, account_id=1)
+        expected = importer._compute_import_ids(importer.parse_boursorama_csv(csv_path)).tolist()
+
+        with open(csv_path, "rb") as f:
+            stats = importer.import_stream(f, chunksize=2)
+        assert stats.total_rows == len(rows)
+        assert stats.imported == len(rows)
+
+        imported = [t.import_id for t in db.query(Transaction).order_by(Transaction.id)]
+        assert imported == expected
+
+    def test_stream_reimport_is_all_duplicates(self, db, csv_path):
+        write_csv(ROWS, csv_path)
+        importer = BankCSVImporter(db, account_id=1)
+        importer.import_csv(csv_path)
+
+        with open(csv_path, "rb") as f:
+            stats = importer.import_stream(f, chunksize=3)
+        assert stats.imported == 0
+        assert stats.duplicates == 4
+
+    def test_upload_endpoint(self, client, db, import_jobs, csv_path):
+        write_csv(ROWS, csv_path)
+        with open(csv_path, "rb") as f:
+            resp = client.post("/upload", files={"file": ("export.csv", f, "text/csv")})
+        assert resp.status_code == 202
+        job_id = resp.json()["id"]
+
+        import_jobs.shutdown(wait=True)  # attend la fin du job
+        job = client.get(f"/imports/{job_id}").json()
+        assert job["status"] == "done"
+        assert job["stats"]["imported"] == 4
+        assert db.query(Transaction).count() == 4
@@ -0,0 +1,131 @@
+"""Tests de la re-catégorisation en lot (PATCH /transactions/category)."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from backend import crud
+from backend.models import CategorizationRule, Category, Transaction, TransactionType
+from backend.schemas import BulkCategoryUpdate, TransactionCreate
+from backend.services.rollup import check_rollup_consistency
+
+
+@pytest.fixture
+def categories(db):
+    groceries = Category(name="Épicerie", parent_category="BesoinsEssentiels", sub_category="Alimentation")
+    transport = Category(name="VTC", parent_category="Transport", sub_category="Taxi")
+    db.add_all([groceries, transport])
+    db.commit()
+    return groceries, transport
+
+
+def _create(db, description, day, amount=10.0, merchant=None, category_id=None):
+    return crud.create_transaction(db, TransactionCreate(
+        account_id=1, transaction_type=TransactionType.DEBIT, amount=amount,
+        description=description, merchant=merchant, date=datetime(2025, 6, day), category_id=category_id,
+    ))
+
+
+def _count_commits(db):
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(1))
+    return commits
+
+
+def test_items_single_commit(client, db, categories):
+    groceries, transport = categories
+    t1 = _create(db, "CARREFOUR", 1)
+    t2 = _create(db, "UBER", 2, category_id=groceries.id)
+    commits = _count_commits(db)
+
+    resp = client.patch("/transactions/category", json={"items": [
+        {"id": t1.id, "category_id": groceries.id},
+        {"id": t2.id, "category_id": transport.id},
+        {"id": 9999, "category_id": groceries.id},
+    ]})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["updated"] == 2
+    assert body["not_found"] == [9999]
+    assert body["rule"] is None
+    assert len(commits) == 1
+
+    assert db.get(Transaction, t1.id).category_id == groceries.id
+    assert db.get(Transaction, t2.id).category_id == transport.id
+    assert check_rollup_consistency(db) == []
+
+
+def test_filter_with_rule(client, db, categories):
+    groceries, transport = categories
+    _create(db, "CB CARREFOUR MARKET", 1)
+    _create(db, "cb carrefour city", 2)
+    _create(db, "CB CARREFOUR", 3, category_id=transport.id)
+    _create(db, "UBER", 4)
+    commits = _count_commits(db)
+
+    resp = client.patch("/transactions/category", json={
+        "filter": {"description_contains": "carrefour", "uncategorized_only": True},
+        "category_id": groceries.id,
+        "create_rule": {"keyword": "carrefour", "category_id": groceries.id},
+    })
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["updated"] == 2
+    assert body["rule"]["keyword"] == "carrefour"
+    assert len(commits) == 1
+
+    rows = db.query(Transaction.description, Transaction.category_id).order_by(Transaction.date).all()
+    assert [cat for _, cat in rows] == [groceries.id, groceries.id, transport.id, None]
+    assert db.query(CategorizationRule).count() == 1
+    assert check_rollup_consistency(db) == []
+
+
+def test_filter_escapes_like_wildcards(db, categories):
+    groceries, _ = categories
+    _create(db, "REMISE 100% OFFERTE", 1)
+    _create(db, "REMISE 1000", 2)
+
+    result = crud.bulk_update_transaction_categories(db, BulkCategoryUpdate(
+        filter={"description_contains": "100%"}, category_id=groceries.id,
+    ))
+    assert result["updated"] == 1
+
+
+def test_unknown_category_rolls_nothing(client, db, categories):
+    t1 = _create(db, "CARREFOUR", 1)
+    resp = client.patch("/transactions/category", json={"items": [{"id": t1.id, "category_id": 424242}]})
+    assert resp.status_code == 404
+    assert db.get(Transaction, t1.id).category_id is None
+
+
+@pytest.mark.parametrize("payload", [
+    {},
+    {"items": [], "filter": {}, "category_id": 1},
+    {"filter": {"uncategorized_only": True}},
+    {"filter": {}, "category_id": 1},
+    {"filter": {"description_contains": "", "uncategorized_only": False}, "category_id": 1},
+    {"items": [{"id": 1, "category_id": 1}], "category_id": 1},
+])
+def test_invalid_payloads(client, payload):
+    assert client.patch("/transactions/category", json=payload).status_code == 422
+
+
+def test_empty_filter_rejected_before_update(client, db, categories):
+    groceries, _ = categories
+    t1 = _create(db, "CARREFOUR", 1)
+    with pytest.raises(ValueError, match="au moins un critère"):
+        BulkCategoryUpdate(filter={}, category_id=groceries.id)
+    resp = client.patch("/transactions/category", json={"filter": {}, "category_id": groceries.id})
+    assert resp.status_code == 422
+    assert db.get(Transaction, t1.id).category_id is None
+
+
+def test_invalidates_cached_reads(client, db, categories):
+    groceries, _ = categories
+    t1 = _create(db, "CARREFOUR", 1)
+    params = {"start_date": "2025-06-01", "end_date": "2025-06-30"}
+    assert client.get("/transactions/range", params=params).json()["items"][0]["category_id"] is None
+
+    client.patch("/transactions/category", json={"items": [{"id": t1.id, "category_id": groceries.id}]})
+    assert client.get("/transactions/range", params=params).json()["items"][0]["category_id"] == groceries.id
@@ -0,0 +1,71 @@
+"""Tests du cache de réponses (TTL + LRU, ETag, invalidation par les écritures)."""
+
+from datetime import datetime
+
+from backend.cache import ResponseCache
+from backend.models import Category, Transaction, TransactionType
+
+RANGE = {"start_date": "2025-06-01", "end_date": "2025-06-30"}
+
+
+def test_second_read_is_served_from_cache(client):
+    first = client.get("/categories")
+    assert first.headers["x-cache"] == "MISS"
+    second = client.get("/categories")
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == first.json()
+    assert second.headers["etag"] == first.headers["etag"]
+
+
+def test_if_none_match_returns_304(client):
+    etag = client.get("/accounts").headers["etag"]
+    resp = client.get("/accounts", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+
+def test_create_category_invalidates(client):
+    etag = client.get("/categories").headers["etag"]
+    client.post("/categories", json={"name": "Train", "parent_category": "Transport", "sub_category": "Rail"})
+
+    resp = client.get("/categories", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["x-cache"] == "MISS"
+    assert [c["name"] for c in resp.json()] == ["Train"]
+
+
+def test_recategorization_invalidates_range(client, db):
+    cat = Category(name="Épicerie", parent_category="BesoinsEssentiels", sub_category="Alimentation")
+    txn = Transaction(account_id=1, transaction_type=TransactionType.DEBIT, amount=10.0, date=datetime(2025, 6, 3))
+    db.add_all([cat, txn])
+    db.commit()
+
+    assert client.get("/transactions/range", params=RANGE).json()["items"][0]["category_id"] is None
+    client.patch(f"/transactions/{txn.id}/category", json={"category_id": cat.id})
+    assert client.get("/transactions/range", params=RANGE).json()["items"][0]["category_id"] == cat.id
+
+
+def test_failed_write_does_not_invalidate(client):
+    client.get("/transactions/range", params=RANGE)
+    assert client.patch("/transactions/999/category", json={"category_id": 1}).status_code == 404
+    assert client.get("/transactions/range", params=RANGE).headers["x-cache"] == "HIT"
+
+
+def test_query_parameters_are_part_of_the_key(client):
+    client.get("/transactions/range", params=RANGE)
+    other = client.get("/transactions/range", params={**RANGE, "end_date": "2025-07-31"})
+    assert other.headers["x-cache"] == "MISS"
+
+
+def test_lru_and_ttl():
+    cache = ResponseCache(maxsize=2, ttl=60)
+    cache.set(("a",), b"1", None)
+    cache.set(("b",), b"2", None)
+    cache.get(("a",))
+    cache.set(("c",), b"3", None)
+    assert cache.get(("b",)) is None  # le moins récemment utilisé est évincé
+    assert cache.get(("a",)).body == b"1"
+
+    expired = ResponseCache(maxsize=2, ttl=-1)
+    expired.set(("a",), b"1", None)
+    assert expired.get(("a",)) is None
@@ -0,0 +1,210 @@
+"""Tests du moteur de règles compilé (RuleMatcher)."""
+
+import random
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from backend.crud import (
+    apply_rules_in_batches,
+    apply_rules_to_uncategorized,
+    find_category_by_keyword,
+)
+from backend.models import CategorizationRule, Category, Transaction, TransactionType
+from backend.schemas import CategorizationRuleCreate
+from backend.services.categorization import CategoryIndex, RuleMatcher
+from backend.services.import_service import BankCSVImporter
+from backend.services.rollup import check_rollup_consistency, rebuild_rollup
+
+from .conftest import make_row, write_csv
+
+
+def _naive_match(rules, description, merchant):
+    """Parcours linéaire historique, sert de référence."""
+    for rule in rules:
+        field_value = ""
+        if rule.match_field == "merchant" and merchant:
+            field_value = merchant.lower()
+        elif description:
+            field_value = description.lower()
+        if rule.keyword.lower() in field_value:
+            return rule.category_id
+    return None
+
+
+def _rule(keyword, category_id, match_field="description"):
+    return CategorizationRule(keyword=keyword, category_id=category_id, match_field=match_field)
+
+
+class TestRuleMatcher:
+
+    def test_first_rule_wins(self):
+        rules = [_rule("market", 1), _rule("carrefour", 2)]
+        assert RuleMatcher(rules).match("CARREFOUR MARKET", None) == 1
+
+    def test_first_rule_wins_across_fields(self):
+        rules = [_rule("carrefour", 1), _rule("carrefour", 2, "merchant")]
+        assert RuleMatcher(rules).match("CB CARREFOUR", "Carrefour") == 1
+
+    def test_merchant_rule_falls_back_to_description(self):
+        rules = [_rule("uber", 7, "merchant")]
+        matcher = RuleMatcher(rules)
+        assert matcher.match("UBER TRIP", None) == 7
+        assert matcher.match("UBER TRIP", "Bolt") is None
+
+    def test_overlapping_keywords(self):
+        """Une règle prioritaire contenue dans un mot-clé plus long est trouvée."""
+        rules = [_rule("super u", 1), _rule("u", 2), _rule("per", 3)]
+        matcher = RuleMatcher(rules)
+        assert matcher.match("SUPER U", None) == 1
+        assert matcher.match("PERSO", None) == 3
+
+    def test_regex_characters_are_literal(self):
+        rules = [_rule("a.b", 1), _rule("(x", 2)]
+        matcher = RuleMatcher(rules)
+        assert matcher.match("axb", None) is None
+        assert matcher.match("A.B", None) == 1
+        assert matcher.match("(X)", None) == 2
+
+    def test_no_rules(self):
+        assert RuleMatcher([]).match("anything", "x") is None
+
+    def test_matches_naive_scan(self):
+        rng = random.Random(0)
+        alphabet = "abc d"
+        words = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 3))) for _ in range(40)]
+        rules = [
+            _rule(w, i, rng.choice(["description", "merchant"]))
+            for i, w in enumerate(words)
+        ]
+        matcher = RuleMatcher(rules)
+        for _ in range(500):
+            desc = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))) or None
+            merchant = rng.choice([None, "", "".join(rng.choice(alphabet) for _ in range(5))])
+            assert matcher.match(desc, merchant) == _naive_match(rules, desc, merchant)
+
+
+def test_apply_rules_to_uncategorized(db):
+    groceries = Category(name="Épicerie", parent_category="BesoinsEssentiels", sub_category="Alimentation")
+    transport = Category(name="VTC", parent_category="Transport", sub_category="Taxi")
+    db.add_all([groceries, transport])
+    db.commit()
+    db.add_all([
+        CategorizationRule(keyword="carrefour", category_id=groceries.id),
+        CategorizationRule(keyword="uber", category_id=transport.id, match_field="merchant"),
+        CategorizationRule(keyword="boulangerie", category_id=groceries.id, is_active=False),
+    ])
+    for desc, merchant in [("CB CARREFOUR", None), ("PRLV", "Uber BV"), ("BOULANGERIE", None)]:
+        db.add(Transaction(
+            account_id=1, transaction_type=TransactionType.DEBIT, amount=10.0,
+            description=desc, merchant=merchant, date=datetime(2025, 6, 1),
+        ))
+    db.commit()
+
+    assert apply_rules_to_uncategorized(db) == 2
+    by_desc = {t.description: t.category_id for t in db.query(Transaction)}
+    assert by_desc == {"CB CARREFOUR": groceries.id, "PRLV": transport.id, "BOULANGERIE": None}
+
+
+class TestApplyRulesInBatches:
+
+    @pytest.fixture
+    def backlog(self, db):
+        groceries = Category(name="Épicerie", parent_category="BesoinsEssentiels", sub_category="Alimentation")
+        transport = Category(name="VTC", parent_category="Transport", sub_category="Taxi")
+        db.add_all([groceries, transport])
+        db.commit()
+        db.add_all([
+            CategorizationRule(keyword="carrefour", category_id=groceries.id),
+            CategorizationRule(keyword="uber", category_id=transport.id),
+        ])
+        for i in range(7):
+            desc = ["CB CARREFOUR", "UBER TRIP", "DIVERS"][i % 3]
+            db.add(Transaction(
+                account_id=1, transaction_type=TransactionType.DEBIT, amount=float(i + 1),
+                description=desc, date=datetime(2025, 6, i + 1),
+            ))
+        db.flush()
+        rebuild_rollup(db)
+        db.commit()
+        return groceries, transport
+
+    def test_commits_one_batch_at_a_time(self, db, backlog):
+        commits = []
+        event.listen(db, "after_commit", lambda session: commits.append(1))
+
+        result = apply_rules_in_batches(db, batch_size=2)
+        assert result["scanned"] == 7
+        assert result["batches"] == 4
+        assert result["updated"] == result["matched"] == 5
+        assert len(commits) == 4
+        assert db.query(Transaction).filter(Transaction.category_id == None).count() == 2
+        assert check_rollup_consistency(db) == []
+
+    def test_dry_run_writes_nothing(self, db, backlog):
+        groceries, transport = backlog
+        ids = [t.id for t in db.query(Transaction).order_by(Transaction.id)]
+
+        result = apply_rules_in_batches(
+            db, dry_run=True, batch_size=3, sample_size=2,
+            candidate_rules=[CategorizationRuleCreate(keyword="divers", category_id=groceries.id)],
+        )
+        assert result["updated"] == 0
+        assert result["matched"] == 7
+        assert [(r["keyword"], r["matches"]) for r in result["rules"]] == [
+            ("carrefour", 3), ("uber", 2), ("divers", 2),
+        ]
+        assert result["rules"][0]["sample_ids"] == [ids[0], ids[3]]
+        assert result["rules"][2]["rule_id"] is None
+        assert db.query(Transaction).filter(Transaction.category_id != None).count() == 0
+        assert db.query(CategorizationRule).count() == 2
+
+    def test_candidate_rules_require_dry_run(self, db, backlog):
+        with pytest.raises(ValueError):
+            apply_rules_in_batches(db, candidate_rules=[CategorizationRuleCreate(keyword="x", category_id=1)])
+
+    def test_endpoint(self, client, db, backlog):
+        preview = client.post("/rules/apply", json={"dry_run": True})
+        assert preview.status_code == 200
+        assert preview.json()["matched"] == 5
+        assert preview.json()["updated"] == 0
+
+        assert client.post("/rules/apply", json={"candidate_rules": [{"keyword": "x", "category_id": 1}]}).status_code == 422
+        assert client.post("/rules/apply").json()["updated"] == 5
+
+
+class TestCategoryIndex:
+
+    def test_find_first_category_containing_keyword(self):
+        index = CategoryIndex([
+            Category(id=1, name="Courses supermarché"),
+            Category(id=2, name="Épicerie fine"),
+            Category(id=3, name="Épicerie"),
+        ])
+        assert index.find_id("épicerie") == 2
+        assert index.get_id("ÉPICERIE") == 3
+        assert index.find_id("absent") is None
+
+    def test_resolve_skips_missing_targets(self):
+        index = CategoryIndex([Category(id=4, name="Train")])
+        assert index.resolve({"sncf": "Train", "uber": "VTC"}) == {"sncf": 4}
+
+    def test_categories_added_outside_the_api_are_seen(self, db, tmp_path):
+        # Ajout direct par la session (init_data, autre worker) : pas d'invalidation explicite
+        importer = BankCSVImporter(db, account_id=1)
+        first, second = str(tmp_path / "juin.csv"), str(tmp_path / "juillet.csv")
+        write_csv([make_row(date="2025-06-15", label="CB CARREFOUR", category_parent="")], first)
+        write_csv([make_row(date="2025-07-15", label="CB CARREFOUR", category_parent="")], second)
+
+        importer.import_csv(first, bulk=True)
+        assert find_category_by_keyword(db, "épicerie") is None
+
+        groceries = Category(name="Épicerie", parent_category="Vie quotidienne", sub_category="Alimentation")
+        db.add(groceries)
+        db.commit()
+        assert find_category_by_keyword(db, "épicerie").id == groceries.id
+
+        importer.import_csv(second, bulk=True)
+        txns = db.query(Transaction).order_by(Transaction.date).all()
+        assert [t.category_id for t in txns] == [None, groceries.id]
@@ -0,0 +1,87 @@
+"""Tests des montants en centimes et du store colonnaire NumPy (services/columnar.py)."""
+
+from datetime import date, datetime
+
+import pytest
+
+from backend.models import Category, Transaction, TransactionType
+from backend.services.columnar import ColumnarHistory, ColumnarStore
+
+
+@pytest.fixture
+def history_rows(db):
+    groceries = Category(name="Courses", parent_category="Vie quotidienne", sub_category="Alimentation")
+    db.add(groceries)
+    db.flush()
+    rows = [
+        (datetime(2025, 5, 30), TransactionType.DEBIT, 0.1, groceries.id),
+        (datetime(2025, 6, 1), TransactionType.DEBIT, 0.2, groceries.id),
+        (datetime(2025, 6, 1), TransactionType.CREDIT, 2500.0, None),
+        (datetime(2025, 6, 15, 18, 30), TransactionType.DEBIT, 62.3, None),
+        (datetime(2025, 7, 2), TransactionType.DEBIT, 10.0, groceries.id),
+    ]
+    for when, txn_type, amount, category_id in rows:
+        db.add(Transaction(account_id=1, transaction_type=txn_type, amount=amount, date=when, category_id=category_id))
+    db.commit()
+    return groceries
+
+
+def test_amount_is_stored_as_signed_cents(db, history_rows):
+    txns = db.query(Transaction).order_by(Transaction.date, Transaction.id).all()
+    assert [t.amount_cents for t in txns] == [-10, -20, 250000, -6230, -1000]
+    assert txns[3].amount == pytest.approx(62.3)
+    assert db.query(Transaction).filter(Transaction.amount > 60).count() == 2
+
+
+def test_history_sums_and_groups(db, history_rows):
+    history = ColumnarHistory.load(db, account_id=1)
+    assert len(history) == 5
+
+    assert history.totals() == {"income_cents": 250000, "expense_cents": 7260, "net_cents": 242740, "count": 5}
+    june = history.totals(date(2025, 6, 1), date(2025, 6, 15))
+    assert june == {"income_cents": 250000, "expense_cents": 6250, "net_cents": 243750, "count": 3}
+
+    by_category = {g["category_id"]: g for g in history.by_category(end=date(2025, 6, 30))}
+    assert by_category[history_rows.id]["expense_cents"] == 30
+    assert by_category[None]["net_cents"] == 250000 - 6230
+
+    assert [(m["month"], m["net_cents"], m["count"]) for m in history.by_month()] == [
+        ("2025-05", -10, 1), ("2025-06", 250000 - 20 - 6230, 3), ("2025-07", -1000, 1),
+    ]
+    assert history.by_month(date(2026, 1, 1)) == []
+
+
+def test_store_reloads_on_new_version(db, history_rows):
+    store = ColumnarStore()
+    first = store.get(db, 1, (1,))
+    assert store.get(db, 1, (1,)) is first
+
+    db.add(Transaction(account_id=1, transaction_type=TransactionType.DEBIT, amount=1.0, date=datetime(2025, 8, 1)))
+    db.commit()
+    assert len(store.get(db, 1, (1,))) == 5
+    assert len(store.get(db, 1, (2,))) == 6
+
+
+def test_store_reloads_after_ttl(db, history_rows, monkeypatch):
+    # Écriture faite par un autre worker : version locale inchangée, rechargé à l'expiration du TTL
+    clock = [1000.0]
+    monkeypatch.setattr("backend.services.columnar.time.monotonic", lambda: clock[0])
+    store = ColumnarStore(ttl=60)
+    first = store.get(db, 1, (1,))
+
+    db.add(Transaction(account_id=1, transaction_type=TransactionType.DEBIT, amount=1.0, date=datetime(2025, 8, 1)))
+    db.commit()
+    clock[0] += 59
+    assert store.get(db, 1, (1,)) is first
+    clock[0] += 2
+    assert len(store.get(db, 1, (1,))) == 6
+
+
+def test_totals_endpoint(client, history_rows):
+    resp = client.get("/accounts/1/totals", params={"group_by": "month", "start_date": "2025-06-01"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["totals"]["count"] == 4
+    assert [g["month"] for g in body["groups"]] == ["2025-06", "2025-07"]
+
+    assert client.get("/accounts/99/totals").status_code == 404
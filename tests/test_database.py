@@ -0,0 +1,41 @@
+"""Tests de la configuration du moteur (PRAGMA SQLite, variables d'environnement)."""
+
+from sqlalchemy import text
+
+from backend.database import create_db_engine
+from backend.settings import DatabaseSettings, SQLitePragmas
+
+
+def test_sqlite_pragmas_applied_on_connect(tmp_path):
+    settings = DatabaseSettings(
+        url=f"sqlite:///{tmp_path / 'finance.db'}",
+        sqlite=SQLitePragmas(cache_size=-2000, mmap_size=1048576, busy_timeout=1234),
+    )
+    engine = create_db_engine(settings)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -2000
+        assert conn.execute(text("PRAGMA mmap_size")).scalar() == 1048576
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+    engine.dispose()
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("FINANCE_DATABASE_URL", "sqlite:////tmp/autre.db")
+    monkeypatch.setenv("FINANCE_DB_POOL_SIZE", "10")
+    monkeypatch.setenv("FINANCE_SQLITE_JOURNAL_MODE", "DELETE")
+    monkeypatch.setenv("FINANCE_SQLITE_BUSY_TIMEOUT", "100")
+
+    settings = DatabaseSettings.from_env()
+    assert settings.url == "sqlite:////tmp/autre.db"
+    assert settings.pool_size == 10
+    assert settings.max_overflow is None
+    assert settings.sqlite.journal_mode == "DELETE"
+    assert settings.sqlite.synchronous == "NORMAL"
+    assert settings.sqlite.busy_timeout == 100
+
+
+def test_default_url_unchanged(monkeypatch):
+    monkeypatch.delenv("FINANCE_DATABASE_URL", raising=False)
+    assert DatabaseSettings.from_env().url == "sqlite:///../finance.db"
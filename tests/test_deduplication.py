@@ -9,29 +9,7 @@ import pytest
 from backend.models import Transaction
 from backend.services.import_service import BankCSVImporter
 
-
-def _write_csv(rows: list[dict], path: str) -> None:
-    """Écrit un CSV Boursorama minimal."""
-    df = pd.DataFrame(rows)
-    df.to_csv(path, sep=";", index=False, encoding="utf-8-sig")
-
-
-def _make_row(
-    date: str = "2025-06-15",
-    amount: str = "-50,00",
-    label: str = "CARREFOUR MARKET",
-    category_parent: str = "Alimentation",
-    supplier: str = "Carrefour",
-) -> dict:
-    return {
-        "dateOp": date,
-        "dateVal": date,
-        "label": label,
-        "category": "",
-        "categoryParent": category_parent,
-        "supplierFound": supplier,
-        "amount": amount,
-    }
+from .conftest import make_row, write_csv
 
 
 class TestGenerateImportId:
@@ -86,11 +64,11 @@ class TestImportCSVDeduplication:
     def test_import_then_reimport_same_csv(self, db):
         """Importer 2 fois le même CSV ne crée pas de doublons."""
         rows = [
-            _make_row(date="2025-06-15", amount="-50,00", label="CARREFOUR"),
-            _make_row(date="2025-06-16", amount="-30,00", label="BOULANGERIE"),
+            make_row(date="2025-06-15", amount="-50,00", label="CARREFOUR"),
+            make_row(date="2025-06-16", amount="-30,00", label="BOULANGERIE"),
         ]
         with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8-sig") as f:
-            _write_csv(rows, f.name)
+            write_csv(rows, f.name)
             path = f.name
 
         try:
@@ -111,19 +89,19 @@ class TestImportCSVDeduplication:
     def test_overlapping_csv_ranges(self, db):
         """CSV-A (jan-fev) + CSV-B (fev-mar) : les transactions de février ne sont importées qu'une fois."""
         csv_a_rows = [
-            _make_row(date="2025-01-15", amount="-50,00", label="JANVIER"),
-            _make_row(date="2025-02-10", amount="-80,00", label="FEVRIER OVERLAP"),
+            make_row(date="2025-01-15", amount="-50,00", label="JANVIER"),
+            make_row(date="2025-02-10", amount="-80,00", label="FEVRIER OVERLAP"),
         ]
         csv_b_rows = [
-            _make_row(date="2025-02-10", amount="-80,00", label="FEVRIER OVERLAP"),
-            _make_row(date="2025-03-05", amount="-25,00", label="MARS"),
+            make_row(date="2025-02-10", amount="-80,00", label="FEVRIER OVERLAP"),
+            make_row(date="2025-03-05", amount="-25,00", label="MARS"),
         ]
 
         with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8-sig") as fa:
-            _write_csv(csv_a_rows, fa.name)
+            write_csv(csv_a_rows, fa.name)
             path_a = fa.name
         with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8-sig") as fb:
-            _write_csv(csv_b_rows, fb.name)
+            write_csv(csv_b_rows, fb.name)
             path_b = fb.name
 
         try:
@@ -144,11 +122,11 @@ class TestImportCSVDeduplication:
     def test_true_duplicates_same_day(self, db):
         """2 transactions identiques le même jour (2 cafés) doivent toutes être importées."""
         rows = [
-            _make_row(date="2025-06-15", amount="-4,50", label="CAFE DU COIN"),
-            _make_row(date="2025-06-15", amount="-4,50", label="CAFE DU COIN"),
+            make_row(date="2025-06-15", amount="-4,50", label="CAFE DU COIN"),
+            make_row(date="2025-06-15", amount="-4,50", label="CAFE DU COIN"),
         ]
         with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8-sig") as f:
-            _write_csv(rows, f.name)
+            write_csv(rows, f.name)
             path = f.name
 
         try:
@@ -165,11 +143,11 @@ class TestImportCSVDeduplication:
     def test_true_duplicates_reimport(self, db):
         """Réimporter un CSV contenant 2 transactions identiques ne crée pas de doublons."""
         rows = [
-            _make_row(date="2025-06-15", amount="-4,50", label="CAFE DU COIN"),
-            _make_row(date="2025-06-15", amount="-4,50", label="CAFE DU COIN"),
+            make_row(date="2025-06-15", amount="-4,50", label="CAFE DU COIN"),
+            make_row(date="2025-06-15", amount="-4,50", label="CAFE DU COIN"),
         ]
         with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8-sig") as f:
-            _write_csv(rows, f.name)
+            write_csv(rows, f.name)
             path = f.name
 
         try:
@@ -193,9 +171,9 @@ class TestImportCSVDeduplication:
         db.add(account2)
         db.commit()
 
-        rows = [_make_row(date="2025-06-15", amount="-50,00", label="VIREMENT")]
+        rows = [make_row(date="2025-06-15", amount="-50,00", label="VIREMENT")]
         with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8-sig") as f:
-            _write_csv(rows, f.name)
+            write_csv(rows, f.name)
             path = f.name
 
         try:
@@ -214,14 +192,14 @@ class TestImportCSVDeduplication:
 
     def test_case_difference_deduplicated(self, db):
         """'CARREFOUR' dans CSV-A et 'carrefour' dans CSV-B = doublon détecté."""
-        rows_a = [_make_row(date="2025-06-15", amount="-50,00", label="CARREFOUR MARKET")]
-        rows_b = [_make_row(date="2025-06-15", amount="-50,00", label="carrefour market")]
+        rows_a = [make_row(date="2025-06-15", amount="-50,00", label="CARREFOUR MARKET")]
+        rows_b = [make_row(date="2025-06-15", amount="-50,00", label="carrefour market")]
 
         with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8-sig") as fa:
-            _write_csv(rows_a, fa.name)
+            write_csv(rows_a, fa.name)
             path_a = fa.name
         with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8-sig") as fb:
-            _write_csv(rows_b, fb.name)
+            write_csv(rows_b, fb.name)
             path_b = fb.name
 
         try:
@@ -235,3 +213,38 @@ class TestImportCSVDeduplication:
         finally:
             os.unlink(path_a)
             os.unlink(path_b)
+
+    def test_reimport_prefetches_import_ids_once(self, db):
+        """La détection des doublons fait une seule requête, pas un SELECT par ligne."""
+        from sqlalchemy import event
+
+        rows = [
+            make_row(date="2025-06-15", amount="-50,00", label="CARREFOUR"),
+            make_row(date="2025-06-16", amount="-30,00", label="BOULANGERIE"),
+            make_row(date="2025-06-17", amount="-12,00", label="PHARMACIE"),
+        ]
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8-sig") as f:
+            write_csv(rows, f.name)
+            path = f.name
+
+        statements: list[str] = []
+
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        try:
+            importer = BankCSVImporter(db, account_id=1)
+            importer.import_csv(path)
+
+            engine = db.get_bind()
+            event.listen(engine, "before_cursor_execute", _record)
+            try:
+                stats = importer.import_csv(path)
+            finally:
+                event.remove(engine, "before_cursor_execute", _record)
+
+            assert stats.duplicates == 3
+            lookups = [s for s in statements if "import_id" in s and s.lstrip().upper().startswith("SELECT")]
+            assert len(lookups) == 1
+        finally:
+            os.unlink(path)
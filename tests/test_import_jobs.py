@@ -0,0 +1,96 @@
+"""Tests des imports en arrière-plan (POST /upload + GET /imports/{id})."""
+
+import io
+import threading
+import time
+from datetime import timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.schemas import ImportStats
+from backend.services.import_jobs import ImportJobManager
+from backend.services.import_service import BankCSVImporter
+
+
+def _upload(client):
+    return client.post("/upload", files={"file": ("export.csv", io.BytesIO(b"dateOp;amount\n"), "text/csv")})
+
+
+def test_progress_is_visible_while_import_runs(client, import_jobs, monkeypatch):
+    release = threading.Event()
+    first_chunk = threading.Event()
+
+    def fake_import_stream(self, source, bank_type="boursorama", chunksize=0, on_chunk=None):
+        stats = ImportStats(total_rows=100, imported=80, duplicates=15, errors=5, error_details=[])
+        on_chunk(stats)
+        first_chunk.set()
+        release.wait(timeout=5)
+        stats.total_rows = 200
+        return stats
+
+    monkeypatch.setattr(BankCSVImporter, "import_stream", fake_import_stream)
+
+    resp = _upload(client)
+    assert resp.status_code == 202
+    job_id = resp.json()["id"]
+    assert first_chunk.wait(timeout=5)
+
+    # L'API répond normalement pendant l'import
+    assert client.get("/accounts").status_code == 200
+    job = client.get(f"/imports/{job_id}").json()
+    assert job["status"] == "running"
+    assert job["stats"] == {
+        "total_rows": 100, "imported": 80, "duplicates": 15, "errors": 5, "error_details": [], "timings": {},
+    }
+
+    release.set()
+    import_jobs.shutdown(wait=True)
+    job = client.get(f"/imports/{job_id}").json()
+    assert job["status"] == "done"
+    assert job["stats"]["total_rows"] == 200
+    assert job["finished_at"] is not None
+    assert [j["id"] for j in client.get("/imports").json()] == [job_id]
+
+
+def test_failed_import_reports_error(client, import_jobs, monkeypatch):
+    def failing_import_stream(self, *args, **kwargs):
+        raise ValueError("CSV illisible")
+
+    monkeypatch.setattr(BankCSVImporter, "import_stream", failing_import_stream)
+
+    job_id = _upload(client).json()["id"]
+    import_jobs.shutdown(wait=True)
+    job = client.get(f"/imports/{job_id}").json()
+    assert job["status"] == "failed"
+    assert job["error"] == "CSV illisible"
+
+
+def test_unknown_job(client):
+    assert client.get("/imports/inconnu").status_code == 404
+
+
+def test_unknown_account_rejected_synchronously(client):
+    resp = client.post("/upload", params={"account_id": 99}, files={"file": ("x.csv", io.BytesIO(b""), "text/csv")})
+    assert resp.status_code == 404
+
+
+def test_finished_jobs_are_evicted(db, monkeypatch):
+    def fake_import_stream(self, *args, **kwargs):
+        return ImportStats(total_rows=1, imported=1, duplicates=0, errors=0, error_details=[])
+
+    monkeypatch.setattr(BankCSVImporter, "import_stream", fake_import_stream)
+    manager = ImportJobManager(sessionmaker(bind=db.get_bind()), max_finished_jobs=2)
+    jobs = []
+    for _ in range(3):
+        jobs.append(manager.submit(io.BytesIO(b""), "export.csv", account_id=1))
+        while jobs[-1].finished_at is None:
+            time.sleep(0.01)
+
+    # Au-delà de max_finished_jobs, les plus anciens sont oubliés
+    assert [j.id for j in manager.list()] == [jobs[2].id, jobs[1].id]
+    assert manager.get(jobs[0].id) is None
+
+    # Après job_retention, un job terminé disparaît aussi
+    jobs[1].finished_at -= timedelta(seconds=manager.job_retention.total_seconds() + 1)
+    assert [j.id for j in manager.list()] == [jobs[2].id]
+    manager.shutdown(wait=True)
@@ -0,0 +1,103 @@
+"""Tests de l'instrumentation : /metrics, compteurs SQL par requête, chronomètres d'import, profilage."""
+
+import os
+import re
+import tempfile
+
+import pandas as pd
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.metrics import (
+    HTTP_REQUEST_QUERIES,
+    Histogram,
+    InstrumentedRoute,
+    MetricsMiddleware,
+    MetricsRegistry,
+)
+from backend.services.import_service import BankCSVImporter
+from backend.settings import MetricsSettings
+
+
+def _sample(text: str, name: str, **labels) -> float:
+    """Valeur d'une série du texte Prometheus"""
+    for line in text.splitlines():
+        if not line.startswith(name + "{") and not line.startswith(name + " "):
+            continue
+        if all(f'{k}="{v}"' in line for k, v in labels.items()):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{name} {labels} absent")
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    h = registry.register(Histogram("demo_seconds", "Démo", ("route",), buckets=(0.1, 1.0)))
+    for value in (0.05, 0.5, 5.0):
+        h.observe(value, route='/a"b')
+    text = registry.render()
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{route="/a\\"b",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{route="/a\\"b",le="1"} 2' in text
+    assert 'demo_seconds_bucket{route="/a\\"b",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{route="/a\\"b"} 3' in text
+
+
+def test_metrics_endpoint_reports_routes_and_queries(client, db):
+    before = HTTP_REQUEST_QUERIES.snapshot(method="GET", route="/budget/summary")
+    before_count = before[1] if before else 0
+
+    for _ in range(2):
+        params = {"start_date": "2025-01-01", "end_date": "2025-12-31"}
+        assert client.get("/budget/summary", params=params).status_code == 200
+    client.patch("/transactions/12345/category", json={"category_id": 1})
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    # Gabarit de route, pas l'URL brute
+    assert 'route="/transactions/{txn_id}/category",status="404"' in text
+    assert "/transactions/12345" not in text
+    assert _sample(text, "finance_http_request_duration_seconds_count", route="/budget/summary", status="200") >= 2
+
+    total, count = HTTP_REQUEST_QUERIES.snapshot(method="GET", route="/budget/summary")
+    assert count == before_count + 2
+    assert total > 0
+    assert _sample(text, "finance_db_query_duration_seconds_count") > 0
+
+
+def test_import_reports_phase_timings(db):
+    rows = [
+        {"dateOp": "2025-06-01", "label": "CARREFOUR", "amount": "-10,00"},
+        {"dateOp": "2025-06-02", "label": "UBER", "amount": "-20,00"},
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "export.csv")
+        pd.DataFrame(rows).to_csv(path, sep=";", index=False, encoding="utf-8-sig")
+        importer = BankCSVImporter(db, account_id=1)
+        for bulk in (False, True):
+            stats = importer.import_csv(path, bulk=bulk)
+            assert {"parse", "dedup"} <= set(stats.timings)
+            assert all(v >= 0 for v in stats.timings.values())
+        # Premier import : toutes les phases ; ré-import : rien à catégoriser ni insérer
+        stats = BankCSVImporter(db, account_id=1).import_stream(open(path, "rb"))
+        assert set(stats.timings) == {"parse", "dedup"}
+
+
+def test_slow_requests_are_profiled():
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = MetricsSettings(profile_slow_ms=0, profile_dir=tmp)
+        app = FastAPI()
+        app.router.route_class = InstrumentedRoute
+        app.add_middleware(MetricsMiddleware, settings=settings)
+
+        @app.get("/items/{item_id}")
+        def read_item(item_id: int, q: str = ""):
+            return {"item_id": item_id, "q": q}
+
+        resp = TestClient(app).get("/items/3", params={"q": "x"})
+        assert resp.json() == {"item_id": 3, "q": "x"}
+
+        files = os.listdir(tmp)
+        assert len(files) == 1
+        assert re.match(r"\d{8}-\d{6}-\d+_GET_items_item_id_\d+ms\.prof$", files[0])
@@ -0,0 +1,109 @@
+"""Tests des migrations de schéma versionnées."""
+
+from sqlalchemy import create_engine, inspect, text
+
+from backend.migrations import LATEST_VERSION, get_schema_version, run_migrations
+from backend.models import Base
+
+
+def _legacy_engine():
+    """Base créée avant category_parent_csv et les index composites."""
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE transactions ("
+            " id INTEGER PRIMARY KEY, account_id INTEGER NOT NULL, category_id INTEGER,"
+            " transaction_type VARCHAR(6) NOT NULL, amount FLOAT NOT NULL, description VARCHAR,"
+            " date DATETIME NOT NULL, merchant VARCHAR, notes VARCHAR,"
+            " import_id VARCHAR UNIQUE, created_at DATETIME)"
+        ))
+    return engine
+
+
+def test_migrates_legacy_database():
+    engine = _legacy_engine()
+    assert run_migrations(engine) == [1, 2, 3, 4, 5, 6]
+
+    inspector = inspect(engine)
+    columns = {c["name"] for c in inspector.get_columns("transactions")}
+    indexes = {i["name"] for i in inspector.get_indexes("transactions")}
+    assert "category_parent_csv" in columns
+    assert {"ix_transactions_account_date", "ix_transactions_date", "ix_transactions_uncategorized"} <= indexes
+    with engine.connect() as conn:
+        assert get_schema_version(conn) == LATEST_VERSION
+
+
+def test_migrations_run_once():
+    engine = _legacy_engine()
+    run_migrations(engine)
+    assert run_migrations(engine) == []
+
+
+def test_fresh_database_is_already_up_to_date():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    assert run_migrations(engine) == [1, 2, 3, 4, 5, 6]
+    with engine.connect() as conn:
+        assert get_schema_version(conn) == LATEST_VERSION
+
+
+def test_amounts_converted_to_signed_cents():
+    engine = _legacy_engine()
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO transactions (id, account_id, transaction_type, amount, date) VALUES"
+            " (1, 1, 'DEBIT', 62.3, '2025-06-15 00:00:00'),"
+            " (2, 1, 'CREDIT', 1250.0, '2025-06-16 00:00:00'),"
+            " (3, 1, 'DEBIT', 0.1, '2025-06-17 00:00:00')"
+        ))
+    run_migrations(engine)
+
+    assert "amount" not in {c["name"] for c in inspect(engine).get_columns("transactions")}
+    with engine.connect() as conn:
+        cents = conn.execute(text("SELECT id, amount_cents FROM transactions ORDER BY id")).all()
+        assert [tuple(r) for r in cents] == [(1, -6230), (2, 125000), (3, -10)]
+        totals = conn.execute(text(
+            "SELECT transaction_type, total_cents, count FROM monthly_rollups ORDER BY transaction_type"
+        )).all()
+        assert [tuple(r) for r in totals] == [("CREDIT", 125000, 1), ("DEBIT", 6240, 2)]
+
+
+def test_duplicate_rollup_rows_merged_before_unique_key():
+    engine = _legacy_engine()
+    run_migrations(engine)
+    # Base en version 5 : doublons créés par deux écritures concurrentes, sans index unique
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ux_monthly_rollups_key"))
+        conn.execute(text(
+            "INSERT INTO transactions (id, account_id, transaction_type, amount_cents, date) VALUES"
+            " (1, 1, 'DEBIT', -1000, '2025-06-15 00:00:00'), (2, 1, 'DEBIT', -500, '2025-06-16 00:00:00')"
+        ))
+        conn.execute(text(
+            "INSERT INTO monthly_rollups (account_id, month, category_id, transaction_type, total_cents, count)"
+            " VALUES (1, '2025-06', NULL, 'DEBIT', 1000, 1), (1, '2025-06', NULL, 'DEBIT', 500, 1)"
+        ))
+        conn.execute(text("UPDATE schema_version SET version = 5"))
+
+    assert run_migrations(engine) == [6]
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT total_cents, count FROM monthly_rollups")).all()
+        assert [tuple(r) for r in rows] == [(1500, 2)]
+        assert conn.execute(text(
+            "SELECT count(*) FROM sqlite_master WHERE name = 'ux_monthly_rollups_key'"
+        )).scalar() == 1
+
+
+def test_init_db_skips_schema_creation_when_current(tmp_path, monkeypatch):
+    from backend import database
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'finance.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    database.init_db()
+    assert inspect(engine).has_table("transactions")
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("create_all ne doit pas être appelé")
+
+    monkeypatch.setattr(Base.metadata, "create_all", _fail)
+    database.init_db()
+    engine.dispose()
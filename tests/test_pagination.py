@@ -0,0 +1,64 @@
+"""Tests de la pagination par curseur de /transactions et /transactions/range."""
+
+from datetime import datetime
+
+import pytest
+
+from backend import crud
+from backend.models import Transaction, TransactionType
+
+
+@pytest.fixture
+def many_transactions(db):
+    # Plusieurs transactions par jour pour tester le départage par id
+    for i in range(25):
+        db.add(Transaction(
+            account_id=1,
+            transaction_type=TransactionType.DEBIT,
+            amount=float(i),
+            description=f"T{i}",
+            date=datetime(2025, 6, 1 + i // 3),
+        ))
+    db.commit()
+    return db.query(Transaction).order_by(Transaction.date.desc(), Transaction.id.desc()).all()
+
+
+def _walk(client, url, params):
+    seen, cursor = [], None
+    while True:
+        resp = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert resp.status_code == 200
+        page = resp.json()
+        seen.extend(t["id"] for t in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+def test_list_pages_cover_everything_once(client, many_transactions):
+    expected = [t.id for t in many_transactions]
+    assert _walk(client, "/transactions", {"limit": 7}) == expected
+
+
+def test_range_pages_cover_everything_once(client, many_transactions):
+    params = {"start_date": "2025-06-02", "end_date": "2025-06-05", "limit": 4}
+    expected = [t.id for t in many_transactions if datetime(2025, 6, 2) <= t.date < datetime(2025, 6, 6)]
+    assert _walk(client, "/transactions/range", params) == expected
+
+
+def test_last_page_has_no_cursor(client, many_transactions):
+    page = client.get("/transactions", params={"limit": 25}).json()
+    assert len(page["items"]) == 25
+    assert page["next_cursor"] is None
+
+
+def test_page_size_is_capped(db, monkeypatch, many_transactions):
+    monkeypatch.setattr(crud, "MAX_PAGE_SIZE", 10)
+    items, cursor = crud.get_transactions(db, limit=1000)
+    assert len(items) == 10
+    assert cursor is not None
+
+
+def test_invalid_cursor(client):
+    resp = client.get("/transactions", params={"cursor": "pas-un-curseur"})
+    assert resp.status_code == 400
@@ -0,0 +1,146 @@
+"""Tests du registre de formats d'export (backend/services/parsers.py)."""
+
+import io
+
+import pandas as pd
+import pytest
+
+from backend.models import Transaction
+from backend.services.import_service import BankCSVImporter
+from backend.services.parsers import BoursoramaParser, CSVProfile, GenericCSVParser, available_parsers, get_parser
+
+BOURSORAMA = (
+    "﻿dateOp;dateVal;label;category;categoryParent;supplierFound;amount\n"
+    '2025-06-15;2025-06-15;"CB CARREFOUR";Alimentation;Vie quotidienne;carrefour;-50,10\n'
+    "2025-06-16;2025-06-16;VIR SALAIRE;;;;1 250,00\n"
+    "2025-06-17;2025-06-17;123;;;;-3 000,5\n"
+    ";;SANS DATE;;;;-1,00\n"
+).encode("utf-8")
+
+OFX = b"""OFXHEADER:100
+DATA:OFXSGML
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250615120000<TRNAMT>-42.50<FITID>1<NAME>CARREFOUR<MEMO>CB CARREFOUR 14/06
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250616<TRNAMT>2500,00<FITID>2<NAME>VIR SALAIRE
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+QIF = b"""!Type:Bank
+D15/06/2025
+T-42.50
+PCARREFOUR
+MCB CARREFOUR
+LAlimentation
+^
+D16/06'25
+T1,250.00
+PVIR SALAIRE
+^
+"""
+
+
+def test_registry():
+    assert {"boursorama", "csv", "ofx", "qif"} <= set(available_parsers())
+    with pytest.raises(ValueError, match="non supporté"):
+        get_parser("inconnu")
+
+
+def test_boursorama_frame_is_typed():
+    df = get_parser("boursorama").parse(io.BytesIO(BOURSORAMA))
+
+    assert pd.api.types.is_datetime64_any_dtype(df["dateOp"])
+    assert df["amount"].dtype == "float64"
+    assert df["amount"].tolist()[:3] == [-50.10, 1250.00, -3000.5]
+    # Libellé numérique gardé en texte, guillemets retirés par le lecteur
+    assert df["label"].tolist()[:3] == ["CB CARREFOUR", "VIR SALAIRE", "123"]
+    assert pd.isna(df["dateOp"].iloc[3])
+
+
+def test_boursorama_chunks_match_full_parse():
+    parser = get_parser("boursorama")
+    chunks = list(parser.iter_chunks(io.BytesIO(BOURSORAMA), chunksize=2))
+    assert [len(c) for c in chunks] == [2, 2]
+    pd.testing.assert_frame_equal(pd.concat(chunks), parser.parse(io.BytesIO(BOURSORAMA)), check_dtype=False)
+
+
+def test_boursorama_amounts_with_non_breaking_spaces():
+    csv = "dateOp;label;amount\n2025-06-01;A;-3\xa0000,5\n2025-06-02;B;12\u202f500,00\n2025-06-03;C;1 000\n"
+    df = get_parser("boursorama").parse(io.BytesIO(csv.encode("utf-8")))
+    assert df["amount"].tolist() == [-3000.5, 12500.0, 1000.0]
+
+
+def test_boursorama_pyarrow_engine_matches_c_engine():
+    pytest.importorskip("pyarrow")
+    # Colonnes du format normalisé (les autres colonnes restent typées par chaque moteur)
+    columns = ["dateOp", "amount", "label", "category", "categoryParent", "supplierFound"]
+    expected = BoursoramaParser(engine="c").parse(io.BytesIO(BOURSORAMA))[columns]
+    df = BoursoramaParser(engine="pyarrow").parse(io.BytesIO(BOURSORAMA))[columns]
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+    with pytest.raises(ValueError, match="inconnu"):
+        BoursoramaParser(engine="python")
+
+
+def test_boursorama_stray_quotes_stripped_for_dedup(db, tmp_path):
+    header = "dateOp;dateVal;label;category;categoryParent;supplierFound;amount\n"
+    clean, stray = tmp_path / "clean.csv", tmp_path / "stray.csv"
+    clean.write_text(header + "2025-06-15;2025-06-15;CB CARREFOUR;;;;-50,10\n", encoding="utf-8")
+    stray.write_text(header + '2025-06-15;2025-06-15;CB CARREFOUR";;;;-50,10\n', encoding="utf-8")
+
+    assert get_parser("boursorama").parse(str(stray))["label"].tolist() == ["CB CARREFOUR"]
+    assert BankCSVImporter(db, account_id=1).import_csv(str(clean), bulk=True).imported == 1
+    again = BankCSVImporter(db, account_id=1).import_csv(str(stray), bulk=True)
+    assert (again.imported, again.duplicates) == (0, 1)
+    assert db.query(Transaction).count() == 1
+
+
+def test_unreadable_amount_raises():
+    with pytest.raises(ValueError):
+        get_parser("boursorama").parse(io.BytesIO(b"dateOp;label;amount\n2025-06-01;X;pas un montant\n"))
+
+
+def test_generic_csv_profile_with_debit_credit_columns():
+    parser = GenericCSVParser(CSVProfile(
+        name="banque-test", date_column="Date", label_column="Libellé",
+        amount_column=None, debit_column="Débit", credit_column="Crédit",
+    ))
+    csv = "Date;Libellé;Débit;Crédit\n15/06/2025;CB CARREFOUR;42,50;\n16/06/2025;VIR SALAIRE;;2 500,00\n"
+    df = parser.parse(io.BytesIO(csv.encode("utf-8")))
+    assert df["amount"].tolist() == [-42.5, 2500.0]
+    assert df["dateOp"].dt.strftime("%Y-%m-%d").tolist() == ["2025-06-15", "2025-06-16"]
+
+    with pytest.raises(ValueError, match="Colonnes absentes"):
+        get_parser("csv").parse(io.BytesIO(csv.encode("utf-8")))
+
+
+def test_ofx():
+    df = get_parser("ofx").parse(io.BytesIO(OFX))
+    assert df["dateOp"].dt.strftime("%Y-%m-%d").tolist() == ["2025-06-15", "2025-06-16"]
+    assert df["amount"].tolist() == [-42.5, 2500.0]
+    assert df["label"].tolist() == ["CB CARREFOUR 14/06", "VIR SALAIRE"]
+    assert df["supplierFound"].iloc[0] == "CARREFOUR"
+
+
+def test_qif():
+    df = get_parser("qif").parse(io.BytesIO(QIF))
+    assert df["dateOp"].dt.strftime("%Y-%m-%d").tolist() == ["2025-06-15", "2025-06-16"]
+    assert df["amount"].tolist() == [-42.5, 1250.0]
+    assert df["label"].tolist() == ["CB CARREFOUR", "VIR SALAIRE"]
+    assert df["category"].iloc[0] == "Alimentation"
+
+
+def test_upload_with_bank_type(client, db, import_jobs):
+    assert "ofx" in client.get("/import/formats").json()
+
+    resp = client.post("/upload", params={"bank_type": "ofx"}, files={"file": ("releve.ofx", io.BytesIO(OFX))})
+    assert resp.status_code == 202
+    import_jobs.shutdown(wait=True)
+    job = client.get(f"/imports/{resp.json()['id']}").json()
+    assert job["status"] == "done"
+    assert job["stats"]["imported"] == 2
+    assert db.query(Transaction).count() == 2
+
+    resp = client.post("/upload", params={"bank_type": "ofx"}, files={"file": ("releve.csv", io.BytesIO(OFX))})
+    assert resp.status_code == 400
+    resp = client.post("/upload", params={"bank_type": "mt940"}, files={"file": ("releve.sta", io.BytesIO(b""))})
+    assert resp.status_code == 400
@@ -0,0 +1,80 @@
+"""Tests du backend Postgres : import par COPY + ON CONFLICT (services/bulk_insert.py).
+
+Les tests Postgres utilisent la fixture postgres_url (conftest) : ignorés si
+aucun Postgres n'est disponible.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.migrations import run_migrations
+from backend.models import Account, Base, Transaction, TransactionType
+from backend.services.bulk_insert import copy_text, insert_transactions
+from backend.services.import_service import BankCSVImporter
+from backend.services.rollup import check_rollup_consistency
+
+from .conftest import make_row, write_csv
+
+
+def test_copy_text_escapes_and_nulls():
+    row = {
+        "account_id": 1, "transaction_type": TransactionType.DEBIT, "amount_cents": -1250,
+        "description": "CB\tCARREFOUR\\n°1\nbis", "date": datetime(2025, 6, 15, 8, 30),
+        "merchant": None,
+    }
+    line = copy_text([row], ("account_id", "transaction_type", "amount_cents", "description", "date", "merchant"))
+    assert line == "1\tDEBIT\t-1250\tCB\\tCARREFOUR\\\\n°1\\nbis\t2025-06-15 08:30:00\t\\N\n"
+
+
+@pytest.fixture
+def pg_db(postgres_url):
+    engine = create_engine(postgres_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Account(id=1, name="Boursorama", account_type="checking"))
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def test_bulk_import_then_reimport(pg_db, tmp_path):
+    path = str(tmp_path / "export.csv")
+    write_csv([
+        make_row(),
+        make_row(date="2025-06-16", amount="2 500,00", label="VIR SALAIRE", category_parent="", supplier=""),
+        make_row(date="2025-06-17", label="CB\tTABULATION"),
+    ], path)
+
+    stats = BankCSVImporter(pg_db, account_id=1).import_csv(path, bulk=True)
+    assert (stats.imported, stats.duplicates, stats.errors) == (3, 0, 0)
+    txns = pg_db.query(Transaction).order_by(Transaction.date).all()
+    assert [t.amount_cents for t in txns] == [-5000, 250000, -5000]
+    assert txns[2].description == "CB\tTABULATION"
+    assert txns[0].created_at is not None
+    assert check_rollup_consistency(pg_db) == []
+
+    again = BankCSVImporter(pg_db, account_id=1).import_csv(path, bulk=True)
+    assert (again.imported, again.duplicates) == (0, 3)
+    assert pg_db.query(Transaction).count() == 3
+
+
+def test_on_conflict_skips_rows_already_inserted(pg_db):
+    row = {
+        "account_id": 1, "transaction_type": TransactionType.DEBIT, "amount_cents": -1000,
+        "description": "CB", "date": datetime(2025, 6, 1), "import_id": "deja-la",
+    }
+    assert len(insert_transactions(pg_db, [row], chunk_size=100)) == 1
+    pg_db.commit()
+
+    # Le même import_id arrive par un autre import : ignoré, pas d'erreur
+    inserted = insert_transactions(pg_db, [row, {**row, "import_id": "nouveau"}], chunk_size=100)
+    pg_db.commit()
+    assert [r["amount_cents"] for r in inserted] == [-1000]
+    assert pg_db.query(Transaction).count() == 2
@@ -0,0 +1,129 @@
+"""Vérifie via EXPLAIN QUERY PLAN que les requêtes crud n'entraînent pas de scan complet de transactions."""
+
+import re
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from backend import crud
+from backend.models import CategorizationRule, Category, Transaction, TransactionType
+from backend.schemas import BulkCategoryUpdate
+
+START = datetime(2025, 1, 1)
+END = datetime(2025, 12, 31, 23, 59, 59)
+
+# Curseur de page suivante : reprise avant le 15/06 (transaction 25)
+KEYSET_CURSOR = crud.encode_cursor(Transaction(id=25, date=datetime(2025, 6, 15)))
+
+
+def _category_id(db) -> int:
+    return db.query(Category.id).scalar()
+
+
+CRUD_CALLS = {
+    "get_transactions": lambda db: crud.get_transactions(db, limit=50),
+    "get_transactions_account": lambda db: crud.get_transactions(db, limit=50, account_id=1),
+    "get_transactions_keyset": lambda db: crud.get_transactions(db, limit=10, cursor=KEYSET_CURSOR),
+    "get_transactions_by_date_range": lambda db: crud.get_transactions_by_date_range(db, START, END),
+    "get_transactions_by_date_range_account": lambda db: crud.get_transactions_by_date_range(db, START, END, 1),
+    "get_transactions_by_date_range_keyset": lambda db: crud.get_transactions_by_date_range(
+        db, START, END, limit=10, cursor=KEYSET_CURSOR,
+    ),
+    "get_budget_summary": lambda db: crud.get_budget_summary(db, START, END),
+    "get_import_ids_in_range": lambda db: crud.get_import_ids_in_range(db, 1, START, END),
+    "search_transactions": lambda db: crud.search_transactions(db, "carrefour"),
+    "bulk_update_by_filter": lambda db: crud.bulk_update_transaction_categories(db, BulkCategoryUpdate(
+        filter={"account_id": 1, "start_date": "2025-03-01", "end_date": "2025-03-31"},
+        category_id=_category_id(db),
+    )),
+    "bulk_update_by_ids": lambda db: crud.bulk_update_transaction_categories(db, BulkCategoryUpdate(
+        items=[{"id": 3, "category_id": _category_id(db)}, {"id": 4, "category_id": _category_id(db)}],
+    )),
+    "apply_rules_to_uncategorized": lambda db: crud.apply_rules_to_uncategorized(db),
+}
+
+# Requêtes bornées (plage, compte, curseur, identifiants) : recherche dans un index
+# exigée ; un SCAN ... USING INDEX parcourrait tout l'index
+SEARCH_REQUIRED = {
+    "get_transactions_account",
+    "get_transactions_keyset",
+    "get_transactions_by_date_range",
+    "get_transactions_by_date_range_account",
+    "get_transactions_by_date_range_keyset",
+    "get_budget_summary",
+    "get_import_ids_in_range",
+    "search_transactions",
+    "bulk_update_by_filter",
+    "bulk_update_by_ids",
+}
+
+_TABLE = r"(transactions|\w+ AS transactions_\d+)\b"
+# "SCAN transactions" sans "USING ... INDEX" = parcours complet de la table
+FULL_SCAN = re.compile(rf"\bSCAN {_TABLE}(?!.*USING)")
+ANY_SCAN = re.compile(rf"\bSCAN {_TABLE}")
+SEARCH = re.compile(rf"\bSEARCH {_TABLE}")
+# Recherche plein texte résolue par FTS5 (contrainte MATCH transmise à la table virtuelle)
+FTS_MATCH = re.compile(r"\bSCAN transactions_fts VIRTUAL TABLE INDEX \d+:M")
+
+
+@pytest.fixture
+def populated(db):
+    cat = Category(name="Épicerie", parent_category="BesoinsEssentiels", sub_category="Alimentation")
+    db.add(cat)
+    db.commit()
+    db.add(CategorizationRule(keyword="carrefour", category_id=cat.id))
+    for i in range(50):
+        db.add(Transaction(
+            account_id=1, transaction_type=TransactionType.DEBIT, amount=float(i),
+            description=f"CB CARREFOUR {i}" if i % 3 else f"T{i}", date=datetime(2025, 1 + i % 12, 1 + i % 28),
+            category_id=cat.id if i % 2 else None,
+        ))
+    db.commit()
+    return db
+
+
+def _capture(db, call):
+    """(requête, paramètres) des SELECT / UPDATE sur transactions exécutés par call"""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE")) and "transactions" in statement:
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        call(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    return statements
+
+
+def _plans(db, name):
+    statements = _capture(db, CRUD_CALLS[name])
+    assert statements, f"{name} n'a exécuté aucune requête sur transactions"
+    conn = db.connection()
+    for statement, parameters in statements:
+        plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+        yield statement, [row[-1] for row in plan]
+
+
+@pytest.mark.parametrize("name", sorted(CRUD_CALLS))
+def test_no_full_table_scan(populated, name):
+    for statement, details in _plans(populated, name):
+        scans = [d for d in details if FULL_SCAN.search(d)]
+        assert not scans, f"{name}: scan complet {scans}\n{statement}"
+
+
+@pytest.mark.parametrize("name", sorted(SEARCH_REQUIRED))
+def test_bounded_queries_search_an_index(populated, name):
+    for statement, details in _plans(populated, name):
+        assert any(SEARCH.search(d) for d in details), f"{name}: pas de SEARCH {details}\n{statement}"
+        scans = [d for d in details if ANY_SCAN.search(d)]
+        assert not scans, f"{name}: parcours d'index complet {scans}\n{statement}"
+
+
+def test_search_uses_fts_index(populated):
+    for statement, details in _plans(populated, "search_transactions"):
+        assert any(FTS_MATCH.search(d) for d in details), f"MATCH non résolu par FTS5 {details}\n{statement}"
@@ -0,0 +1,138 @@
+"""Tests de l'agrégat mensuel maintenu incrémentalement (monthly_rollups, /cashflow)."""
+
+import os
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from backend import crud
+from backend.models import CategorizationRule, Category, MonthlyRollup, Transaction, TransactionType
+from backend.schemas import TransactionCreate
+from backend.services.import_service import BankCSVImporter
+from backend.services.rollup import RollupDeltas, apply_rollup_deltas, check_rollup_consistency, rebuild_rollup
+
+
+@pytest.fixture
+def categories(db):
+    groceries = Category(name="Épicerie", parent_category="BesoinsEssentiels", sub_category="Alimentation")
+    transport = Category(name="VTC", parent_category="Transport", sub_category="Taxi")
+    db.add_all([groceries, transport])
+    db.commit()
+    return groceries, transport
+
+
+def _create(db, amount, day, month=6, category_id=None, txn_type=TransactionType.DEBIT, description="x"):
+    return crud.create_transaction(db, TransactionCreate(
+        account_id=1, transaction_type=txn_type, amount=amount,
+        description=description, date=datetime(2025, month, day), category_id=category_id,
+    ))
+
+
+def test_create_and_recategorize_keep_rollup_consistent(db, categories):
+    groceries, transport = categories
+    t1 = _create(db, 50.0, 1, category_id=groceries.id)
+    _create(db, 20.0, 2)
+    _create(db, 1000.0, 3, month=7, txn_type=TransactionType.CREDIT)
+    assert check_rollup_consistency(db) == []
+
+    crud.update_transaction_category(db, t1.id, transport.id)
+    assert check_rollup_consistency(db) == []
+    rows = {(r.month, r.category_id): (r.total_cents, r.count) for r in db.query(MonthlyRollup)}
+    assert (("2025-06", groceries.id)) not in rows
+    assert rows[("2025-06", transport.id)] == (5000, 1)
+
+
+def test_apply_rules_keeps_rollup_consistent(db, categories):
+    groceries, _ = categories
+    db.add(CategorizationRule(keyword="carrefour", category_id=groceries.id))
+    db.commit()
+    _create(db, 30.0, 5, description="CB CARREFOUR")
+    _create(db, 10.0, 6, description="AUTRE")
+
+    assert crud.apply_rules_to_uncategorized(db) == 1
+    assert check_rollup_consistency(db) == []
+
+
+def test_bulk_import_updates_rollup(db, categories):
+    rows = [
+        {"dateOp": "2025-06-15", "label": "CARREFOUR", "category": "", "categoryParent": "x",
+         "supplierFound": "", "amount": "-50,00"},
+        {"dateOp": "2025-07-01", "label": "SALAIRE", "category": "", "categoryParent": "x",
+         "supplierFound": "", "amount": "2000,00"},
+    ]
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8-sig") as f:
+        path = f.name
+    try:
+        pd.DataFrame(rows).to_csv(path, sep=";", index=False, encoding="utf-8-sig")
+        BankCSVImporter(db, account_id=1).import_csv(path, bulk=True)
+    finally:
+        os.unlink(path)
+    assert db.query(MonthlyRollup).count() == 2
+    assert check_rollup_consistency(db) == []
+
+
+def test_checker_reports_and_rebuild_repairs_drift(db, categories):
+    _create(db, 50.0, 1)
+    # Écriture qui contourne la maintenance incrémentale
+    db.add(Transaction(account_id=1, transaction_type=TransactionType.DEBIT, amount=5.0, date=datetime(2025, 6, 9)))
+    db.commit()
+
+    diffs = check_rollup_consistency(db)
+    assert len(diffs) == 1
+    assert diffs[0]["expected"] == {"total": 55.0, "count": 2}
+    assert diffs[0]["actual"] == {"total": 50.0, "count": 1}
+
+    rebuild_rollup(db)
+    db.commit()
+    assert check_rollup_consistency(db) == []
+
+
+def test_cashflow_endpoint(client, db, categories):
+    groceries, transport = categories
+    _create(db, 50.0, 1, category_id=groceries.id)
+    _create(db, 25.0, 2, category_id=transport.id)
+    _create(db, 5.0, 3)
+    _create(db, 1000.0, 4, txn_type=TransactionType.CREDIT)
+    _create(db, 70.0, 1, month=8)
+
+    resp = client.get("/cashflow", params={"start_month": "2025-06", "end_month": "2025-07"})
+    assert resp.status_code == 200
+    assert resp.json() == [{
+        "month": "2025-06",
+        "income": 1000.0,
+        "expenses": 80.0,
+        "expenses_by_parent": {"BesoinsEssentiels": 50.0, "Transport": 25.0, "Autres": 5.0},
+    }]
+    assert client.get("/cashflow", params={"start_month": "2025", "end_month": "2025-07"}).status_code == 422
+
+
+def test_deltas_upsert_one_row_per_key(db):
+    # Deux écritures sur une clé absente (catégorie NULL) : une seule ligne, totaux cumulés
+    for amount_cents in (-1000, -250):
+        deltas = RollupDeltas()
+        deltas.add(1, datetime(2025, 6, 1), None, TransactionType.DEBIT, amount_cents)
+        apply_rollup_deltas(db, deltas)
+        db.commit()
+    rows = db.query(MonthlyRollup).all()
+    assert [(r.category_id, r.total_cents, r.count) for r in rows] == [(None, 1250, 2)]
+
+    # Ligne vidée (count à 0) : supprimée
+    deltas = RollupDeltas()
+    for amount_cents in (-1000, -250):
+        deltas.add(1, datetime(2025, 6, 1), None, TransactionType.DEBIT, amount_cents, sign=-1)
+    apply_rollup_deltas(db, deltas)
+    db.commit()
+    assert db.query(MonthlyRollup).count() == 0
+
+
+def test_unique_key_rejects_duplicate_rows(db):
+    row = {"account_id": 1, "month": "2025-06", "category_id": None,
+           "transaction_type": TransactionType.DEBIT, "total_cents": 100, "count": 1}
+    db.execute(insert(MonthlyRollup), [row])
+    with pytest.raises(IntegrityError):
+        db.execute(insert(MonthlyRollup), [row])
+    db.rollback()
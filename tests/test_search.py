@@ -0,0 +1,120 @@
+"""Tests de la recherche plein texte (FTS5) et de l'aperçu des règles."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from backend.models import Category, Transaction, TransactionType
+from backend.services.search import build_match_query
+
+
+@pytest.fixture
+def searchable(db):
+    rows = [
+        ("CB CARREFOUR MARKET PARIS", None, None, datetime(2025, 6, 1), 1),
+        ("CB CARREFOUR CITY", None, "courses de la semaine", datetime(2025, 6, 10), 1),
+        ("PRLV SEPA EDF", "EDF", None, datetime(2025, 7, 2), 1),
+        ("VIR CARTE BANCAIRE REMBOURSEMENT", None, None, datetime(2025, 7, 5), 2),
+        ("CB E.LECLERC", "E.Leclerc", None, datetime(2025, 7, 8), 1),
+        ("PAIEMENT ÉPICERIE FINE", None, None, datetime(2025, 8, 1), 1),
+    ]
+    for description, merchant, notes, date, account_id in rows:
+        db.add(Transaction(
+            account_id=account_id, transaction_type=TransactionType.DEBIT, amount=10.0,
+            description=description, merchant=merchant, notes=notes, date=date,
+        ))
+    db.commit()
+    return db
+
+
+def _search(client, **params):
+    resp = client.get("/transactions/search", params=params)
+    assert resp.status_code == 200, resp.text
+    return [t["description"] for t in resp.json()["items"]]
+
+
+class TestBuildMatchQuery:
+
+    def test_words_phrases_and_prefixes(self):
+        assert build_match_query('carref* "carte bancaire"') == '"carref"* AND "carte bancaire"'
+
+    def test_punctuation_is_neutralized(self):
+        assert build_match_query('e.leclerc 100% "open') == '"e leclerc" AND "100" AND "open"'
+
+    def test_column_filter(self):
+        assert build_match_query("edf", ["merchant"]) == '{merchant} : ("edf")'
+
+    def test_empty_query(self):
+        with pytest.raises(ValueError):
+            build_match_query(' " * ')
+
+
+class TestSearchEndpoint:
+
+    def test_word_and_prefix(self, client, searchable):
+        assert _search(client, q="carrefour") == ["CB CARREFOUR CITY", "CB CARREFOUR MARKET PARIS"]
+        assert _search(client, q="carref*") == ["CB CARREFOUR CITY", "CB CARREFOUR MARKET PARIS"]
+        assert _search(client, q="carref") == []
+
+    def test_phrase(self, client, searchable):
+        assert _search(client, q='"carte bancaire"') == ["VIR CARTE BANCAIRE REMBOURSEMENT"]
+        assert _search(client, q='"bancaire carte"') == []
+
+    def test_notes_merchant_and_accents(self, client, searchable):
+        assert _search(client, q="semaine") == ["CB CARREFOUR CITY"]
+        assert _search(client, q="leclerc") == ["CB E.LECLERC"]
+        assert _search(client, q="epicerie") == ["PAIEMENT ÉPICERIE FINE"]
+
+    def test_filters(self, client, searchable):
+        assert _search(client, q="cb", start_date="2025-06-05", end_date="2025-07-31") == [
+            "CB E.LECLERC", "CB CARREFOUR CITY",
+        ]
+        assert _search(client, q="vir", account_id=1) == []
+
+    def test_pagination(self, client, searchable):
+        page = client.get("/transactions/search", params={"q": "cb", "limit": 2}).json()
+        assert len(page["items"]) == 2
+        rest = client.get("/transactions/search", params={"q": "cb", "cursor": page["next_cursor"]}).json()
+        assert [t["description"] for t in rest["items"]] == ["CB CARREFOUR MARKET PARIS"]
+
+    def test_empty_query_is_rejected(self, client, searchable):
+        assert client.get("/transactions/search", params={"q": "%%"}).status_code == 400
+
+    def test_index_follows_updates_and_deletes(self, client, searchable):
+        txn = searchable.query(Transaction).filter(Transaction.merchant == "EDF").one()
+        txn.description = "PRLV SEPA ENGIE"
+        searchable.commit()
+        assert _search(client, q="edf") == ["PRLV SEPA ENGIE"]  # via le marchand
+        assert _search(client, q="engie") == ["PRLV SEPA ENGIE"]
+        assert _search(client, q="sepa edf") == ["PRLV SEPA ENGIE"]
+
+        searchable.delete(txn)
+        searchable.commit()
+        assert _search(client, q="engie") == []
+        # L'index externe reste cohérent avec la table
+        searchable.execute(text("INSERT INTO transactions_fts(transactions_fts) VALUES ('integrity-check')"))
+
+
+class TestRulePreview:
+
+    def test_keyword_preview(self, client, searchable):
+        resp = client.get("/rules/preview", params={"keyword": "carrefour"})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["matches"] == 2
+        assert [t["description"] for t in body["sample"]] == ["CB CARREFOUR CITY", "CB CARREFOUR MARKET PARIS"]
+
+    def test_rule_semantics_are_checked(self, client, searchable):
+        # L'index ramène "CB CARREFOUR ..." par préfixe, la règle exige la sous-chaîne entière
+        assert client.get("/rules/preview", params={"keyword": "cb carrefour m"}).json()["matches"] == 1
+        assert client.get("/rules/preview", params={"keyword": "edf", "match_field": "merchant"}).json()["matches"] == 1
+
+    def test_uncategorized_only(self, client, searchable):
+        groceries = Category(name="Épicerie", parent_category="BesoinsEssentiels", sub_category="Alimentation")
+        searchable.add(groceries)
+        txn = searchable.query(Transaction).filter(Transaction.description == "CB CARREFOUR CITY").one()
+        txn.category = groceries
+        searchable.commit()
+        params = {"keyword": "carrefour", "uncategorized_only": True}
+        assert client.get("/rules/preview", params=params).json()["matches"] == 1
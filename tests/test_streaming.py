@@ -0,0 +1,68 @@
+"""Tests de l'export en flux /transactions/range/export."""
+
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import get_db
+from backend.main import app
+from backend.models import Category, Transaction, TransactionType
+from backend.streaming import iter_json_array, iter_ndjson
+
+PARAMS = {"start_date": "2025-06-01", "end_date": "2025-06-30"}
+
+
+@pytest.fixture
+def range_data(db):
+    cat = Category(name="Épicerie", parent_category="BesoinsEssentiels", sub_category="Alimentation")
+    db.add(cat)
+    db.commit()
+    for i in range(30):
+        db.add(Transaction(
+            account_id=1, transaction_type=TransactionType.DEBIT, amount=float(i),
+            description=f"T{i}", date=datetime(2025, 6, 1 + i % 30),
+            category_id=cat.id if i % 2 else None,
+        ))
+    db.commit()
+
+
+@pytest.fixture
+def own_session_client(client, db):
+    """get_db qui ferme sa session en sortie, comme en production."""
+    Session = sessionmaker(bind=db.get_bind())
+
+    def _get_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    return client
+
+
+def test_ndjson_matches_paginated_range(own_session_client, range_data):
+    resp = own_session_client.get("/transactions/range/export", params=PARAMS)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    streamed = [json.loads(line) for line in resp.text.splitlines()]
+
+    paged = own_session_client.get("/transactions/range", params=PARAMS).json()["items"]
+    assert streamed == paged
+
+
+def test_json_array_export(own_session_client, range_data):
+    resp = own_session_client.get("/transactions/range/export", params={**PARAMS, "format": "json"})
+    data = resp.json()
+    assert len(data) == 30
+    assert {t["category_name"] for t in data} == {"Épicerie", None}
+
+
+def test_encoders_chunk_output():
+    rows = [{"id": i} for i in range(5)]
+    assert list(iter_ndjson(rows, chunk_rows=2)) == [b'{"id":0}\n{"id":1}\n', b'{"id":2}\n{"id":3}\n', b'{"id":4}\n']
+    assert b"".join(iter_json_array(rows, chunk_rows=2)) == json.dumps(rows, separators=(",", ":")).encode()
+    assert b"".join(iter_json_array([])) == b"[]"